@@ -0,0 +1,297 @@
+"""
+Generador masivo de lecturas pediátricas sintéticas para pruebas de carga.
+
+Usa las mismas reglas que generate_pediatric_data.py (perfil por edad, escenarios y
+calculate_risk_label), pero genera bloques completos con NumPy en lugar de fila por
+fila, y arma las líneas de salida como una matriz de bytes de ancho fijo (sin formatear
+cada fila en Python). El archivo se escribe por bloques: la memoria depende de
+--batch-size, no de --rows.
+
+Salidas:
+    csv  -> para LOAD DATA LOCAL INFILE (con --load se carga directo en la BD)
+    sql  -> INSERTs de --statement-rows filas; con --dump antepone el respaldo original
+            filtrado línea por línea (mismas tablas excluidas que generate_pediatric_data.py)
+
+Uso:
+    python generate_bulk_data.py --rows 100000000 --output readings.csv --load --create-table
+    python generate_bulk_data.py --rows 10000 --format sql --dump respaldo.sql --output entrenamiento.sql
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+TABLAS_IGNORADAS = ["accelerometer_readings", "audio_recordings"]
+
+ESTRUCTURA_READINGS = """
+DROP TABLE IF EXISTS `readings`;
+CREATE TABLE `readings` (
+  `id_reading` int(11) NOT NULL AUTO_INCREMENT,
+  `bpm` int(11) DEFAULT NULL,
+  `temperature` float DEFAULT NULL,
+  `oxygen_level` int(11) DEFAULT NULL,
+  `risk_label` int(11) DEFAULT 0,
+  `id_child` int(11) DEFAULT NULL,
+  `id_device` int(11) DEFAULT NULL,
+  `timestamp` datetime DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id_reading`),
+  KEY `idx_child` (`id_child`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+"""
+
+COLUMNS = "bpm, temperature, oxygen_level, risk_label, id_child, id_device, timestamp"
+LOAD_DATA = f"""
+    LOAD DATA LOCAL INFILE %s INTO TABLE readings
+    FIELDS TERMINATED BY ',' LINES TERMINATED BY '\\n'
+    IGNORE 1 LINES ({COLUMNS})
+"""
+
+# --- 1. LÓGICA MÉDICA (vectorizada) ---
+# Grupos de edad por índice: 0 = baby, 1 = toddler, 2 = preschool
+BPM_LOW = np.array([110, 95, 85])
+BPM_HIGH = np.array([150, 140, 130])
+BPM_MIN_SAFE = np.array([80, 70, 60])
+BPM_MAX_SAFE = np.array([180, 160, 150])
+
+# healthy, sleeping, fever, respiratory_distress
+SCENARIO_WEIGHTS = np.array([70, 10, 15, 5]) / 100
+
+
+def age_groups(child_ids):
+    return np.where(child_ids <= 15, 0, np.where(child_ids <= 35, 1, 2))
+
+
+def _tenths(rng, low, high, size):
+    # Igual que round(random.uniform(low, high), 1), pero en décimas enteras para comparar sin error de redondeo
+    return np.rint(rng.uniform(low * 10, high * 10, size)).astype(np.int64)
+
+
+def generate_vitals(rng, ages, scenarios):
+    """(bpm, temperatura en décimas de grado, oxígeno) para cada fila según su escenario."""
+    n = len(ages)
+    low, high = BPM_LOW[ages], BPM_HIGH[ages]
+    bpm = np.empty(n, dtype=np.int64)
+    temp = np.empty(n, dtype=np.int64)
+    oxy = np.empty(n, dtype=np.int64)
+
+    m = scenarios == 0    # healthy
+    bpm[m] = rng.integers(low[m], high[m] + 1)
+    temp[m] = _tenths(rng, 36.5, 37.3, m.sum())
+    oxy[m] = rng.integers(96, 101, m.sum())
+
+    m = scenarios == 1    # sleeping
+    bpm[m] = rng.integers(low[m] - 20, low[m] + 1)
+    temp[m] = _tenths(rng, 36.3, 36.8, m.sum())
+    oxy[m] = rng.integers(95, 100, m.sum())
+
+    m = scenarios == 2    # fever: el pulso sube 10 lpm por grado sobre 37
+    temp[m] = _tenths(rng, 37.8, 40.2, m.sum())
+    extra = temp[m] - 370
+    bpm[m] = rng.integers(low[m] + extra, high[m] + extra + 21)
+    oxy[m] = rng.integers(94, 99, m.sum())
+
+    m = scenarios == 3    # respiratory_distress
+    oxy[m] = rng.integers(82, 93, m.sum())
+    bpm[m] = rng.integers(high[m], high[m] + 41)
+    temp[m] = _tenths(rng, 36.5, 37.6, m.sum())
+    return bpm, temp, oxy
+
+
+def calculate_risk_labels(bpm, temp, oxy, ages):
+    """calculate_risk_label de generate_pediatric_data.py sobre arreglos (temperatura en décimas)."""
+    score = np.where(oxy < 90, 5, np.where(oxy < 94, 2, 0))
+    score += np.select([temp >= 380, temp >= 376, temp < 358], [3, 1, 3], 0)
+    score += np.where((bpm > BPM_MAX_SAFE[ages]) | (bpm < BPM_MIN_SAFE[ages]), 3, 0)
+    return (score >= 2).astype(np.int64)
+
+
+def generate_batch(rng, start, count, total, span_seconds, start_epoch, num_children):
+    """Bloque de filas start..start+count; los timestamps avanzan de forma pareja en el periodo."""
+    index = np.arange(start, start + count, dtype=np.int64)
+    step = max(1, span_seconds // total)
+    timestamps = start_epoch + index * span_seconds // total + rng.integers(0, step, count)
+    child_ids = rng.integers(1, num_children + 1, count)
+    ages = age_groups(child_ids)
+    scenarios = rng.choice(len(SCENARIO_WEIGHTS), count, p=SCENARIO_WEIGHTS)
+    bpm, temp, oxy = generate_vitals(rng, ages, scenarios)
+    labels = calculate_risk_labels(bpm, temp, oxy, ages)
+    return bpm, temp, oxy, labels, child_ids, timestamps
+
+
+# --- 2. FORMATO DE ANCHO FIJO ---
+# Cada campo se escribe en columnas fijas de una matriz uint8 (una fila por lectura);
+# los enteros van con ceros a la izquierda, que MySQL lee igual ('098' = 98).
+
+def _digits(values, width):
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return ((values[:, None] // powers) % 10 + ord('0')).astype(np.uint8)
+
+
+def _datetime_fields(epoch_seconds):
+    """Campos 'YYYY-MM-DD HH:MM:SS' de segundos desde 1970 (hora local sin zona)."""
+    seconds = epoch_seconds.astype('datetime64[s]')
+    days = seconds.astype('datetime64[D]')
+    months = seconds.astype('datetime64[M]')
+    years = seconds.astype('datetime64[Y]')
+    of_day = (seconds - days).astype(np.int64)
+    return [
+        (years.astype(np.int64) + 1970, 4), "-",
+        ((months - years.astype('datetime64[M]')).astype(np.int64) + 1, 2), "-",
+        ((days - months.astype('datetime64[D]')).astype(np.int64) + 1, 2), " ",
+        (of_day // 3600, 2), ":", (of_day // 60 % 60, 2), ":", (of_day % 60, 2),
+    ]
+
+
+def render(count, fields):
+    """Matriz (count, ancho) con los campos: texto fijo o (arreglo de enteros, dígitos)."""
+    width = sum(len(f) if isinstance(f, str) else f[1] for f in fields)
+    out = np.empty((count, width), dtype=np.uint8)
+    col = 0
+    for field in fields:
+        if isinstance(field, str):
+            out[:, col:col + len(field)] = np.frombuffer(field.encode(), dtype=np.uint8)
+            col += len(field)
+        else:
+            values, digits = field
+            out[:, col:col + digits] = _digits(values, digits)
+            col += digits
+    return out
+
+
+def row_fields(batch, child_width, device_id, sql):
+    bpm, temp, oxy, labels, child_ids, timestamps = batch
+    quote = "'" if sql else ""
+    return [
+        "(" if sql else "", (bpm, 3), ",", (temp // 10, 2), ".", (temp % 10, 1), ",", (oxy, 3), ",",
+        (labels, 1), ",", (child_ids, child_width), f",{device_id},{quote}",
+        *_datetime_fields(timestamps), f"{quote})," if sql else "\n",
+    ]
+
+
+def write_sql_statements(out, lines, statement_rows):
+    """INSERTs de 'statement_rows' filas; la última fila de cada uno termina en ';'."""
+    header = f"INSERT INTO readings ({COLUMNS}) VALUES\n".encode()
+    # Las filas SQL terminan en '),': se agrega el salto de línea y se cambia la coma final
+    lines = np.concatenate([lines, np.full((len(lines), 1), ord('\n'), dtype=np.uint8)], axis=1)
+    for start in range(0, len(lines), statement_rows):
+        block = lines[start:start + statement_rows]
+        block[-1, -2] = ord(';')
+        out.write(header)
+        out.write(block.tobytes())
+
+
+def filter_dump(path, out):
+    """Copia el respaldo línea por línea sin las tablas excluidas ni la tabla readings original."""
+    ignoring = False
+    with open(path, 'r', encoding='utf-8') as dump:
+        for line in dump:
+            for table in TABLAS_IGNORADAS:
+                if f"`{table}`" in line and any(cmd in line for cmd in
+                                                ["CREATE TABLE", "INSERT INTO", "LOCK TABLES", "ALTER TABLE", "DROP TABLE"]):
+                    ignoring = True
+                    break
+            if "`readings`" in line and "CREATE TABLE" in line:
+                ignoring = True
+            if ignoring:
+                if ";" in line or "UNLOCK TABLES" in line:
+                    ignoring = False
+                continue
+            out.write(line.encode('utf-8'))
+
+
+def connect():
+    # Solo --load necesita la BD: generar archivos no requiere mysql-connector ni dotenv
+    import mysql.connector
+    from dotenv import load_dotenv
+    load_dotenv()
+    return mysql.connector.connect(
+        host=os.getenv("DB_HOST", "localhost"),
+        user=os.getenv("DB_USER", "root"),
+        password=os.getenv("DB_PASSWORD", ""),
+        database=os.getenv("DB_NAME", "guardianAngel"),
+        allow_local_infile=True
+    )
+
+
+def load_csv(path, create_table):
+    print(f"🔌 Cargando {path} con LOAD DATA LOCAL INFILE...")
+    conn = connect()
+    try:
+        with conn.cursor() as cursor:
+            if create_table:
+                for statement in filter(str.strip, ESTRUCTURA_READINGS.split(';')):
+                    cursor.execute(statement)
+            started = time.perf_counter()
+            cursor.execute(LOAD_DATA, (os.path.abspath(path),))
+            conn.commit()
+            print(f"✅ {cursor.rowcount} filas cargadas en {time.perf_counter() - started:.1f}s")
+    finally:
+        conn.close()
+
+
+def generate(rows, output, fmt, batch_size, statement_rows, num_children, days, seed, dump):
+    rng = np.random.default_rng(seed)
+    start = datetime.now() - timedelta(days=days)
+    start_epoch = int((start - datetime(1970, 1, 1)).total_seconds())
+    span_seconds = days * 86400
+    child_width = len(str(num_children))
+    sql = fmt == 'sql'
+
+    out = sys.stdout.buffer if output == '-' else open(output, 'wb', buffering=1 << 20)
+    log = sys.stderr if output == '-' else sys.stdout
+    started = time.perf_counter()
+    try:
+        if sql:
+            if dump:
+                out.write(b"-- 1. RESPALDO LIMPIO --\n")
+                filter_dump(dump, out)
+            out.write(b"\n\n-- 2. ESTRUCTURA FORZADA DE READINGS --\n")
+            out.write(ESTRUCTURA_READINGS.encode())
+            out.write(b"\n\n-- 3. DATOS IA --\n")
+        else:
+            out.write((COLUMNS.replace(' ', '') + "\n").encode())
+
+        risky = 0
+        for offset in range(0, rows, batch_size):
+            count = min(batch_size, rows - offset)
+            batch = generate_batch(rng, offset, count, rows, span_seconds, start_epoch, num_children)
+            lines = render(count, row_fields(batch, child_width, 1, sql))
+            if sql:
+                write_sql_statements(out, lines, statement_rows)
+            else:
+                out.write(lines.tobytes())
+            risky += int(batch[3].sum())
+            done = offset + count
+            elapsed = time.perf_counter() - started
+            print(f" {done:,}/{rows:,} filas ({done / elapsed:,.0f} filas/s)", file=log)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+    print(f"✅ {rows:,} filas en {time.perf_counter() - started:.1f}s; con riesgo: {risky / max(rows, 1):.1%}", file=log)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera lecturas pediátricas sintéticas por bloques con NumPy.")
+    parser.add_argument("--rows", type=int, default=10000, help="Total de lecturas.")
+    parser.add_argument("--output", default="readings.csv", help="Archivo de salida ('-' para stdout).")
+    parser.add_argument("--format", choices=["csv", "sql"], default="csv")
+    parser.add_argument("--batch-size", type=int, default=1000000, help="Filas generadas por bloque.")
+    parser.add_argument("--statement-rows", type=int, default=1000, help="Filas por INSERT (formato sql).")
+    parser.add_argument("--children", type=int, default=50, help="Niños distintos (id_child 1..N).")
+    parser.add_argument("--days", type=int, default=60, help="Días hacia atrás que cubren los timestamps.")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla para resultados reproducibles.")
+    parser.add_argument("--dump", help="Respaldo SQL que se antepone filtrado (formato sql).")
+    parser.add_argument("--load", action="store_true", help="Carga el CSV en la BD al terminar (LOAD DATA LOCAL INFILE).")
+    parser.add_argument("--create-table", action="store_true", help="Recrea la tabla readings antes de cargar.")
+    args = parser.parse_args()
+
+    if args.load and (args.format != 'csv' or args.output == '-'):
+        parser.error("--load requiere --format csv y un archivo de salida")
+    generate(args.rows, args.output, args.format, args.batch_size, args.statement_rows,
+             args.children, args.days, args.seed, args.dump)
+    if args.load:
+        load_csv(args.output, args.create_table)
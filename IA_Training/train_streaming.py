@@ -0,0 +1,221 @@
+"""
+Entrenamiento fuera de memoria del clasificador de riesgo.
+
+A diferencia de train_once.py, no carga la tabla 'readings' completa: la recorre por
+bloques con paginación keyset (id_reading > último visto) y entrena de forma
+incremental con StandardScaler.partial_fit + SGDClassifier(loss='log_loss').partial_fit.
+La memoria depende de --chunk-size y del tamaño del holdout, no del tamaño de la tabla.
+
+Uso:
+    python train_streaming.py --epochs 5 --output health_classifier.pkl
+
+Genera el modelo (.pkl, un Pipeline escalador + clasificador) y un .json con metadatos:
+orden de las columnas, filas de entrenamiento, métricas del holdout y hash de versión.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+from datetime import datetime
+
+import joblib
+import mysql.connector
+import numpy as np
+import sklearn
+from dotenv import load_dotenv
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score, log_loss, precision_score, recall_score, roc_auc_score
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+load_dotenv()
+
+FEATURE_COLUMNS = ['bpm', 'temperature', 'oxygen_level']
+CLASSES = np.array([0, 1])
+
+# Página keyset: sin OFFSET, cada bloque empieza donde terminó el anterior
+GET_CHUNK = """
+    SELECT id_reading, bpm, temperature, oxygen_level, risk_label
+    FROM readings
+    WHERE id_reading > %s
+      AND bpm IS NOT NULL AND temperature IS NOT NULL AND oxygen_level IS NOT NULL AND risk_label IS NOT NULL
+    ORDER BY id_reading
+    LIMIT %s
+"""
+
+
+def connect():
+    return mysql.connector.connect(
+        host=os.getenv("DB_HOST", "localhost"),
+        user=os.getenv("DB_USER", "root"),
+        password=os.getenv("DB_PASSWORD", ""),
+        database=os.getenv("DB_NAME", "guardianAngel")
+    )
+
+
+def iter_chunks(conn, chunk_size):
+    """Bloques (ids, X, y) de toda la tabla en orden de id_reading."""
+    last_id = 0
+    with conn.cursor() as cursor:
+        while True:
+            cursor.execute(GET_CHUNK, (last_id, chunk_size))
+            rows = cursor.fetchall()
+            if not rows:
+                return
+            data = np.asarray(rows, dtype=np.float64)
+            last_id = int(data[-1, 0])
+            yield data[:, 0].astype(np.int64), data[:, 1:4], data[:, 4].astype(np.int64)
+
+
+def in_holdout(ids, fraction):
+    """
+    Asignación determinista al holdout por hash del id: la misma fila cae siempre del
+    mismo lado en todas las pasadas, así nunca se entrena con filas de evaluación.
+    """
+    hashed = (ids.astype(np.uint64) * np.uint64(2654435761)) % np.uint64(2 ** 32)
+    return hashed < np.uint64(int(fraction * 2 ** 32))
+
+
+class StratifiedReservoir:
+    """
+    Muestra uniforme de tamaño fijo por clase (algoritmo R). Al final se recorta cada
+    clase para que el holdout conserve la proporción de clases observada.
+    """
+
+    def __init__(self, capacity, seed=42):
+        self.capacity = capacity
+        self.samples = {}
+        self.seen = {}
+        self._random = random.Random(seed)
+
+    def add(self, x, label):
+        reservoir = self.samples.setdefault(label, [])
+        seen = self.seen.get(label, 0) + 1
+        self.seen[label] = seen
+        if len(reservoir) < self.capacity:
+            reservoir.append(x)
+        else:
+            index = self._random.randrange(seen)
+            if index < self.capacity:
+                reservoir[index] = x
+
+    def stratified(self):
+        total = sum(self.seen.values())
+        if not total:
+            return np.empty((0, len(FEATURE_COLUMNS))), np.empty(0, dtype=np.int64)
+        # Tamaño máximo que respeta las proporciones con lo que cabe en cada reservorio
+        size = min(len(self.samples[label]) * total / self.seen[label] for label in self.seen)
+        X, y = [], []
+        for label, reservoir in self.samples.items():
+            self._random.shuffle(reservoir)
+            take = max(1, int(round(size * self.seen[label] / total)))
+            X.extend(reservoir[:take])
+            y.extend([label] * min(take, len(reservoir)))
+        return np.asarray(X), np.asarray(y, dtype=np.int64)
+
+
+def evaluate(model, X, y):
+    if len(y) == 0:
+        return {}
+    proba = model.predict_proba(X)[:, list(model.classes_).index(1)]
+    predicted = (proba > 0.5).astype(np.int64)
+    metrics = {
+        "accuracy": accuracy_score(y, predicted),
+        "precision": precision_score(y, predicted, zero_division=0),
+        "recall": recall_score(y, predicted, zero_division=0),
+        "f1": f1_score(y, predicted, zero_division=0),
+        "log_loss": log_loss(y, proba, labels=CLASSES),
+    }
+    if len(np.unique(y)) == 2:
+        metrics["roc_auc"] = roc_auc_score(y, proba)
+    return {name: round(float(value), 4) for name, value in metrics.items()}
+
+
+def train(chunk_size, epochs, holdout_fraction, holdout_size, alpha, output):
+    print("🔌 Conectando a BD...")
+    try:
+        conn = connect()
+    except Exception as e:
+        print(f" Error conexión: {e}")
+        return
+
+    scaler = StandardScaler()
+    classifier = SGDClassifier(loss='log_loss', alpha=alpha, random_state=42)
+    reservoir = StratifiedReservoir(holdout_size)
+    rng = np.random.default_rng(42)
+    training_rows = 0
+    class_counts = {0: 0, 1: 0}
+
+    try:
+        # Pasada 1: estadísticas del escalador y holdout (no se ajusta el clasificador)
+        print(" Pasada 1: escalador y holdout...")
+        for ids, X, y in iter_chunks(conn, chunk_size):
+            mask = in_holdout(ids, holdout_fraction)
+            for x, label in zip(X[mask], y[mask]):
+                reservoir.add(x, int(label))
+            X_train, y_train = X[~mask], y[~mask]
+            if len(y_train):
+                scaler.partial_fit(X_train)
+                training_rows += len(y_train)
+                for label, count in zip(*np.unique(y_train, return_counts=True)):
+                    class_counts[int(label)] = class_counts.get(int(label), 0) + int(count)
+
+        print(f" Filas de entrenamiento: {training_rows}")
+        if training_rows < 100:
+            print(" Error: Pocos datos. Importa el SQL generado primero.")
+            return
+
+        X_holdout, y_holdout = reservoir.stratified()
+        # Pasadas 2..n: descenso de gradiente estocástico por bloques
+        for epoch in range(1, epochs + 1):
+            for ids, X, y in iter_chunks(conn, chunk_size):
+                mask = ~in_holdout(ids, holdout_fraction)
+                if not mask.any():
+                    continue
+                order = rng.permutation(int(mask.sum()))
+                classifier.partial_fit(scaler.transform(X[mask][order]), y[mask][order], classes=CLASSES)
+            model = Pipeline([('scaler', scaler), ('classifier', classifier)])
+            print(f" Época {epoch}/{epochs}: {evaluate(model, X_holdout, y_holdout)}")
+    finally:
+        conn.close()
+
+    model = Pipeline([('scaler', scaler), ('classifier', classifier)])
+    metrics = evaluate(model, X_holdout, y_holdout)
+
+    joblib.dump(model, output)
+    with open(output, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    metadata = {
+        "version": digest[:12],
+        "sha256": digest,
+        "model_type": "Pipeline(StandardScaler, SGDClassifier(log_loss))",
+        "feature_columns": FEATURE_COLUMNS,
+        "training_rows": training_rows,
+        "class_counts": class_counts,
+        "holdout_rows": int(len(y_holdout)),
+        "holdout_fraction": holdout_fraction,
+        "epochs": epochs,
+        "metrics": metrics,
+        "sklearn_version": sklearn.__version__,
+        "trained_at": datetime.now().isoformat(timespec='seconds'),
+    }
+    metadata_path = os.path.splitext(output)[0] + '.json'
+    with open(metadata_path, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2)
+
+    print(f" Métricas del holdout: {metrics}")
+    print(f" Modelo guardado: {output} (versión {metadata['version']})")
+    print(f" Metadatos: {metadata_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entrena el clasificador de riesgo por bloques (memoria acotada).")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="Filas por bloque leído de la BD.")
+    parser.add_argument("--epochs", type=int, default=5, help="Pasadas de SGD sobre los datos de entrenamiento.")
+    parser.add_argument("--holdout", type=float, default=0.1, help="Fracción de filas reservadas para evaluación.")
+    parser.add_argument("--holdout-size", type=int, default=20000, help="Máximo de filas del holdout por clase.")
+    parser.add_argument("--alpha", type=float, default=1e-4, help="Regularización L2 de SGDClassifier.")
+    parser.add_argument("--output", default="health_classifier.pkl", help="Ruta del modelo generado.")
+    args = parser.parse_args()
+    train(args.chunk_size, args.epochs, args.holdout, args.holdout_size, args.alpha, args.output)
@@ -0,0 +1,115 @@
+"""
+Microbenchmark de serialización JSON y compresión para los listados.
+
+Genera filas con la misma forma que devuelven ChildModel.get_all_with_relations,
+UserModel.get_all, SmartwatchModel.get_all y DaycareModel.get_all (no necesita BD) y
+compara, por listado:
+
+  * tiempo de codificación con el proveedor por defecto de Flask, con FastJSONProvider
+    usando la biblioteca estándar y con orjson (si está instalado)
+  * bytes enviados: sin comprimir, gzip y br (si está instalado brotli)
+
+Uso:
+    python benchmarks/bench_json.py --rows 20000 --repeat 5
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from services import json_provider
+from services.compression import available_encodings, compress
+from services.json_provider import FastJSONProvider, orjson_available
+
+NAMES = ["Sofía", "Mateo", "Valentina", "Santiago", "Camila", "Sebastián", "Regina", "Diego", "Ximena", "Emiliano"]
+SURNAMES = ["López", "García", "Hernández", "Martínez", "Pérez", "Ramírez", "Núñez", "Ortega"]
+
+
+def children_rows(n, rnd):
+    return [{
+        "id_child": i, "child_first_name": rnd.choice(NAMES), "child_last_name": rnd.choice(SURNAMES),
+        "birth_date": date(2020, 1, 1) + timedelta(days=rnd.randrange(1500)), "profile_image": f"/img/{i}.png",
+        "id_smartwatch": i, "daycare_name": f"Guardería {i % 40}", "tutor_first_name": rnd.choice(NAMES),
+        "tutor_last_name": rnd.choice(SURNAMES), "caregiver_first_name": rnd.choice(NAMES + [None]),
+        "caregiver_last_name": rnd.choice(SURNAMES + [None]), "device_id": f"SW-{i:06d}", "smartwatch_model": "KidsSafe v2",
+    } for i in range(1, n + 1)]
+
+
+def users_rows(n, rnd):
+    return [{
+        "id_user": i, "id_daycare": i % 40 or None, "username": f"user{i}", "first_name": rnd.choice(NAMES),
+        "last_name": rnd.choice(SURNAMES), "email": f"user{i}@example.com", "phone": f"55{rnd.randrange(10**8):08d}",
+        "role": rnd.choice(["tutor", "caregiver", "admin"]),
+        "created_at": datetime(2025, 1, 1) + timedelta(seconds=rnd.randrange(30_000_000)),
+    } for i in range(1, n + 1)]
+
+
+def smartwatches_rows(n, rnd):
+    return [{"id_smartwatch": i, "device_id": f"SW-{i:06d}", "model": "KidsSafe v2",
+             "status": rnd.choice(["active", "inactive"])} for i in range(1, n + 1)]
+
+
+def daycares_rows(n, rnd):
+    return [{"id_daycare": i, "name": f"Guardería {i}", "address": f"Calle {i} #{rnd.randrange(999)}",
+             "phone": f"55{rnd.randrange(10**8):08d}"} for i in range(1, max(n // 100, 10) + 1)]
+
+
+def averages_rows(n, rnd):
+    # Promedios de AVG(): MySQL los entrega como Decimal
+    return [{"first_name": rnd.choice(NAMES), "last_name": rnd.choice(SURNAMES),
+             "avg_temperature": Decimal(f"{rnd.uniform(36, 38):.4f}"),
+             "avg_heart_rate": Decimal(f"{rnd.uniform(80, 140):.4f}"),
+             "avg_spo2_level": Decimal(f"{rnd.uniform(94, 100):.4f}")} for _ in range(n)]
+
+
+LISTS = {
+    "/api/children": children_rows,
+    "/api/users/": users_rows,
+    "/api/smartwatches/": smartwatches_rows,
+    "/api/daycares/": daycares_rows,
+    "sensors/average (Decimal)": averages_rows,
+}
+
+
+def encoders():
+    app = Flask(__name__)
+    yield "flask default", DefaultJSONProvider(app)
+    json_provider.JSON_ENCODER = 'stdlib'
+    yield "fast (stdlib)", FastJSONProvider(app)
+    if orjson_available():
+        json_provider.JSON_ENCODER = 'orjson'
+        yield "fast (orjson)", FastJSONProvider(app)
+    else:
+        print("(orjson no está instalado: pip install orjson)")
+
+
+def bench(rows, repeat):
+    rnd = random.Random(42)
+    providers = list(encoders())
+    print(f"{'listado':<28}{'codificador':<16}{'filas':>8}{'ms':>10}{'bytes':>12}"
+          + "".join(f"{e:>10}" for e in available_encodings()))
+    for name, build in LISTS.items():
+        data = build(rows, rnd)
+        for label, provider in providers:
+            # Igual que jsonify fuera de modo debug: JSON compacto
+            encode = lambda: provider.dumps(data, separators=(',', ':'))
+            seconds = min(timeit.repeat(encode, number=1, repeat=repeat))
+            body = encode().encode()
+            sizes = "".join(f"{len(compress(body, e)):>10}" for e in available_encodings())
+            print(f"{name:<28}{label:<16}{len(data):>8}{seconds * 1000:>10.1f}{len(body):>12}{sizes}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara codificadores JSON y compresión en los listados.")
+    parser.add_argument("--rows", type=int, default=20000, help="Filas por listado (guarderías: rows/100).")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones; se reporta la mejor.")
+    args = parser.parse_args()
+    bench(args.rows, args.repeat)
@@ -1,5 +1,8 @@
-import mysql.connector.pooling
+import mysql.connector
 import os
+import threading
+import time
+from collections import deque
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -11,24 +14,173 @@ db_config = {
     'database': os.getenv('DB_NAME')
 }
 
-try:
-    connection_pool = mysql.connector.pooling.MySQLConnectionPool(
-        pool_name="api_pool",
-        pool_size=5,
-        **db_config
-    )
-    print("Pool de conexiones creado exitosamente.")
+# --- Configuración del pool (todas opcionales) ---
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))                 # Conexiones que se mantienen abiertas
+POOL_MAX_OVERFLOW = int(os.getenv('DB_POOL_MAX_OVERFLOW', '10'))  # Conexiones extra temporales en ráfagas
+POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))        # Segundos de espera por una conexión libre
+POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))        # Edad máxima (s) antes de reabrir una conexión
+
+
+class PoolTimeoutError(mysql.connector.errors.PoolError):
+    """No se liberó ninguna conexión dentro del tiempo de espera."""
+
+
+class PooledConnection:
+    """
+    Envoltura de una conexión del pool. Se usa igual que la conexión de mysql.connector
+    (cursor, commit, rollback, is_connected...) y al cerrarse, o al salir del bloque
+    'with', regresa al pool en lugar de cerrarse.
+    """
+
+    def __init__(self, pool, cnx, created_at):
+        self._pool = pool
+        self._cnx = cnx
+        self._created_at = created_at
+
+    def __getattr__(self, name):
+        return getattr(self._cnx, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self._cnx is not None:
+            cnx, self._cnx = self._cnx, None
+            self._pool._release(cnx, self._created_at)
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones con tamaño base más desborde, espera con tiempo límite cuando
+    está agotado, validación con ping al entregar y reciclaje por antigüedad.
+    Las conexiones se abren bajo demanda, así que una BD caída al arrancar no detiene
+    la aplicación: cada petición reintenta conectar.
+    """
+
+    def __init__(self, size, max_overflow, timeout, recycle, **config):
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self._config = config
+        self._idle = deque()
+        self._cond = threading.Condition()
+        self._in_use = 0
+        self._stats = {"checkouts": 0, "timeouts": 0, "connects": 0, "reconnects": 0,
+                       "recycled": 0, "connect_errors": 0, "wait_time_total": 0.0}
+
+    def get_connection(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        started = time.monotonic()
+        with self._cond:
+            while not self._idle and self._in_use >= self.size + self.max_overflow:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeoutError(
+                        msg=f"No hay conexiones disponibles tras {timeout:.1f}s "
+                            f"({self._in_use} en uso)")
+                self._cond.wait(remaining)
+            entry = self._idle.pop() if self._idle else None
+            self._in_use += 1
+            self._stats["checkouts"] += 1
+            self._stats["wait_time_total"] += time.monotonic() - started
+
+        try:
+            cnx, created_at = self._prepare(entry)
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return PooledConnection(self, cnx, created_at)
+
+    def _prepare(self, entry):
+        """Valida (o abre) la conexión fuera del lock."""
+        if entry is not None:
+            cnx, created_at = entry
+            if time.monotonic() - created_at > self.recycle:
+                self._count("recycled")
+                self._close_quietly(cnx)
+            else:
+                try:
+                    cnx.ping(reconnect=False)
+                    return cnx, created_at
+                except mysql.connector.Error:
+                    self._count("reconnects")
+                    self._close_quietly(cnx)
+        try:
+            cnx = mysql.connector.connect(**self._config)
+        except mysql.connector.Error:
+            self._count("connect_errors")
+            raise
+        self._count("connects")
+        return cnx, time.monotonic()
+
+    def _count(self, key):
+        with self._cond:
+            self._stats[key] += 1
+
+    def _release(self, cnx, created_at):
+        try:
+            if cnx.in_transaction:
+                cnx.rollback()
+            keep = cnx.is_connected()
+        except mysql.connector.Error:
+            keep = False
+        with self._cond:
+            self._in_use -= 1
+            # Las conexiones de desborde se cierran al devolverse
+            if keep and len(self._idle) + self._in_use < self.size:
+                self._idle.append((cnx, created_at))
+                cnx = None
+            self._cond.notify()
+        if cnx is not None:
+            self._close_quietly(cnx)
+
+    @staticmethod
+    def _close_quietly(cnx):
+        try:
+            cnx.close()
+        except Exception:
+            pass
+
+    def stats(self):
+        with self._cond:
+            return {
+                **self._stats,
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "timeout": self.timeout,
+                "recycle": self.recycle,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+            }
+
+
+connection_pool = ConnectionPool(
+    size=POOL_SIZE,
+    max_overflow=POOL_MAX_OVERFLOW,
+    timeout=POOL_TIMEOUT,
+    recycle=POOL_RECYCLE,
+    **db_config
+)
+print(f"Pool de conexiones configurado (size={POOL_SIZE}, overflow={POOL_MAX_OVERFLOW}, timeout={POOL_TIMEOUT}s).")
 
-except mysql.connector.Error as err:
-    print(f" Error al crear el pool de conexiones: {err}")
-    exit()
 
 def get_db_connection():
-    """Obtiene una conexión del pool."""
-    try:
-        conn = connection_pool.get_connection()
-        if conn.is_connected():
-            return conn
-    except mysql.connector.Error as err:
-        print(f" Error al obtener conexión del pool: {err}")
-        return None
\ No newline at end of file
+    """
+    Obtiene una conexión del pool. Si el pool está agotado espera hasta DB_POOL_TIMEOUT
+    segundos y luego lanza PoolTimeoutError; si la BD no responde lanza el error de
+    mysql.connector en lugar de devolver None.
+    """
+    return connection_pool.get_connection()
+
+
+def get_pool_stats():
+    """Estadísticas del pool de conexiones."""
+    return connection_pool.stats()
@@ -0,0 +1,135 @@
+import argparse
+import datetime
+
+from models.reading_model import ReadingModel
+from services.migrations import MigrationRunner, verify_indexes
+from services.model_registry import ModelRegistry
+from services.retention import ARCHIVE_DIR, RETENTION_MONTHS, retained_since, run_retention
+
+
+def rebuild_rollups(args):
+    date_from = datetime.date.fromisoformat(args.date_from)
+    date_to = datetime.date.fromisoformat(args.date_to)
+    if date_to <= date_from:
+        raise SystemExit("❌ '--to' debe ser posterior a '--from'.")
+    retained = retained_since()
+    if retained and date_from < retained:
+        # Recalcular borraría los resúmenes de lecturas que ya solo existen en el archivo
+        raise SystemExit(f"❌ Las lecturas anteriores a {retained} ya se archivaron; use '--from {retained}' o posterior.")
+    print(f"🔄 Recalculando resúmenes de {date_from} a {date_to} (sin incluir)...")
+    ReadingModel.rebuild_rollups(date_from, date_to)
+    print("✅ Resúmenes recalculados.")
+
+
+def migrate(args):
+    runner = MigrationRunner()
+    if args.list:
+        for version, filename, applied_at, changed in runner.status():
+            state = f"aplicada {applied_at}" if applied_at else "pendiente"
+            warning = "  ⚠️ el archivo cambió después de aplicarse" if changed else ""
+            print(f"  {version:03d}  {filename:<40} {state}{warning}")
+        return
+    applied = runner.migrate(target=args.target)
+    if applied:
+        print(f"✅ {len(applied)} migraciones aplicadas.")
+    else:
+        print("✅ El esquema ya está al día.")
+
+
+def check_indexes(args):
+    problems = 0
+    for name, table, access, key, expected, ok in verify_indexes():
+        mark = "✅" if ok else "❌"
+        hint = "" if key in expected else f" (se esperaba {' o '.join(expected)})"
+        print(f"{mark} {name}: {table} type={access} key={key}{hint}")
+        problems += not ok
+    if problems:
+        raise SystemExit(f"❌ {problems} consultas sin índice. ¿Se aplicaron las migraciones (python manage.py migrate)?")
+
+
+def retention(args):
+    if args.months < 1:
+        raise SystemExit("❌ '--months' debe ser al menos 1.")
+    action = "Particiones que se archivarían" if args.dry_run else "Archivando particiones"
+    print(f"🔄 {action} con más de {args.months} meses...")
+    try:
+        archived = run_retention(months=args.months, archive_dir=args.archive_dir,
+                                 export=not args.no_export, dry_run=args.dry_run)
+    except RuntimeError as e:
+        raise SystemExit(f"❌ {e}")
+    if args.dry_run:
+        for table, partition, _, _ in archived:
+            print(f"   · {table}: {partition}")
+    print(f"✅ {len(archived)} particiones {'por archivar' if args.dry_run else 'archivadas'}.")
+
+
+def models(args):
+    registry = ModelRegistry()
+    try:
+        if args.model_command == "register":
+            version = registry.register(args.path)
+            print(f"✅ Modelo registrado como {version}.")
+            if args.promote:
+                registry.promote(version)
+        elif args.model_command == "promote":
+            registry.promote(args.version)
+        elif args.model_command == "shadow":
+            if not args.version and not args.clear:
+                raise SystemExit("❌ Indica una versión o '--clear'.")
+            registry.set_candidate(None if args.clear else args.version)
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+
+    manifest = registry.read_manifest() or {}
+    for entry in registry.versions():
+        marks = [name for name in ("active", "candidate") if manifest.get(name) == entry["version"]]
+        metrics = entry.get("metrics", {})
+        print(f"{'▶' if 'active' in marks else ' '} {entry['version']}  {entry.get('registered_at', '')}  "
+              f"f1={metrics.get('f1', '-')} auc={metrics.get('roc_auc', '-')}  {' '.join(marks)}")
+    # Los procesos de la API detectan el cambio del manifiesto (MODEL_REGISTRY_POLL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tareas de mantenimiento de la API Angel Care.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rollups = subparsers.add_parser("rebuild-rollups", help="Recalcula vitals_rollups desde las lecturas crudas.")
+    rollups.add_argument("--from", dest="date_from", required=True, help="Fecha inicial YYYY-MM-DD (incluida).")
+    rollups.add_argument("--to", dest="date_to", required=True, help="Fecha final YYYY-MM-DD (excluida).")
+    rollups.set_defaults(func=rebuild_rollups)
+
+    migrations = subparsers.add_parser("migrate", help="Aplica las migraciones pendientes de migrations/.")
+    migrations.add_argument("--list", action="store_true", help="Solo muestra qué migraciones están aplicadas.")
+    migrations.add_argument("--target", type=int, help="Aplica hasta esta versión (incluida).")
+    migrations.set_defaults(func=migrate)
+
+    indexes = subparsers.add_parser("verify-indexes", help="Revisa con EXPLAIN que las consultas frecuentes usen índices.")
+    indexes.set_defaults(func=check_indexes)
+
+    retention_parser = subparsers.add_parser(
+        "retention", help="Archiva y elimina las particiones de lecturas más viejas que --months.")
+    retention_parser.add_argument("--months", type=int, default=RETENTION_MONTHS,
+                                  help=f"Meses de lecturas crudas que se conservan (por defecto {RETENTION_MONTHS}).")
+    retention_parser.add_argument("--archive-dir", default=ARCHIVE_DIR, help="Carpeta de los archivos exportados.")
+    retention_parser.add_argument("--no-export", action="store_true", help="Elimina sin exportar.")
+    retention_parser.add_argument("--dry-run", action="store_true", help="Solo muestra qué se archivaría.")
+    retention_parser.set_defaults(func=retention)
+
+    models_parser = subparsers.add_parser("models", help="Registro de modelos de riesgo (ver services/model_registry.py).")
+    model_commands = models_parser.add_subparsers(dest="model_command")
+    register = model_commands.add_parser("register", help="Copia un .pkl (y su .json de metadatos) al registro.")
+    register.add_argument("path", help="Ruta del .pkl generado por IA_Training.")
+    register.add_argument("--promote", action="store_true", help="Activa la versión al registrarla.")
+    promote = model_commands.add_parser("promote", help="Activa una versión registrada.")
+    promote.add_argument("version")
+    shadow = model_commands.add_parser("shadow", help="Evalúa una versión en sombra junto al modelo activo.")
+    shadow.add_argument("version", nargs="?")
+    shadow.add_argument("--clear", action="store_true", help="Deja de evaluar en sombra.")
+    models_parser.set_defaults(func=models)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
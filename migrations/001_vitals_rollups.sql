@@ -0,0 +1,15 @@
+-- Resúmenes pre-agregados de signos vitales por smartwatch.
+-- La ingesta los actualiza de forma incremental (INSERT ... ON DUPLICATE KEY UPDATE)
+-- y 'python manage.py rebuild-rollups' los recalcula desde las tablas crudas.
+-- El promedio de un bucket es sum_value / sample_count.
+CREATE TABLE IF NOT EXISTS vitals_rollups (
+  id_smartwatch INT NOT NULL,
+  sensor ENUM('temperature', 'heart_rate', 'spo2') NOT NULL,
+  granularity ENUM('minute', 'hour', 'day') NOT NULL,
+  bucket_start DATETIME NOT NULL,
+  min_value DOUBLE NOT NULL,
+  max_value DOUBLE NOT NULL,
+  sum_value DOUBLE NOT NULL,
+  sample_count INT UNSIGNED NOT NULL,
+  PRIMARY KEY (id_smartwatch, sensor, granularity, bucket_start)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
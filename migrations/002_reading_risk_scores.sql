@@ -0,0 +1,16 @@
+-- Riesgo calculado por el clasificador al momento de la ingesta, para muestras que
+-- traen ritmo cardíaco, temperatura y SpO2 juntos. Las consultas de alertas filtran
+-- por is_critical con índice en lugar de volver a ejecutar el modelo.
+CREATE TABLE IF NOT EXISTS reading_risk_scores (
+  id_score BIGINT NOT NULL AUTO_INCREMENT,
+  id_smartwatch INT NOT NULL,
+  timestamp DATETIME NOT NULL,
+  beats_per_minute INT NOT NULL,
+  temperature DOUBLE NOT NULL,
+  spo2_level DOUBLE NOT NULL,
+  risk_probability DOUBLE NOT NULL,
+  is_critical TINYINT(1) NOT NULL,
+  PRIMARY KEY (id_score),
+  KEY idx_risk_smartwatch_time (id_smartwatch, timestamp),
+  KEY idx_risk_critical_time (is_critical, id_smartwatch, timestamp)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
@@ -0,0 +1,37 @@
+-- Alertas generadas por el motor de alertas al ingerir lecturas (caída, riesgo del
+-- modelo, signos vitales fuera de rango sostenido). El índice por is_acknowledged
+-- permite listar primero las pendientes sin ordenar toda la tabla.
+CREATE TABLE IF NOT EXISTS alerts (
+  id_alert BIGINT NOT NULL AUTO_INCREMENT,
+  id_child INT NOT NULL,
+  id_daycare INT NOT NULL,
+  id_smartwatch INT NOT NULL,
+  alert_type VARCHAR(32) NOT NULL,        -- fall | risk | heart_rate | temperature | spo2
+  severity VARCHAR(16) NOT NULL,          -- critical | warning
+  message VARCHAR(255) NOT NULL,
+  value DOUBLE NULL,
+  triggered_at DATETIME NOT NULL,
+  is_acknowledged TINYINT(1) NOT NULL DEFAULT 0,
+  acknowledged_at DATETIME NULL,
+  acknowledged_by INT NULL,
+  PRIMARY KEY (id_alert),
+  KEY idx_alerts_daycare_ack (id_daycare, is_acknowledged, triggered_at),
+  KEY idx_alerts_child_ack (id_child, is_acknowledged, triggered_at),
+  KEY idx_alerts_ack (is_acknowledged, triggered_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Umbrales por niño. Las columnas en NULL usan los valores por defecto del servidor
+-- (variables ALERT_* del .env).
+CREATE TABLE IF NOT EXISTS child_alert_rules (
+  id_child INT NOT NULL,
+  risk_threshold DOUBLE NULL,             -- Probabilidad del modelo en porcentaje (0-100)
+  heart_rate_min DOUBLE NULL,
+  heart_rate_max DOUBLE NULL,
+  temperature_min DOUBLE NULL,
+  temperature_max DOUBLE NULL,
+  spo2_min DOUBLE NULL,
+  sustain_seconds INT NULL,               -- Tiempo fuera de rango antes de alertar
+  cooldown_seconds INT NULL,              -- Tiempo mínimo entre alertas del mismo tipo
+  updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (id_child)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
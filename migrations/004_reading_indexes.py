@@ -0,0 +1,44 @@
+"""
+Índices para las consultas calientes de lecturas y de niños.
+
+Tablas de lecturas:
+  * (id_smartwatch, timestamp): historial por rango y cursor keyset. InnoDB agrega la
+    llave primaria al final del índice, así que el orden (timestamp, id) sale
+    del índice sin ordenar en memoria.
+  * (id_smartwatch, timestamp, valor): cubre la última lectura, el máximo por grupo de
+    /api/daycares/<id>/vitals/latest, el downsampling y la reconstrucción de resúmenes
+    sin leer la fila completa.
+
+Tablas relacionadas (uniones de models/child_model.py): niños por guardería/tutor/
+cuidador/smartwatch, cuidadores por guardería, notas y horarios por niño.
+
+Se omite cualquier índice que ya exista con las mismas columnas iniciales (por ejemplo
+los que MySQL crea para las llaves foráneas).
+"""
+from services.migrations import ensure_index
+
+READING_INDEXES = [
+    ('temperature_readings', 'temperature'),
+    ('heart_rate_readings', 'beats_per_minute'),
+    ('oxygenation_readings', 'spo2_level'),
+    ('accelerometer_readings', 'is_fall'),
+]
+
+RELATION_INDEXES = [
+    ('children', 'idx_children_daycare', ['id_daycare']),
+    ('children', 'idx_children_tutor', ['id_tutor']),
+    ('children', 'idx_children_caregiver', ['id_caregiver']),
+    ('children', 'idx_children_smartwatch', ['id_smartwatch']),
+    ('users', 'idx_users_daycare_role', ['id_daycare', 'role']),
+    ('child_notes', 'idx_notes_child_created', ['id_child', 'created_at']),
+    ('weekly_schedules', 'idx_schedules_child', ['id_child']),
+]
+
+
+def upgrade(cursor):
+    for table, value_column in READING_INDEXES:
+        prefix = table.replace('_readings', '')
+        ensure_index(cursor, table, f"idx_{prefix}_sw_time", ['id_smartwatch', 'timestamp'])
+        ensure_index(cursor, table, f"idx_{prefix}_sw_time_value", ['id_smartwatch', 'timestamp', value_column])
+    for table, name, columns in RELATION_INDEXES:
+        ensure_index(cursor, table, name, columns)
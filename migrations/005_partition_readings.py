@@ -0,0 +1,14 @@
+"""
+Particiona por mes (RANGE sobre 'timestamp') las cuatro tablas de lecturas crudas.
+
+Las consultas por rango de fechas solo leen las particiones involucradas y la
+retención (python manage.py retention) archiva y elimina meses completos con
+DROP PARTITION en lugar de DELETE. Ver services/retention.py para las condiciones
+que impone MySQL (llave primaria con 'timestamp', sin llaves foráneas).
+"""
+from services.retention import READING_TABLES, partition_table
+
+
+def upgrade(cursor):
+    for table in READING_TABLES:
+        partition_table(cursor, table)
@@ -0,0 +1,21 @@
+"""
+Índices para los listados paginados (services/list_query.py).
+
+Cada listado filtra por igualdad y avanza por keyset sobre la llave primaria; como
+InnoDB agrega la llave primaria al final de cada índice secundario, un índice sobre la
+columna filtrada ya entrega las filas en el orden del cursor. Los filtros por guardería
+de niños y usuarios ya tienen índice (migración 004).
+"""
+from services.migrations import ensure_index
+
+LIST_INDEXES = [
+    ('users', 'idx_users_role', ['role']),
+    ('smartwatches', 'idx_smartwatches_status', ['status']),
+    ('smartwatches', 'idx_smartwatches_model', ['model']),
+    ('daycares', 'idx_daycares_name', ['name']),
+]
+
+
+def upgrade(cursor):
+    for table, name, columns in LIST_INDEXES:
+        ensure_index(cursor, table, name, columns)
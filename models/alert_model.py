@@ -0,0 +1,131 @@
+from db import get_db_connection
+from services.alert_engine import RULE_FIELDS
+
+# --- Consultas SQL para Alertas ---
+INSERT_ALERT = """
+    INSERT INTO alerts (id_child, id_daycare, id_smartwatch, alert_type, severity, message, value, triggered_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s);
+"""
+
+# Cada consulta recorre el índice (filtro, is_acknowledged, triggered_at) en orden inverso;
+# las pendientes y las atendidas se piden por separado para listar primero las pendientes.
+GET_ALERTS_BASE = """
+    SELECT id_alert, id_child, id_daycare, id_smartwatch, alert_type, severity, message, value,
+           triggered_at, is_acknowledged, acknowledged_at, acknowledged_by
+    FROM alerts
+    WHERE {where} is_acknowledged = %s
+    ORDER BY triggered_at DESC
+    LIMIT %s;
+"""
+
+GET_ALERT_BY_ID = "SELECT * FROM alerts WHERE id_alert = %s;"
+
+ACKNOWLEDGE_ALERT = """
+    UPDATE alerts SET is_acknowledged = 1, acknowledged_at = NOW(), acknowledged_by = %s
+    WHERE id_alert = %s AND is_acknowledged = 0;
+"""
+
+GET_RULES_BY_CHILDREN = "SELECT * FROM child_alert_rules WHERE id_child IN ({placeholders});"
+
+UPSERT_RULES = """
+    INSERT INTO child_alert_rules (id_child, {columns}) VALUES (%s, {placeholders})
+    ON DUPLICATE KEY UPDATE {updates};
+"""
+
+ALERT_FILTERS = ('id_daycare', 'id_child', 'id_smartwatch')
+
+
+class AlertModel:
+    @staticmethod
+    def create_many(alerts):
+        """Guarda las alertas en un solo INSERT multi-VALUES. Lanza la excepción de la BD si falla."""
+        rows = [(a['id_child'], a['id_daycare'], a['id_smartwatch'], a['alert_type'], a['severity'],
+                 a['message'], a['value'], a['triggered_at']) for a in alerts]
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.executemany(INSERT_ALERT, rows)
+            conn.commit()
+
+    @staticmethod
+    def get_alerts(filters, include_acknowledged=False, limit=100):
+        """
+        Lista alertas filtrando por id_daycare / id_child / id_smartwatch.
+        Primero las no atendidas (más recientes primero) y, si se piden, después las atendidas.
+        """
+        where = "".join(f"{field} = %s AND " for field in ALERT_FILTERS if field in filters)
+        values = [filters[field] for field in ALERT_FILTERS if field in filters]
+        query = GET_ALERTS_BASE.format(where=where)
+        try:
+            with get_db_connection() as conn:
+                with conn.cursor(dictionary=True) as cursor:
+                    cursor.execute(query, (*values, 0, limit))
+                    alerts = cursor.fetchall()
+                    if include_acknowledged and len(alerts) < limit:
+                        cursor.execute(query, (*values, 1, limit - len(alerts)))
+                        alerts.extend(cursor.fetchall())
+                    return alerts
+        except Exception as e:
+            print(f"Error en get_alerts: {e}")
+            return None
+
+    @staticmethod
+    def get_by_id(alert_id):
+        try:
+            with get_db_connection() as conn:
+                with conn.cursor(dictionary=True) as cursor:
+                    cursor.execute(GET_ALERT_BY_ID, (alert_id,))
+                    return cursor.fetchone()
+        except Exception as e:
+            print(f"Error en get_by_id (alertas): {e}")
+            return None
+
+    @staticmethod
+    def acknowledge(alert_id, user_id=None):
+        """Marca la alerta como atendida. Retorna False si no existe o ya estaba atendida."""
+        try:
+            with get_db_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(ACKNOWLEDGE_ALERT, (user_id, alert_id))
+                    if cursor.rowcount == 0:
+                        return False
+                conn.commit()
+            return True
+        except Exception as e:
+            print(f"Error en acknowledge: {e}")
+            return False
+
+    @staticmethod
+    def get_rules(child_ids):
+        """Reglas guardadas {id_child: fila}; los niños sin fila usan los valores por defecto."""
+        if not child_ids:
+            return {}
+        query = GET_RULES_BY_CHILDREN.format(placeholders=", ".join(["%s"] * len(child_ids)))
+        try:
+            with get_db_connection() as conn:
+                with conn.cursor(dictionary=True) as cursor:
+                    cursor.execute(query, tuple(child_ids))
+                    return {row['id_child']: row for row in cursor.fetchall()}
+        except Exception as e:
+            print(f"Error en get_rules: {e}")
+            return {}
+
+    @staticmethod
+    def save_rules(child_id, fields):
+        """Crea o actualiza las reglas del niño con los campos enviados (null = valor por defecto)."""
+        columns = [field for field in RULE_FIELDS if field in fields]
+        if not columns:
+            return False
+        query = UPSERT_RULES.format(
+            columns=", ".join(columns),
+            placeholders=", ".join(["%s"] * len(columns)),
+            updates=", ".join(f"{column} = VALUES({column})" for column in columns),
+        )
+        try:
+            with get_db_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(query, (child_id, *[fields[column] for column in columns]))
+                conn.commit()
+            return True
+        except Exception as e:
+            print(f"Error en save_rules: {e}")
+            return False
@@ -1,34 +1,41 @@
 from db import get_db_connection
+from services.entity_cache import cached, entity_cache
+from services.list_query import ListSpec
 
 # --- Consultas SQL para el Modelo Child ---
 
-# CORRECCIÓN 1: Se agregó 'c.id_smartwatch' aquí para que AllChildren funcione
-GET_ALL_CHILDREN_WITH_RELATIONS = """
-    SELECT
-        c.id_child,
-        c.first_name AS child_first_name,
-        c.last_name AS child_last_name,
-        c.birth_date,
-        c.profile_image,
-        c.id_smartwatch,  -- <--- ESTE FALTABA
-        d.name AS daycare_name,
-        t.first_name AS tutor_first_name,
-        t.last_name AS tutor_last_name,
-        ca.first_name AS caregiver_first_name,
-        ca.last_name AS caregiver_last_name,
-        s.device_id,
-        s.model AS smartwatch_model
-    FROM
+# Listado de niños con relaciones (GET /api/children), paginado por keyset sobre id_child
+CHILDREN_LIST = ListSpec(
+    columns={
+        'id_child': 'c.id_child',
+        'child_first_name': 'c.first_name',
+        'child_last_name': 'c.last_name',
+        'birth_date': 'c.birth_date',
+        'profile_image': 'c.profile_image',
+        'id_smartwatch': 'c.id_smartwatch',
+        'daycare_name': 'd.name',
+        'tutor_first_name': 't.first_name',
+        'tutor_last_name': 't.last_name',
+        'caregiver_first_name': 'ca.first_name',
+        'caregiver_last_name': 'ca.last_name',
+        'device_id': 's.device_id',
+        'smartwatch_model': 's.model',
+    },
+    source="""
         children c
-    JOIN
-        daycares d ON c.id_daycare = d.id_daycare
-    JOIN
-        users t ON c.id_tutor = t.id_user
-    JOIN
-        smartwatches s ON c.id_smartwatch = s.id_smartwatch
-    LEFT JOIN
-        users ca ON c.id_caregiver = ca.id_user;
-"""
+        JOIN daycares d ON c.id_daycare = d.id_daycare
+        JOIN users t ON c.id_tutor = t.id_user
+        JOIN smartwatches s ON c.id_smartwatch = s.id_smartwatch
+        LEFT JOIN users ca ON c.id_caregiver = ca.id_user
+    """,
+    order=['id_child'],
+    filters={
+        'id_daycare': ('c.id_daycare', int),
+        'id_tutor': ('c.id_tutor', int),
+        'id_caregiver': ('c.id_caregiver', int),
+        'id_smartwatch': ('c.id_smartwatch', int),
+    },
+)
 
 GET_CHILDREN_WITH_TUTOR_CAREGIVER_DAYCARE = """
     SELECT
@@ -79,6 +86,16 @@ GET_CHILDREN_BY_TUTOR = """
 
 GET_CHILD_DETAILS = "SELECT * FROM children WHERE id_child = %s;"
 
+GET_CHILDREN_BY_DAYCARE = """
+    SELECT id_child, first_name, last_name, profile_image, id_smartwatch
+    FROM children
+    WHERE id_daycare = %s
+    ORDER BY first_name, last_name;
+"""
+
+# Niño y guardería de cada smartwatch, para publicar lecturas en vivo
+GET_CHILDREN_BY_SMARTWATCHES = "SELECT id_smartwatch, id_child, id_daycare FROM children WHERE id_smartwatch IN ({placeholders});"
+
 GET_TUTOR_BY_CHILD = """
     SELECT u.id_user, u.first_name, u.last_name, u.email, u.phone
     FROM users u
@@ -93,12 +110,16 @@ GET_CAREGIVERS_BY_CHILD = """
     WHERE u.role = 'caregiver' AND u.id_daycare = (SELECT id_daycare FROM children WHERE id_child = %s);
 """
 
+# Lee el resumen diario (vitals_rollups) por llave primaria en lugar de recorrer las tablas crudas
 GET_SENSOR_AVERAGES_BY_DATE = """
     SELECT
         c.first_name, c.last_name,
-        (SELECT AVG(temperature) FROM temperature_readings WHERE id_smartwatch = c.id_smartwatch AND DATE(timestamp) = %s) AS avg_temperature,
-        (SELECT AVG(beats_per_minute) FROM heart_rate_readings WHERE id_smartwatch = c.id_smartwatch AND DATE(timestamp) = %s) AS avg_heart_rate,
-        (SELECT AVG(spo2_level) FROM oxygenation_readings WHERE id_smartwatch = c.id_smartwatch AND DATE(timestamp) = %s) AS avg_spo2_level
+        (SELECT sum_value / sample_count FROM vitals_rollups
+         WHERE id_smartwatch = c.id_smartwatch AND sensor = 'temperature' AND granularity = 'day' AND bucket_start = %s) AS avg_temperature,
+        (SELECT sum_value / sample_count FROM vitals_rollups
+         WHERE id_smartwatch = c.id_smartwatch AND sensor = 'heart_rate' AND granularity = 'day' AND bucket_start = %s) AS avg_heart_rate,
+        (SELECT sum_value / sample_count FROM vitals_rollups
+         WHERE id_smartwatch = c.id_smartwatch AND sensor = 'spo2' AND granularity = 'day' AND bucket_start = %s) AS avg_spo2_level
     FROM children c
     WHERE c.id_child = %s;
 """
@@ -157,12 +178,12 @@ GET_SCHEDULE_BY_ID = "SELECT * FROM weekly_schedules WHERE id_schedule = %s;"
 
 class ChildModel:
     @staticmethod
-    def get_all_with_relations():
-        """Obtiene todos los niños con información relacionada."""
+    def get_all_with_relations(query=None):
+        """Obtiene los niños con información relacionada (una página si se pasa 'query')."""
         try:
             with get_db_connection() as conn:
                 with conn.cursor(dictionary=True) as cursor:
-                    cursor.execute(GET_ALL_CHILDREN_WITH_RELATIONS)
+                    cursor.execute(*CHILDREN_LIST.select(query))
                     return cursor.fetchall()
         except Exception as e:
             print(f"Error en get_all_with_relations: {e}")
@@ -202,6 +223,7 @@ class ChildModel:
             return []
 
     @staticmethod
+    @cached('child')
     def get_details_by_id(child_id):
         try:
             with get_db_connection() as conn:
@@ -213,6 +235,33 @@ class ChildModel:
             return None
 
     @staticmethod
+    def get_by_daycare_id(daycare_id):
+        try:
+            with get_db_connection() as conn:
+                with conn.cursor(dictionary=True) as cursor:
+                    cursor.execute(GET_CHILDREN_BY_DAYCARE, (daycare_id,))
+                    return cursor.fetchall()
+        except Exception as e:
+            print(f"Error en get_by_daycare_id: {e}")
+            return None
+
+    @staticmethod
+    def get_by_smartwatch_ids(smartwatch_ids):
+        """Retorna [{id_smartwatch, id_child, id_daycare}] de los niños con esos smartwatches."""
+        if not smartwatch_ids:
+            return []
+        query = GET_CHILDREN_BY_SMARTWATCHES.format(placeholders=", ".join(["%s"] * len(smartwatch_ids)))
+        try:
+            with get_db_connection() as conn:
+                with conn.cursor(dictionary=True) as cursor:
+                    cursor.execute(query, tuple(smartwatch_ids))
+                    return cursor.fetchall()
+        except Exception as e:
+            print(f"Error en get_by_smartwatch_ids: {e}")
+            return []
+
+    @staticmethod
+    @cached('child_tutor')
     def get_tutor_by_child_id(child_id):
         try:
             with get_db_connection() as conn:
@@ -224,6 +273,7 @@ class ChildModel:
             return None
 
     @staticmethod
+    @cached('child_caregivers')
     def get_caregivers_by_child_id(child_id):
         try:
             with get_db_connection() as conn:
@@ -289,11 +339,21 @@ class ChildModel:
                 with conn.cursor() as cursor:
                     cursor.execute(query, (*values, child_id))
                 conn.commit()
+            ChildModel.invalidate_cache(child_id)
             return ChildModel.get_details_by_id(child_id)
         except Exception as e:
             print(f"Error en update_child: {e}")
             return None
 
+    @staticmethod
+    def invalidate_cache(child_id=None):
+        """Descarta de la caché el niño indicado (o todos) con su tutor y cuidadores."""
+        for name in ('child', 'child_tutor', 'child_caregivers'):
+            if child_id is None:
+                entity_cache(name).clear()
+            else:
+                entity_cache(name).invalidate(child_id)
+
     # --- MÉTODOS PARA NOTAS Y HORARIOS ---
     @staticmethod
     def get_notes(child_id):
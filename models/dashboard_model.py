@@ -0,0 +1,51 @@
+from db import get_db_connection
+from models.child_model import (
+    GET_CAREGIVERS_BY_CHILD, GET_CHILD_DETAILS, GET_NOTES_BY_CHILD, GET_SCHEDULES_BY_CHILD, GET_TUTOR_BY_CHILD
+)
+from models.reading_model import ReadingModel, anomaly_detector, latest_store
+from services.entity_cache import entity_cache
+
+
+class DashboardModel:
+    @staticmethod
+    def get_child_dashboard(child_id):
+        """
+        Todo lo que muestra el perfil de un niño en una sola respuesta: datos del niño,
+        tutor, cuidadores, notas, horario y últimas lecturas de su smartwatch.
+
+        Usa una sola conexión del pool para todas las consultas. mysql-connector no
+        ejecuta sentencias en paralelo sobre la misma conexión, así que van una tras
+        otra; lo que ya está en caché (niño, tutor, cuidadores y últimas lecturas, las
+        mismas cachés de los endpoints individuales) no se consulta.
+        Retorna None si el niño no existe.
+        """
+        with get_db_connection() as conn:
+            with conn.cursor(dictionary=True) as cursor:
+                def fetch_one(query):
+                    cursor.execute(query, (child_id,))
+                    return cursor.fetchone()
+
+                def fetch_all(query):
+                    cursor.execute(query, (child_id,))
+                    return cursor.fetchall()
+
+                child = entity_cache('child').get_or_load(child_id, lambda: fetch_one(GET_CHILD_DETAILS))
+                if not child:
+                    return None
+                dashboard = {
+                    "child": child,
+                    "tutor": entity_cache('child_tutor').get_or_load(child_id, lambda: fetch_one(GET_TUTOR_BY_CHILD)),
+                    "caregivers": entity_cache('child_caregivers').get_or_load(
+                        child_id, lambda: fetch_all(GET_CAREGIVERS_BY_CHILD)),
+                    "notes": fetch_all(GET_NOTES_BY_CHILD),
+                    "schedule": fetch_all(GET_SCHEDULES_BY_CHILD),
+                    "latest_readings": None,
+                }
+
+                smartwatch_id = child.get('id_smartwatch')
+                if smartwatch_id:
+                    readings = latest_store.get(smartwatch_id)
+                    if readings is None:
+                        readings = ReadingModel.load_last_readings(cursor, smartwatch_id)
+                    dashboard["latest_readings"] = dict(readings, trend=anomaly_detector.trend(smartwatch_id))
+        return dashboard
@@ -1,14 +1,26 @@
 from db import get_db_connection
+from services.entity_cache import cached, entity_cache
+from services.list_query import ListSpec
+
+# Listado (GET /api/daycares/) ordenado por id: 'name' admite NULL y no sirve de cursor
+DAYCARES_LIST = ListSpec(
+    columns={name: name for name in ('id_daycare', 'name', 'address', 'phone')},
+    source="daycares",
+    order=['id_daycare'],
+    filters={'name': ('name', str)},
+    select_all="*",
+)
+
 
 class DaycareModel:
 
     @staticmethod
-    def get_all():
+    def get_all(query=None):
         conn = None
         try:
             conn = get_db_connection()
             cursor = conn.cursor(dictionary=True)
-            cursor.execute("SELECT * FROM daycares ORDER BY name")
+            cursor.execute(*DAYCARES_LIST.select(query))
             return cursor.fetchall()
         finally:
             if conn and conn.is_connected():
@@ -16,6 +28,7 @@ class DaycareModel:
                 conn.close()
 
     @staticmethod
+    @cached('daycare')
     def get_by_id(id_daycare):
         conn = None
         try:
@@ -55,6 +68,8 @@ class DaycareModel:
             query = "UPDATE daycares SET name = %s, address = %s, phone = %s WHERE id_daycare = %s"
             cursor.execute(query, (data['name'], data.get('address'), data.get('phone'), id_daycare))
             conn.commit()
+            entity_cache('daycare').invalidate(id_daycare)
+            entity_cache('child_caregivers').clear()    # incluye el teléfono de la guardería
             return cursor.rowcount > 0
         except Exception as e:
             if conn: conn.rollback()
@@ -72,6 +87,8 @@ class DaycareModel:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM daycares WHERE id_daycare = %s", (id_daycare,))
             conn.commit()
+            entity_cache('daycare').invalidate(id_daycare)
+            entity_cache('child_caregivers').clear()    # incluye el teléfono de la guardería
             return cursor.rowcount > 0
         except Exception as e:
             if conn: conn.rollback()
@@ -1,18 +1,354 @@
+import os
+import time
+from datetime import datetime
+
 from db import get_db_connection
+from models.alert_model import AlertModel
+from models.child_model import ChildModel
+from services.alert_engine import AlertEngine
+from services.anomaly_detector import AnomalyDetector
+from services.ingestion_queue import IngestionQueue
+from services.latest_cache import create_latest_store
+from services.risk_engine import get_risk_engine, shadow_compare
+from services.stream_hub import StreamHub
 
 # --- Consultas SQL para Lecturas ---
-INSERT_TEMPERATURE = "INSERT INTO temperature_readings (id_smartwatch, temperature) VALUES (%s, %s);"
-INSERT_HEART_RATE = "INSERT INTO heart_rate_readings (id_smartwatch, beats_per_minute) VALUES (%s, %s);"
-INSERT_OXYGENATION = "INSERT INTO oxygenation_readings (id_smartwatch, spo2_level) VALUES (%s, %s);"
-INSERT_ACCELEROMETER = "INSERT INTO accelerometer_readings (id_smartwatch, axis_x, axis_y, axis_z, is_fall) VALUES (%s, %s, %s, %s, %s);"
+# executemany agrupa las filas en un solo INSERT multi-VALUES por tabla.
+# Las muestras sin 'timestamp' reciben la hora del servidor de BD (SELECT NOW()) antes de insertarse.
+GET_DB_NOW = "SELECT NOW();"
+INSERT_TEMPERATURE = "INSERT INTO temperature_readings (id_smartwatch, temperature, timestamp) VALUES (%s, %s, %s);"
+INSERT_HEART_RATE = "INSERT INTO heart_rate_readings (id_smartwatch, beats_per_minute, timestamp) VALUES (%s, %s, %s);"
+INSERT_OXYGENATION = "INSERT INTO oxygenation_readings (id_smartwatch, spo2_level, timestamp) VALUES (%s, %s, %s);"
+INSERT_ACCELEROMETER = "INSERT INTO accelerometer_readings (id_smartwatch, axis_x, axis_y, axis_z, is_fall, timestamp) VALUES (%s, %s, %s, %s, %s, %s);"
+
+# --- Resúmenes por minuto/hora/día (migrations/001_vitals_rollups.sql) ---
+UPSERT_ROLLUP = """
+    INSERT INTO vitals_rollups (id_smartwatch, sensor, granularity, bucket_start, min_value, max_value, sum_value, sample_count)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        min_value = LEAST(min_value, VALUES(min_value)),
+        max_value = GREATEST(max_value, VALUES(max_value)),
+        sum_value = sum_value + VALUES(sum_value),
+        sample_count = sample_count + VALUES(sample_count);
+"""
+# --- Riesgo calculado en la ingesta (migrations/002_reading_risk_scores.sql) ---
+INSERT_RISK_SCORE = """
+    INSERT INTO reading_risk_scores (id_smartwatch, timestamp, beats_per_minute, temperature, spo2_level, risk_probability, is_critical)
+    VALUES (%s, %s, %s, %s, %s, %s, %s);
+"""
+GET_RISK_SCORES = """
+    SELECT id_score, timestamp, beats_per_minute, temperature, spo2_level, risk_probability, is_critical
+    FROM reading_risk_scores
+    WHERE id_smartwatch = %s AND timestamp >= %s AND timestamp < %s
+    ORDER BY timestamp DESC
+    LIMIT %s;
+"""
+GET_CRITICAL_RISK_SCORES = """
+    SELECT id_score, timestamp, beats_per_minute, temperature, spo2_level, risk_probability, is_critical
+    FROM reading_risk_scores
+    WHERE is_critical = 1 AND id_smartwatch = %s AND timestamp >= %s AND timestamp < %s
+    ORDER BY timestamp DESC
+    LIMIT %s;
+"""
+
+DELETE_ROLLUPS_RANGE = "DELETE FROM vitals_rollups WHERE bucket_start >= %s AND bucket_start < %s;"
+# {bucket} es una expresión de BUCKET_SQL; {table} y {column} vienen de ROLLUP_SOURCES
+REBUILD_ROLLUPS = """
+    INSERT INTO vitals_rollups (id_smartwatch, sensor, granularity, bucket_start, min_value, max_value, sum_value, sample_count)
+    SELECT id_smartwatch, %s, %s, {bucket}, MIN({column}), MAX({column}), SUM({column}), COUNT(*)
+    FROM {table}
+    WHERE timestamp >= %s AND timestamp < %s
+    GROUP BY id_smartwatch, {bucket};
+"""
+BUCKET_SQL = {
+    'minute': "DATE_FORMAT(timestamp, '%Y-%m-%d %H:%i:00')",
+    'hour': "DATE_FORMAT(timestamp, '%Y-%m-%d %H:00:00')",
+    'day': "DATE(timestamp)",
+}
+BUCKET_SECONDS = {'minute': 60, 'hour': 3600, 'day': 86400}
+# sensor del rollup -> (campo de la muestra, tabla cruda, columna de valor)
+ROLLUP_SOURCES = {
+    'temperature': ('temperature', 'temperature_readings', 'temperature'),
+    'heart_rate': ('heart_rate', 'heart_rate_readings', 'beats_per_minute'),
+    'spo2': ('spo2', 'oxygenation_readings', 'spo2_level'),
+}
+
+# Máximo de muestras aceptadas en una sola petición de ingesta por lotes
+MAX_BATCH_SIZE = int(os.getenv('READINGS_MAX_BATCH', '5000'))
+BATCH_DB_ERROR = "Error de base de datos al guardar el lote"
+
+# Ingesta asíncrona: la petición responde 202 y un hilo escribe en grupo (group commit)
+ASYNC_INGEST = os.getenv('READINGS_ASYNC_INGEST', 'true').lower() in ('1', 'true', 'yes')
 
 GET_LAST_TEMPERATURE = "SELECT temperature, timestamp FROM temperature_readings WHERE id_smartwatch = %s ORDER BY timestamp DESC LIMIT 1;"
 GET_LAST_HEART_RATE = "SELECT beats_per_minute, timestamp FROM heart_rate_readings WHERE id_smartwatch = %s ORDER BY timestamp DESC LIMIT 1;"
 GET_LAST_OXYGENATION = "SELECT spo2_level, timestamp FROM oxygenation_readings WHERE id_smartwatch = %s ORDER BY timestamp DESC LIMIT 1;"
 
+# Última lectura de muchos smartwatches en una sola consulta por tabla (máximo por grupo).
+# La subconsulta se resuelve con el índice (id_smartwatch, timestamp).
+GET_LATEST_MANY = """
+    SELECT r.id_smartwatch, {columns}, r.timestamp
+    FROM {table} r
+    JOIN (
+        SELECT id_smartwatch, MAX(timestamp) AS timestamp
+        FROM {table}
+        WHERE id_smartwatch IN ({placeholders})
+        GROUP BY id_smartwatch
+    ) latest ON r.id_smartwatch = latest.id_smartwatch AND r.timestamp = latest.timestamp;
+"""
+# llave en get_all_last_readings -> (tabla, columnas)
+LATEST_SOURCES = {
+    'temperature': ('temperature_readings', 'r.temperature'),
+    'heart_rate': ('heart_rate_readings', 'r.beats_per_minute'),
+    'oxygenation': ('oxygenation_readings', 'r.spo2_level'),
+}
+LATEST_FALL_SOURCE = ('accelerometer_readings', 'r.is_fall')
+
 GET_LAST_10_HEART_RATE = "SELECT beats_per_minute, timestamp FROM heart_rate_readings WHERE id_smartwatch = %s ORDER BY timestamp DESC LIMIT 10;"
 GET_LAST_10_OXYGENATION = "SELECT spo2_level, timestamp FROM oxygenation_readings WHERE id_smartwatch = %s ORDER BY timestamp DESC LIMIT 10;"
 
+# --- Historial por rango de tiempo ---
+# Nombre del sensor en la URL -> tabla, columnas devueltas, agregados para downsampling
+# y sensor equivalente en vitals_rollups (None si no tiene resumen).
+HISTORY_SENSORS = {
+    'temperature': {
+        'table': 'temperature_readings',
+        'columns': 'temperature',
+        'aggregates': 'AVG(temperature) AS avg, MIN(temperature) AS min, MAX(temperature) AS max',
+        'rollup': 'temperature',
+    },
+    'heart_rate': {
+        'table': 'heart_rate_readings',
+        'columns': 'beats_per_minute',
+        'aggregates': 'AVG(beats_per_minute) AS avg, MIN(beats_per_minute) AS min, MAX(beats_per_minute) AS max',
+        'rollup': 'heart_rate',
+    },
+    'oxygen': {
+        'table': 'oxygenation_readings',
+        'columns': 'spo2_level',
+        'aggregates': 'AVG(spo2_level) AS avg, MIN(spo2_level) AS min, MAX(spo2_level) AS max',
+        'rollup': 'spo2',
+    },
+    'accelerometer': {
+        'table': 'accelerometer_readings',
+        'columns': 'axis_x, axis_y, axis_z, is_fall',
+        'aggregates': 'AVG(axis_x) AS avg_x, AVG(axis_y) AS avg_y, AVG(axis_z) AS avg_z, MAX(is_fall) AS any_fall',
+        'rollup': None,
+    },
+}
+# Llave primaria de las tablas de lecturas (desempate del cursor keyset): no está fija en
+# el código, se lee del esquema una vez por tabla (ver reading_id_column)
+GET_PRIMARY_KEY_COLUMNS = """
+    SELECT column_name AS column_name FROM information_schema.key_column_usage
+    WHERE table_schema = DATABASE() AND table_name = %s AND constraint_name = 'PRIMARY'
+    ORDER BY ordinal_position;
+"""
+_reading_id_columns = {}
+
+
+def reading_id_column(cursor, table):
+    """
+    Columna de la llave primaria de una tabla de lecturas. Después de la migración 005
+    la llave es (id, timestamp), así que se toma la primera columna que no es 'timestamp'.
+    """
+    column = _reading_id_columns.get(table)
+    if column is None:
+        cursor.execute(GET_PRIMARY_KEY_COLUMNS, (table,))
+        names = [row['column_name'] if isinstance(row, dict) else row[0] for row in cursor.fetchall()]
+        names = [name for name in names if name != 'timestamp']
+        if not names:
+            raise RuntimeError(f"La tabla {table} no tiene llave primaria para el cursor del historial")
+        column = _reading_id_columns[table] = names[0]
+    return column
+
+# Página keyset: filas posteriores a (timestamp, id) del cursor, sin OFFSET
+GET_HISTORY_PAGE = """
+    SELECT {id_column} AS id, {columns}, timestamp
+    FROM {table}
+    WHERE id_smartwatch = %s AND timestamp >= %s AND timestamp < %s
+      AND (timestamp > %s OR (timestamp = %s AND {id_column} > %s))
+    ORDER BY timestamp, {id_column}
+    LIMIT %s;
+"""
+GET_HISTORY_RANGE = """
+    SELECT {id_column} AS id, {columns}, timestamp
+    FROM {table}
+    WHERE id_smartwatch = %s AND timestamp >= %s AND timestamp < %s
+    ORDER BY timestamp, {id_column};
+"""
+# Exportación masiva: todas las tablas con las mismas columnas (formato largo)
+EXPORT_COLUMNS = ('id_smartwatch', 'sensor', 'timestamp', 'value', 'axis_x', 'axis_y', 'axis_z', 'is_fall')
+EXPORT_TYPES = {'id_smartwatch': 'int64', 'sensor': 'string', 'timestamp': 'timestamp', 'value': 'float64',
+                'axis_x': 'float64', 'axis_y': 'float64', 'axis_z': 'float64', 'is_fall': 'int8'}
+EXPORT_SELECT = {
+    'temperature': "temperature, NULL, NULL, NULL, NULL",
+    'heart_rate': "beats_per_minute, NULL, NULL, NULL, NULL",
+    'oxygen': "spo2_level, NULL, NULL, NULL, NULL",
+    'accelerometer': "NULL, axis_x, axis_y, axis_z, is_fall",
+}
+GET_EXPORT_RANGE = """
+    SELECT id_smartwatch, %s, timestamp, {select}
+    FROM {table}
+    WHERE id_smartwatch = %s AND timestamp >= %s AND timestamp < %s
+    ORDER BY timestamp;
+"""
+# Downsampling en el servidor con buckets de N segundos
+GET_HISTORY_BUCKETS = """
+    SELECT FROM_UNIXTIME(FLOOR(UNIX_TIMESTAMP(timestamp) / %s) * %s) AS bucket_start, {aggregates}, COUNT(*) AS count
+    FROM {table}
+    WHERE id_smartwatch = %s AND timestamp >= %s AND timestamp < %s
+    GROUP BY bucket_start
+    ORDER BY bucket_start
+    LIMIT %s;
+"""
+# Buckets de minuto/hora/día servidos desde vitals_rollups
+GET_HISTORY_ROLLUPS = """
+    SELECT bucket_start, sum_value / sample_count AS avg, min_value AS min, max_value AS max, sample_count AS count
+    FROM vitals_rollups
+    WHERE id_smartwatch = %s AND sensor = %s AND granularity = %s AND bucket_start >= %s AND bucket_start < %s
+    ORDER BY bucket_start
+    LIMIT %s;
+"""
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def parse_timestamp(value):
+    """
+    Convierte el 'timestamp' de una muestra a datetime (sin zona horaria).
+    Acepta ISO 8601 ("2025-11-26T23:21:06", con o sin 'Z'/offset) o segundos epoch.
+    Devuelve None si no viene, y lanza ValueError si el formato es inválido.
+    """
+    if value is None or isinstance(value, datetime):
+        return value
+    if _is_number(value):
+        return datetime.fromtimestamp(value)
+    if isinstance(value, str):
+        dt = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+        if dt.tzinfo is not None:
+            # Se guarda en la hora local del servidor, igual que CURRENT_TIMESTAMP
+            dt = dt.astimezone().replace(tzinfo=None)
+        return dt
+    raise ValueError("timestamp debe ser ISO 8601 o segundos epoch")
+
+
+def normalize_sample(sample, default_smartwatch_id=None):
+    """
+    Valida una muestra de sensores y la devuelve normalizada.
+    Retorna (muestra, None) si es válida o (None, mensaje_de_error) si se rechaza.
+    """
+    if not isinstance(sample, dict):
+        return None, "La muestra debe ser un objeto JSON"
+
+    smartwatch_id = sample.get('id_smartwatch', default_smartwatch_id)
+    if isinstance(smartwatch_id, str) and smartwatch_id.isdigit():
+        smartwatch_id = int(smartwatch_id)
+    if not isinstance(smartwatch_id, int) or isinstance(smartwatch_id, bool) or smartwatch_id <= 0:
+        return None, "El campo 'id_smartwatch' es requerido y debe ser un entero positivo"
+
+    try:
+        timestamp = parse_timestamp(sample.get('timestamp'))
+    except (ValueError, TypeError, OverflowError, OSError):
+        return None, "Formato de 'timestamp' inválido"
+
+    normalized = {'id_smartwatch': smartwatch_id, 'timestamp': timestamp}
+    for field in ('temperature', 'heart_rate', 'spo2'):
+        if field in sample:
+            if not _is_number(sample[field]):
+                return None, f"El campo '{field}' debe ser numérico"
+            normalized[field] = sample[field]
+
+    if 'accelerometer' in sample:
+        accel = sample['accelerometer']
+        if not isinstance(accel, dict) or not all(_is_number(accel.get(axis)) for axis in ('x', 'y', 'z')):
+            return None, "El campo 'accelerometer' requiere 'x', 'y' y 'z' numéricos"
+        normalized['accelerometer'] = {
+            'x': accel['x'], 'y': accel['y'], 'z': accel['z'],
+            'is_fall': bool(accel.get('is_fall', False))
+        }
+
+    if len(normalized) == 2:
+        return None, "La muestra no contiene lecturas de sensores"
+    return normalized, None
+
+
+def bucket_start(ts, granularity):
+    """Inicio del bucket de minuto/hora/día al que pertenece 'ts'."""
+    if granularity == 'minute':
+        return ts.replace(second=0, microsecond=0)
+    if granularity == 'hour':
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def build_rollup_rows(samples):
+    """
+    Agrega las muestras del lote por (smartwatch, sensor, granularidad, bucket) para
+    hacer un solo UPSERT por bucket en lugar de uno por lectura.
+    """
+    buckets = {}
+    for sample in samples:
+        for sensor, (field, _, _) in ROLLUP_SOURCES.items():
+            if field not in sample:
+                continue
+            value = float(sample[field])
+            for granularity in BUCKET_SQL:
+                key = (sample['id_smartwatch'], sensor, granularity, bucket_start(sample['timestamp'], granularity))
+                agg = buckets.get(key)
+                if agg is None:
+                    buckets[key] = [value, value, value, 1]
+                else:
+                    agg[0] = min(agg[0], value)
+                    agg[1] = max(agg[1], value)
+                    agg[2] += value
+                    agg[3] += 1
+    return [(*key, *agg) for key, agg in buckets.items()]
+
+
+def score_samples(samples):
+    """
+    Calcula el riesgo de las muestras que traen ritmo cardíaco, temperatura y SpO2
+    juntos, en una sola pasada del modelo, y lo adjunta como sample['risk'].
+    'risk_probability' va en porcentaje, igual que en /api/analyze-reading.
+    """
+    engine = get_risk_engine()
+    if engine is None:
+        return
+    complete = [sample for sample in samples
+                if 'heart_rate' in sample and 'temperature' in sample and 'spo2' in sample]
+    if not complete:
+        return
+    rows = [[sample['heart_rate'], sample['temperature'], sample['spo2']] for sample in complete]
+    labels, probabilities = engine.score(rows)
+    shadow_compare(rows, probabilities)
+    for sample, is_critical, probability in zip(complete, labels, probabilities):
+        sample['risk'] = {'risk_probability': round(float(probability) * 100, 2), 'is_critical': bool(is_critical),
+                          'model_version': engine.version}
+
+
+# Segundos que se recuerda a qué niño/guardería pertenece cada smartwatch (alertas y streams)
+STREAM_TARGETS_TTL = int(os.getenv('STREAM_TARGETS_TTL', '60'))
+_stream_targets = {}
+
+
+def resolve_stream_targets(smartwatch_ids):
+    """
+    Retorna {id_smartwatch: [(id_child, id_daycare), ...]}. Solo consulta la BD por los
+    smartwatches que no están en memoria o cuya entrada expiró.
+    """
+    now = time.monotonic()
+    missing = [sid for sid in smartwatch_ids
+               if sid not in _stream_targets or _stream_targets[sid][0] < now]
+    if missing:
+        found = {sid: [] for sid in missing}
+        for row in ChildModel.get_by_smartwatch_ids(missing):
+            found.setdefault(row['id_smartwatch'], []).append((row['id_child'], row['id_daycare']))
+        for sid, targets in found.items():
+            _stream_targets[sid] = (now + STREAM_TARGETS_TTL, targets)
+    return {sid: _stream_targets[sid][1] for sid in smartwatch_ids}
+
 
 class ReadingModel:
     @staticmethod
@@ -28,53 +364,265 @@ class ReadingModel:
             "accelerometer": {"x": 0.05, "y": -0.96, "z": 0.03, "is_fall": False}
         }
         """
-        try:
-            with get_db_connection() as conn:
+        results, saved = ReadingModel.save_readings_batch([data])
+        if results[0]['status'] != 'accepted':
+            print(f"Error al guardar lecturas: {results[0]['error']}")
+        return saved > 0
+
+    @staticmethod
+    def validate_samples(samples, default_smartwatch_id=None):
+        """
+        Valida un lote de muestras. Retorna (resultados, aceptadas) donde 'resultados'
+        indica por índice si la muestra fue aceptada o rechazada y el motivo.
+        """
+        results = []
+        accepted = []
+        for index, sample in enumerate(samples):
+            normalized, error = normalize_sample(sample, default_smartwatch_id)
+            if error:
+                results.append({"index": index, "status": "rejected", "error": error})
+            else:
+                results.append({"index": index, "status": "accepted"})
+                accepted.append(normalized)
+        return results, accepted
+
+    @staticmethod
+    def write_samples(samples):
+        """
+        Escribe muestras ya normalizadas en una sola transacción.
+        Cada tabla de sensores se escribe con un único executemany (INSERT multi-VALUES)
+        y en la misma transacción se actualizan los resúmenes por minuto/hora/día y se
+        guarda el riesgo de las muestras completas.
+        Retorna las muestras escritas (con 'timestamp' resuelto y 'risk' si aplica).
+        Lanza la excepción de la BD si la transacción falla.
+        """
+        # El modelo se evalúa antes de tomar la conexión para no retenerla durante la inferencia
+        score_samples(samples)
+
+        with get_db_connection() as conn:
+            try:
                 with conn.cursor() as cursor:
-                    smartwatch_id = data['id_smartwatch']
+                    if any(sample['timestamp'] is None for sample in samples):
+                        cursor.execute(GET_DB_NOW)
+                        db_now = cursor.fetchone()[0]
+                        samples = [dict(sample, timestamp=db_now) if sample['timestamp'] is None else sample
+                                   for sample in samples]
+
+                    temperature_rows, heart_rate_rows, oxygenation_rows, accelerometer_rows = [], [], [], []
+                    for sample in samples:
+                        smartwatch_id, ts = sample['id_smartwatch'], sample['timestamp']
+                        if 'temperature' in sample:
+                            temperature_rows.append((smartwatch_id, sample['temperature'], ts))
+                        if 'heart_rate' in sample:
+                            heart_rate_rows.append((smartwatch_id, sample['heart_rate'], ts))
+                        if 'spo2' in sample:
+                            oxygenation_rows.append((smartwatch_id, sample['spo2'], ts))
+                        if 'accelerometer' in sample:
+                            accel = sample['accelerometer']
+                            accelerometer_rows.append((smartwatch_id, accel['x'], accel['y'], accel['z'], accel['is_fall'], ts))
+
+                    if temperature_rows:
+                        cursor.executemany(INSERT_TEMPERATURE, temperature_rows)
+                    if heart_rate_rows:
+                        cursor.executemany(INSERT_HEART_RATE, heart_rate_rows)
+                    if oxygenation_rows:
+                        cursor.executemany(INSERT_OXYGENATION, oxygenation_rows)
+                    if accelerometer_rows:
+                        cursor.executemany(INSERT_ACCELEROMETER, accelerometer_rows)
+
+                    rollup_rows = build_rollup_rows(samples)
+                    if rollup_rows:
+                        cursor.executemany(UPSERT_ROLLUP, rollup_rows)
+
+                    risk_rows = [(sample['id_smartwatch'], sample['timestamp'], sample['heart_rate'],
+                                  sample['temperature'], sample['spo2'],
+                                  sample['risk']['risk_probability'], sample['risk']['is_critical'])
+                                 for sample in samples if 'risk' in sample]
+                    if risk_rows:
+                        cursor.executemany(INSERT_RISK_SCORE, risk_rows)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        ReadingModel._update_latest(samples)
+        try:
+            ReadingModel._notify(samples)
+        except Exception as e:
+            # Las lecturas ya están guardadas; un fallo aquí solo afecta a alertas y streams
+            print(f"Error al evaluar/publicar lecturas: {e}")
+        return samples
+
+    @staticmethod
+    def _update_latest(samples):
+        """Refleja en la caché de últimas lecturas las muestras recién guardadas."""
+        updates = {}
+        for sample in samples:
+            ts = sample['timestamp']
+            sensors = updates.setdefault(sample['id_smartwatch'], {})
+            for field, sensor, column in (('temperature', 'temperature', 'temperature'),
+                                          ('heart_rate', 'heart_rate', 'beats_per_minute'),
+                                          ('spo2', 'oxygenation', 'spo2_level')):
+                if field in sample:
+                    current = sensors.get(sensor)
+                    if current is None or current['timestamp'] <= ts:
+                        sensors[sensor] = {column: sample[field], 'timestamp': ts}
+        for smartwatch_id, sensors in updates.items():
+            if sensors:
+                latest_store.merge(smartwatch_id, sensors)
 
-                    if 'temperature' in data:
-                        cursor.execute(INSERT_TEMPERATURE, (smartwatch_id, data['temperature']))
+    @staticmethod
+    def _notify(samples):
+        """
+        Actualiza el detector de tendencias, evalúa las alertas de las muestras guardadas,
+        persiste las nuevas y publica lecturas y alertas en los streams del niño y de su guardería.
+        """
+        ordered = sorted(samples, key=lambda sample: sample['timestamp'])
+        anomaly_detector.update(ordered)
 
-                    if 'heart_rate' in data:
-                        cursor.execute(INSERT_HEART_RATE, (smartwatch_id, data['heart_rate']))
+        targets = resolve_stream_targets({sample['id_smartwatch'] for sample in samples})
+        alerts = alert_engine.evaluate(ordered, targets)
+        if alerts:
+            try:
+                AlertModel.create_many(alerts)
+            except Exception as e:
+                print(f"Error al guardar {len(alerts)} alertas: {e}")
 
-                    if 'spo2' in data:
-                        cursor.execute(INSERT_OXYGENATION, (smartwatch_id, data['spo2']))
+        if not live_hub.has_subscribers():
+            return
+        for sample in samples:
+            for child_id, daycare_id in targets.get(sample['id_smartwatch'], ()):
+                event = {'id_child': child_id, 'id_daycare': daycare_id}
+                event.update(sample)
+                live_hub.publish(('child', child_id), ('reading', event))
+                live_hub.publish(('daycare', daycare_id), ('reading', event))
+        for alert in alerts:
+            live_hub.publish(('child', alert['id_child']), ('alert', alert))
+            live_hub.publish(('daycare', alert['id_daycare']), ('alert', alert))
 
-                    if 'accelerometer' in data:
-                        accel = data['accelerometer']
-                        cursor.execute(INSERT_ACCELEROMETER,
-                                       (smartwatch_id, accel['x'], accel['y'], accel['z'], accel.get('is_fall', False)))
+    @staticmethod
+    def save_readings_batch(samples, default_smartwatch_id=None):
+        """
+        Guarda un lote de muestras (de uno o varios smartwatches) en una sola transacción.
+        Retorna (resultados, guardadas).
+        """
+        results, accepted = ReadingModel.validate_samples(samples, default_smartwatch_id)
+        if not accepted:
+            return results, 0
 
-                    conn.commit()
-                    return True
+        try:
+            written = ReadingModel.write_samples(accepted)
         except Exception as e:
-            print(f"Error al guardar lecturas: {e}")
-            return False
+            print(f"Error al guardar lote de lecturas: {e}")
+            for result in results:
+                if result['status'] == 'accepted':
+                    result['status'] = 'rejected'
+                    result['error'] = BATCH_DB_ERROR
+            return results, 0
+
+        # Las aceptadas aparecen en 'results' en el mismo orden que en 'written'
+        accepted_results = (result for result in results if result['status'] == 'accepted')
+        for result, sample in zip(accepted_results, written):
+            if 'risk' in sample:
+                result['risk'] = sample['risk']
+        return results, len(accepted)
+
+    @staticmethod
+    def enqueue_readings(samples, default_smartwatch_id=None):
+        """
+        Valida el lote y encola las muestras aceptadas en la cola de escritura diferida.
+        Retorna (resultados, encoladas); 'encoladas' es None si la cola está llena.
+        """
+        results, accepted = ReadingModel.validate_samples(samples, default_smartwatch_id)
+        if not accepted:
+            return results, 0
+        if not ingestion_queue.submit(accepted):
+            return results, None
+        for result in results:
+            if result['status'] == 'accepted':
+                result['status'] = 'queued'
+        return results, len(accepted)
 
     @staticmethod
     def get_all_last_readings(smartwatch_id):
         """
         Obtiene la última lectura de cada sensor para un smartwatch.
+        Se sirve desde la caché de últimas lecturas; si no está, se consulta la BD
+        y se guarda en la caché (la ingesta la mantiene actualizada después).
         """
-        last_readings = {}
+        cached = latest_store.get(smartwatch_id)
+        if cached is not None:
+            return cached
+
         try:
             with get_db_connection() as conn:
                 with conn.cursor(dictionary=True) as cursor:
-                    cursor.execute(GET_LAST_TEMPERATURE, (smartwatch_id,))
-                    last_readings['temperature'] = cursor.fetchone()
-
-                    cursor.execute(GET_LAST_HEART_RATE, (smartwatch_id,))
-                    last_readings['heart_rate'] = cursor.fetchone()
-
-                    cursor.execute(GET_LAST_OXYGENATION, (smartwatch_id,))
-                    last_readings['oxygenation'] = cursor.fetchone()
-            return last_readings
+                    return ReadingModel.load_last_readings(cursor, smartwatch_id)
         except Exception as e:
             print(f"Error al obtener últimas lecturas: {e}")
             return None
 
+    @staticmethod
+    def load_last_readings(cursor, smartwatch_id):
+        """Lee de la BD, con el cursor recibido, la última lectura de cada sensor y la guarda en la caché."""
+        last_readings = {}
+        cursor.execute(GET_LAST_TEMPERATURE, (smartwatch_id,))
+        last_readings['temperature'] = cursor.fetchone()
+
+        cursor.execute(GET_LAST_HEART_RATE, (smartwatch_id,))
+        last_readings['heart_rate'] = cursor.fetchone()
+
+        cursor.execute(GET_LAST_OXYGENATION, (smartwatch_id,))
+        last_readings['oxygenation'] = cursor.fetchone()
+        latest_store.set(smartwatch_id, last_readings)
+        return last_readings
+
+    @staticmethod
+    def get_latest_for_smartwatches(smartwatch_ids):
+        """
+        Últimas lecturas de varios smartwatches: {id_smartwatch: {temperature, heart_rate,
+        oxygenation, fall}}. Las tres primeras tienen la forma de get_all_last_readings y
+        salen de la caché cuando están; los que faltan se leen con una consulta por tabla
+        para todo el conjunto. 'fall' es la última lectura del acelerómetro.
+        El número de consultas no depende de cuántos smartwatches se pidan.
+        """
+        ids = list(dict.fromkeys(smartwatch_ids))
+        result = {}
+        missing = []
+        for smartwatch_id in ids:
+            cached = latest_store.get(smartwatch_id)
+            if cached is None:
+                missing.append(smartwatch_id)
+                result[smartwatch_id] = {sensor: None for sensor in LATEST_SOURCES}
+            else:
+                result[smartwatch_id] = cached
+        if not ids:
+            return result
+
+        def fetch_latest(cursor, table, columns, smartwatch_list):
+            query = GET_LATEST_MANY.format(table=table, columns=columns,
+                                           placeholders=", ".join(["%s"] * len(smartwatch_list)))
+            cursor.execute(query, tuple(smartwatch_list))
+            return cursor.fetchall()
+
+        with get_db_connection() as conn:
+            with conn.cursor(dictionary=True) as cursor:
+                for sensor, (table, columns) in LATEST_SOURCES.items():
+                    if not missing:
+                        break
+                    for row in fetch_latest(cursor, table, columns, missing):
+                        result[row.pop('id_smartwatch')][sensor] = row
+                for smartwatch_id in ids:
+                    result[smartwatch_id]['fall'] = None
+                for row in fetch_latest(cursor, *LATEST_FALL_SOURCE, ids):
+                    smartwatch_id = row.pop('id_smartwatch')
+                    row['is_fall'] = bool(row['is_fall'])
+                    result[smartwatch_id]['fall'] = row
+
+        for smartwatch_id in missing:
+            latest_store.set(smartwatch_id, {sensor: result[smartwatch_id][sensor] for sensor in LATEST_SOURCES})
+        return result
+
     @staticmethod
     def get_last_10_heart_rate(smartwatch_id):
         """Obtiene las últimas 10 lecturas de ritmo cardíaco."""
@@ -97,4 +645,145 @@ class ReadingModel:
                     return cursor.fetchall()
         except Exception as e:
             print(f"Error al obtener historial de oxigenación: {e}")
-            return []
\ No newline at end of file
+            return []
+
+
+    @staticmethod
+    def get_history(smartwatch_id, sensor, date_from, date_to, limit, after_ts=None, after_id=0):
+        """
+        Página de lecturas crudas de un sensor en [date_from, date_to) ordenadas por
+        (timestamp, id). 'after_ts'/'after_id' es la última fila de la página anterior.
+        """
+        spec = HISTORY_SENSORS[sensor]
+        if after_ts is None:
+            after_ts, after_id = date_from, 0
+        try:
+            with get_db_connection() as conn:
+                with conn.cursor(dictionary=True) as cursor:
+                    query = GET_HISTORY_PAGE.format(table=spec['table'], columns=spec['columns'],
+                                                    id_column=reading_id_column(cursor, spec['table']))
+                    cursor.execute(query, (smartwatch_id, date_from, date_to, after_ts, after_ts, after_id, limit))
+                    return cursor.fetchall()
+        except Exception as e:
+            print(f"Error al obtener historial de {sensor}: {e}")
+            return None
+
+    @staticmethod
+    def iter_history(smartwatch_id, sensor, date_from, date_to, chunk_size=1000):
+        """
+        Generador de todas las lecturas del rango. Usa un cursor sin buffer y fetchmany,
+        así que la memoria no depende del tamaño del rango.
+        """
+        spec = HISTORY_SENSORS[sensor]
+        with get_db_connection() as conn:
+            with conn.cursor() as lookup:
+                id_column = reading_id_column(lookup, spec['table'])
+            query = GET_HISTORY_RANGE.format(table=spec['table'], columns=spec['columns'], id_column=id_column)
+            with conn.cursor(dictionary=True, buffered=False) as cursor:
+                cursor.execute(query, (smartwatch_id, date_from, date_to))
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield from rows
+
+    @staticmethod
+    def iter_export(smartwatch_id, sensors, date_from, date_to, chunk_size=5000):
+        """
+        Generador de bloques de filas (tuplas en el orden de EXPORT_COLUMNS) de los
+        sensores pedidos, uno después de otro. Cursor sin buffer: la memoria no depende
+        del rango.
+        """
+        with get_db_connection() as conn:
+            for sensor in sensors:
+                query = GET_EXPORT_RANGE.format(select=EXPORT_SELECT[sensor], table=HISTORY_SENSORS[sensor]['table'])
+                with conn.cursor(buffered=False) as cursor:
+                    cursor.execute(query, (sensor, smartwatch_id, date_from, date_to))
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        yield rows
+
+    @staticmethod
+    def get_history_buckets(smartwatch_id, sensor, date_from, date_to, bucket, limit):
+        """
+        Lecturas agregadas (avg/min/max/count) por bucket. 'bucket' es 'minute', 'hour'
+        o 'day' (servido desde vitals_rollups si el sensor lo tiene) o un número de segundos.
+        """
+        spec = HISTORY_SENSORS[sensor]
+        try:
+            with get_db_connection() as conn:
+                with conn.cursor(dictionary=True) as cursor:
+                    if isinstance(bucket, str) and spec['rollup']:
+                        cursor.execute(GET_HISTORY_ROLLUPS,
+                                       (smartwatch_id, spec['rollup'], bucket, date_from, date_to, limit))
+                    else:
+                        seconds = BUCKET_SECONDS.get(bucket, bucket)
+                        query = GET_HISTORY_BUCKETS.format(table=spec['table'], aggregates=spec['aggregates'])
+                        cursor.execute(query, (seconds, seconds, smartwatch_id, date_from, date_to, limit))
+                    return cursor.fetchall()
+        except Exception as e:
+            print(f"Error al obtener historial agregado de {sensor}: {e}")
+            return None
+
+    @staticmethod
+    def get_risk_scores(smartwatch_id, date_from, date_to, critical_only=False, limit=100):
+        """Riesgos guardados en la ingesta, del más reciente al más antiguo."""
+        query = GET_CRITICAL_RISK_SCORES if critical_only else GET_RISK_SCORES
+        try:
+            with get_db_connection() as conn:
+                with conn.cursor(dictionary=True) as cursor:
+                    cursor.execute(query, (smartwatch_id, date_from, date_to, limit))
+                    return cursor.fetchall()
+        except Exception as e:
+            print(f"Error al obtener riesgos: {e}")
+            return None
+
+    @staticmethod
+    def rebuild_rollups(date_from, date_to):
+        """
+        Recalcula los resúmenes de [date_from, date_to) desde las tablas crudas.
+        Sirve para poblar datos históricos anteriores a los resúmenes incrementales.
+        """
+        with get_db_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(DELETE_ROLLUPS_RANGE, (date_from, date_to))
+                    for sensor, (_, table, column) in ROLLUP_SOURCES.items():
+                        for granularity, bucket in BUCKET_SQL.items():
+                            query = REBUILD_ROLLUPS.format(bucket=bucket, table=table, column=column)
+                            cursor.execute(query, (sensor, granularity, date_from, date_to))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+
+# Caché de últimas lecturas por smartwatch (LRU en memoria por defecto)
+latest_store = create_latest_store()
+
+# Fan-out de lecturas en vivo hacia /api/stream/...
+live_hub = StreamHub(
+    max_buffer=int(os.getenv('STREAM_CLIENT_BUFFER', '100')),
+    max_subscribers=int(os.getenv('STREAM_MAX_SUBSCRIBERS', '500')),
+)
+
+# Tendencias de ritmo cardíaco y SpO2 por smartwatch (memoria fija, ver AnomalyDetector)
+anomaly_detector = AnomalyDetector(
+    max_devices=int(os.getenv('ANOMALY_MAX_DEVICES', '5000')),
+    window=int(os.getenv('ANOMALY_WINDOW', '60')),
+    ewma_alpha=float(os.getenv('ANOMALY_EWMA_ALPHA', '0.1')),
+)
+
+# Reglas de alertas por niño; el estado de ventanas y deduplicación vive en memoria
+alert_engine = AlertEngine(rules_loader=AlertModel.get_rules,
+                           rules_ttl=int(os.getenv('ALERT_RULES_TTL', '60')))
+
+# Cola de escritura diferida; el hilo escritor arranca con la primera muestra encolada
+ingestion_queue = IngestionQueue(
+    writer=ReadingModel.write_samples,
+    max_pending=int(os.getenv('INGEST_QUEUE_MAX', '20000')),
+    batch_size=int(os.getenv('INGEST_BATCH_SIZE', '500')),
+    flush_interval=int(os.getenv('INGEST_FLUSH_MS', '200')) / 1000.0,
+)
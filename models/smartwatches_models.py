@@ -1,7 +1,16 @@
 from db import get_db_connection
+from services.entity_cache import cached, entity_cache
+from services.list_query import ListSpec
 
         ### ----- ###     QUERYS     ### ----- ###
-QUERY_GET_ALL = "SELECT * FROM smartwatches ORDER BY id_smartwatch"
+# Listado (GET /api/smartwatches/): sin 'fields' devuelve todas las columnas, como antes
+SMARTWATCHES_LIST = ListSpec(
+    columns={name: name for name in ('id_smartwatch', 'device_id', 'model', 'status')},
+    source="smartwatches",
+    order=['id_smartwatch'],
+    filters={'status': ('status', str), 'model': ('model', str)},
+    select_all="*",
+)
 QUERY_GET_BY_ID = "SELECT * FROM smartwatches WHERE id_smartwatch = %s"
 # Corrección: Buscar el smartwatch a través de la tabla children
 QUERY_GET_BY_CHILD_ID = """
@@ -22,17 +31,18 @@ QUERY_UPDATE_STATUS_ONLY = "UPDATE smartwatches SET status = %s WHERE id_smartwa
 
 class SmartwatchModel:
     @staticmethod
-    def get_all():
+    def get_all(query=None):
         try:
             with get_db_connection() as conn:
                 with conn.cursor(dictionary=True) as cursor:
-                    cursor.execute(QUERY_GET_ALL)
+                    cursor.execute(*SMARTWATCHES_LIST.select(query))
                     return cursor.fetchall()
         except Exception as e:
             print(f"Error en get_all: {e}")
             return []
 
     @staticmethod
+    @cached('smartwatch')
     def get_by_id(smartwatch_id):
         try:
             with get_db_connection() as conn:
@@ -74,6 +84,7 @@ class SmartwatchModel:
                 with conn.cursor() as cursor:
                     cursor.execute(QUERY_DEACTIVATE, (smartwatch_id,))
                     conn.commit()
+                    entity_cache('smartwatch').invalidate(smartwatch_id)
                     return cursor.rowcount > 0
         except Exception as e:
             print(f"Error en deactivate: {e}")
@@ -106,6 +117,7 @@ class SmartwatchModel:
                 with conn.cursor() as cursor:
                     cursor.execute(QUERY_DELETE, (smartwatch_id,))
                     conn.commit()
+                    entity_cache('smartwatch').invalidate(smartwatch_id)
                     return cursor.rowcount > 0
         except Exception as e:
             print(f"Error en delete: {e}")
@@ -119,6 +131,8 @@ class SmartwatchModel:
                     cursor.execute(QUERY_UNLINK_FROM_CHILDREN, (smartwatch_id,))
                     cursor.execute(QUERY_DELETE, (smartwatch_id,))
                     conn.commit()
+                    entity_cache('smartwatch').invalidate(smartwatch_id)
+                    entity_cache('child').clear()    # cambió children.id_smartwatch
                     return cursor.rowcount > 0
         except Exception as e:
             print(f"Error en safe_delete: {e}")
@@ -137,6 +151,7 @@ class SmartwatchModel:
                         if model is None: model = current.get('model')
                     cursor.execute(QUERY_UPDATE, (status, model, smartwatch_id))
                     conn.commit()
+                    entity_cache('smartwatch').invalidate(smartwatch_id)
                     return cursor.rowcount > 0
         except Exception as e:
             print(f"Error en update: {e}")
@@ -160,6 +175,8 @@ class SmartwatchModel:
                     cursor.execute(QUERY_LINK_TO_CHILD, (smartwatch_id, child_id))
                     
                     conn.commit()
+                    entity_cache('smartwatch').invalidate(smartwatch_id)
+                    entity_cache('child').clear()    # cambió children.id_smartwatch
                     return True
         except Exception as e:
             print(f"Error en activate_and_assign: {e}")
@@ -178,6 +195,8 @@ class SmartwatchModel:
                     cursor.execute(QUERY_UPDATE_STATUS_ONLY, ('inactive', smartwatch_id))
                     
                     conn.commit()
+                    entity_cache('smartwatch').invalidate(smartwatch_id)
+                    entity_cache('child').clear()    # cambió children.id_smartwatch
                     return True
         except Exception as e:
             print(f"Error en deactivate_and_unassign: {e}")
@@ -1,18 +1,33 @@
 from db import get_db_connection
+from services.entity_cache import entity_cache
+from services.list_query import ListSpec
 from werkzeug.security import generate_password_hash, check_password_hash
 
+# Nunca incluye la contraseña
+USERS_LIST = ListSpec(
+    columns={name: name for name in
+             ('id_user', 'id_daycare', 'username', 'first_name', 'last_name', 'email', 'phone', 'role', 'created_at')},
+    source="users",
+    order=['id_user'],
+    filters={'id_daycare': ('id_daycare', int), 'role': ('role', str)},
+)
+
 
 class UserModel:
 
     @staticmethod
-    def get_all():
+    def _invalidate_child_contacts():
+        # Tutores y cuidadores se cachean por niño; no se sabe a qué niños afecta un usuario
+        entity_cache('child_tutor').clear()
+        entity_cache('child_caregivers').clear()
+
+    @staticmethod
+    def get_all(query=None):
         conn = None
         try:
             conn = get_db_connection()
             cursor = conn.cursor(dictionary=True)
-            # SE AGREGA 'phone'
-            query = "SELECT id_user, id_daycare, username, first_name, last_name, email, phone, role, created_at FROM users"
-            cursor.execute(query)
+            cursor.execute(*USERS_LIST.select(query))
             return cursor.fetchall()
         finally:
             if conn and conn.is_connected():
@@ -51,6 +66,7 @@ class UserModel:
                 data['first_name'], data['last_name'], data['email'], data.get('phone'), data['role']
             ))
             conn.commit()
+            UserModel._invalidate_child_contacts()
             return cursor.lastrowid
         except Exception as e:
             if conn: conn.rollback()
@@ -76,6 +92,7 @@ class UserModel:
                 data['last_name'], data['email'], data.get('phone'), data['role'], id_user
             ))
             conn.commit()
+            UserModel._invalidate_child_contacts()
             return cursor.rowcount > 0
         except Exception as e:
             if conn: conn.rollback()
@@ -93,6 +110,7 @@ class UserModel:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM users WHERE id_user = %s", (id_user,))
             conn.commit()
+            UserModel._invalidate_child_contacts()
             return cursor.rowcount > 0
         except Exception as e:
             if conn: conn.rollback()
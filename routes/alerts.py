@@ -0,0 +1,204 @@
+from flask import Blueprint, request, jsonify
+from models.alert_model import AlertModel, ALERT_FILTERS
+from models.child_model import ChildModel
+from models.reading_model import alert_engine
+from services.alert_engine import RULE_FIELDS
+from services.http_cache import conditional_get
+
+alerts_bp = Blueprint('alerts', __name__, url_prefix='/api')
+conditional_get(alerts_bp)
+
+ALERTS_DEFAULT_LIMIT = 100
+ALERTS_MAX_LIMIT = 1000
+
+
+@alerts_bp.route('/alerts', methods=['GET'])
+# @jwt_required()
+def get_alerts():
+    """
+    Listar alertas
+    ---
+    tags:
+      - Alerts
+    summary: "Alertas de caída, riesgo y signos vitales; primero las no atendidas, más recientes primero."
+    parameters:
+      - name: id_daycare
+        in: query
+        type: integer
+        required: false
+      - name: id_child
+        in: query
+        type: integer
+        required: false
+      - name: id_smartwatch
+        in: query
+        type: integer
+        required: false
+      - name: status
+        in: query
+        type: string
+        enum: [open, all]
+        required: false
+        description: "'open' (por defecto) solo las no atendidas; 'all' agrega las atendidas al final."
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: "Máximo de alertas (por defecto 100, máximo 1000)."
+    responses:
+      '200':
+        description: "Lista de alertas."
+      '400':
+        description: "Parámetros inválidos."
+      '500':
+        description: "Error al consultar las alertas."
+    """
+    try:
+        filters = {field: int(request.args[field]) for field in ALERT_FILTERS if field in request.args}
+        limit = min(int(request.args.get('limit', ALERTS_DEFAULT_LIMIT)), ALERTS_MAX_LIMIT)
+        if limit <= 0:
+            raise ValueError
+    except ValueError:
+        return jsonify({"error": "Los filtros y 'limit' deben ser enteros positivos"}), 400
+
+    status = request.args.get('status', 'open')
+    if status not in ('open', 'all'):
+        return jsonify({"error": "'status' debe ser 'open' o 'all'"}), 400
+
+    alerts = AlertModel.get_alerts(filters, include_acknowledged=status == 'all', limit=limit)
+    if alerts is None:
+        return jsonify({"error": "No se pudieron consultar las alertas"}), 500
+    return jsonify(alerts)
+
+
+@alerts_bp.route('/alerts/<int:id_alert>/acknowledge', methods=['PATCH'])
+# @jwt_required()
+def acknowledge_alert(id_alert):
+    """
+    Marcar una alerta como atendida
+    ---
+    tags:
+      - Alerts
+    parameters:
+      - name: id_alert
+        in: path
+        type: integer
+        required: true
+      - name: body
+        in: body
+        required: false
+        schema:
+          type: object
+          properties:
+            acknowledged_by:
+              type: integer
+              description: "ID del usuario que atendió la alerta."
+    responses:
+      '200':
+        description: "Alerta atendida."
+      '404':
+        description: "Alerta no encontrada."
+      '409':
+        description: "La alerta ya estaba atendida."
+    """
+    body = request.get_json(silent=True) or {}
+    if not AlertModel.acknowledge(id_alert, body.get('acknowledged_by')):
+        alert = AlertModel.get_by_id(id_alert)
+        if not alert:
+            return jsonify({"error": "Alerta no encontrada"}), 404
+        return jsonify({"error": "La alerta ya estaba atendida", "alert": alert}), 409
+    return jsonify(AlertModel.get_by_id(id_alert))
+
+
+@alerts_bp.route('/alerts/rules/<int:id_child>', methods=['GET'])
+# @jwt_required()
+def get_alert_rules(id_child):
+    """
+    Reglas de alerta efectivas de un niño
+    ---
+    tags:
+      - Alerts
+    summary: "Umbrales del niño combinados con los valores por defecto del servidor."
+    parameters:
+      - name: id_child
+        in: path
+        type: integer
+        required: true
+    responses:
+      '200':
+        description: "Reglas efectivas."
+      '404':
+        description: "Niño no encontrado."
+    """
+    if not ChildModel.get_details_by_id(id_child):
+        return jsonify({"error": "Niño no encontrado"}), 404
+    alert_engine.invalidate_rules(id_child)
+    return jsonify({"id_child": id_child, **alert_engine.rules_for([id_child])[id_child]})
+
+
+@alerts_bp.route('/alerts/rules/<int:id_child>', methods=['PUT'])
+# @jwt_required()
+def update_alert_rules(id_child):
+    """
+    Ajustar las reglas de alerta de un niño
+    ---
+    tags:
+      - Alerts
+    summary: "Guarda umbrales propios del niño. Un valor null vuelve al valor por defecto."
+    parameters:
+      - name: id_child
+        in: path
+        type: integer
+        required: true
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            risk_threshold: {type: number, description: "Probabilidad del modelo en % (0-100)"}
+            heart_rate_min: {type: number}
+            heart_rate_max: {type: number}
+            temperature_min: {type: number}
+            temperature_max: {type: number}
+            spo2_min: {type: number}
+            sustain_seconds: {type: integer}
+            cooldown_seconds: {type: integer}
+    responses:
+      '200':
+        description: "Reglas efectivas después del cambio."
+      '400':
+        description: "Campos inválidos."
+      '404':
+        description: "Niño no encontrado."
+    """
+    body = request.get_json(silent=True) or {}
+    fields = {key: value for key, value in body.items() if key in RULE_FIELDS}
+    if not fields:
+        return jsonify({"error": f"Envíe al menos uno de: {', '.join(RULE_FIELDS)}"}), 400
+    for key, value in fields.items():
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0):
+            return jsonify({"error": f"El campo '{key}' debe ser numérico y no negativo"}), 400
+
+    if not ChildModel.get_details_by_id(id_child):
+        return jsonify({"error": "Niño no encontrado"}), 404
+    if not AlertModel.save_rules(id_child, fields):
+        return jsonify({"error": "No se pudieron guardar las reglas"}), 500
+
+    alert_engine.invalidate_rules(id_child)
+    return jsonify({"id_child": id_child, **alert_engine.rules_for([id_child])[id_child]})
+
+
+@alerts_bp.route('/alerts/stats', methods=['GET'])
+# @jwt_required()
+def get_alert_stats():
+    """
+    Estado del motor de alertas
+    ---
+    tags:
+      - Alerts
+    responses:
+      '200':
+        description: "Muestras evaluadas, alertas emitidas y suprimidas por deduplicación."
+    """
+    return jsonify(alert_engine.stats())
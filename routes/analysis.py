@@ -0,0 +1,314 @@
+import os
+import threading
+from flask import Blueprint, request, jsonify
+from services.risk_engine import FEATURE_COLUMNS, get_registry, get_risk_engine, reload_models, risk_engine_status, shadow_compare
+from services.http_cache import NO_STORE, conditional_get
+
+# Endpoints del modelo de riesgo. El modelo se carga en segundo plano al arrancar
+# (ver services/risk_engine.py); si aún no termina, la petición espera a que esté listo.
+analysis_bp = Blueprint('analysis', __name__, url_prefix='/api')
+conditional_get(analysis_bp, cache_control=NO_STORE, etag=False)
+
+
+@analysis_bp.route('/analyze-reading', methods=['POST'])
+def analyze_reading():
+    """
+    Analiza signos vitales en tiempo real para detectar riesgos de salud.
+    ---
+    tags:
+      - Modelo entrenado
+    consumes:
+      - application/json
+    produces:
+      - application/json
+    parameters:
+      - in: body
+        name: body
+        description: Datos vitales para el análisis.
+        required: true
+        schema:
+          id: AnalysisInput
+          type: object
+          required:
+            - bpm
+            - temperature
+            - oxygen_level
+          properties:
+            bpm:
+              type: integer
+              description: Latidos por minuto
+              default: 150
+            temperature:
+              type: number
+              description: Temperatura corporal en Celsius
+              default: 39.5
+            oxygen_level:
+              type: integer
+              description: Nivel de saturación de oxígeno
+              default: 96
+    responses:
+      200:
+        description: Análisis completado
+        schema:
+          type: object
+          properties:
+            status:
+              type: string
+            model_version:
+              type: string
+              description: Versión del modelo que calculó el resultado
+            analysis:
+              type: object
+      400:
+        description: Error - Datos faltantes o vacíos
+      503:
+        description: Modelo IA no cargado
+    """
+    # 1. Verificar modelo
+    risk_engine = get_risk_engine()
+    if not risk_engine:
+        return jsonify({"error": "Modelo no cargado", "is_critical": False}), 503
+
+    # 2. DEBUG: Ver qué llega realmente
+    print(f"\n--- DEBUG SWAGGER ---")
+    print(f"Content-Type: {request.content_type}")
+    raw_data = request.get_data(as_text=True)
+    print(f"Data recibida: '{raw_data}'")
+    print(f"---------------------\n")
+
+    # 3. Intentar obtener JSON
+    # Si raw_data está vacío, es porque Swagger no envió nada
+    if not raw_data:
+         return jsonify({"error": "El cuerpo de la petición está vacío. Swagger no envió datos."}), 400
+
+    data = request.get_json(force=True, silent=True)
+    
+    if not data:
+        return jsonify({"error": "El formato no es JSON válido."}), 400
+    
+    # 4. Validar variables
+    bpm = data.get('bpm')
+    temp = data.get('temperature')
+    oxy = data.get('oxygen_level')
+
+    if None in [bpm, temp, oxy]:
+        return jsonify({"error": "Faltan datos (bpm, temperature, oxygen_level)"}), 400
+
+    try:
+        # 5. Predicción
+        is_risk, probability = risk_engine.score_one(float(bpm), float(temp), float(oxy))
+        is_risk = bool(is_risk)
+        shadow_compare([[float(bpm), float(temp), float(oxy)]], [probability])
+        
+        return jsonify({
+            "status": "success",
+            "model_version": risk_engine.version,
+            "data_received": {"bpm": bpm, "temperature": temp, "oxygen_level": oxy},
+            "analysis": {
+                "is_critical": is_risk,
+                "risk_probability": round(probability * 100, 2),
+                "message": "ANOMALÍA DETECTADA" if is_risk else " Signos Normales"
+            }
+        }), 200
+
+    except Exception as e:
+        print(f"Error IA: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+ANALYZE_MAX_BATCH = int(os.getenv('ANALYZE_MAX_BATCH', '100000'))
+
+
+@analysis_bp.route('/analyze-readings/batch', methods=['POST'])
+def analyze_readings_batch():
+    """
+    Analiza un lote de signos vitales en una sola pasada del modelo.
+    ---
+    tags:
+      - Modelo entrenado
+    consumes:
+      - application/json
+    produces:
+      - application/json
+    parameters:
+      - in: body
+        name: body
+        description: Arreglo de muestras, o un objeto con la llave 'samples'.
+        required: true
+        schema:
+          id: BatchAnalysisInput
+          type: object
+          properties:
+            samples:
+              type: array
+              items:
+                $ref: '#/definitions/AnalysisInput'
+    responses:
+      200:
+        description: Análisis completado; 'results' trae una entrada por muestra en el mismo orden.
+      400:
+        description: Error - Cuerpo vacío, formato inválido o lote demasiado grande
+      503:
+        description: Modelo IA no cargado
+    """
+    data = request.get_json(force=True, silent=True)
+    samples = data.get('samples') if isinstance(data, dict) else data
+    if not isinstance(samples, list) or not samples:
+        return jsonify({"error": "Se esperaba un arreglo de muestras no vacío."}), 400
+    if len(samples) > ANALYZE_MAX_BATCH:
+        return jsonify({"error": f"El lote excede el máximo de {ANALYZE_MAX_BATCH} muestras."}), 400
+
+    # Después de validar el cuerpo: esperar al modelo puede tardar hasta MODEL_WAIT_TIMEOUT
+    risk_engine = get_risk_engine()
+    if not risk_engine:
+        return jsonify({"error": "Modelo no cargado"}), 503
+
+    # 1. Validar y armar la matriz de características (solo las muestras válidas)
+    results = [None] * len(samples)
+    rows, positions = [], []
+    for index, sample in enumerate(samples):
+        values = [sample.get(col) for col in FEATURE_COLUMNS] if isinstance(sample, dict) else [None]
+        if any(isinstance(v, bool) or not isinstance(v, (int, float)) for v in values):
+            results[index] = {"index": index, "error": "Faltan datos (bpm, temperature, oxygen_level)"}
+            continue
+        rows.append(values)
+        positions.append(index)
+
+    # 2. Una sola pasada del modelo para todo el lote; la etiqueta se deriva de la probabilidad
+    if rows:
+        labels, probabilities = risk_engine.score(rows)
+        shadow_compare(rows, probabilities)
+
+        for row, index in enumerate(positions):
+            is_risk = bool(labels[row])
+            results[index] = {
+                "index": index,
+                "is_critical": is_risk,
+                "risk_probability": round(float(probabilities[row]) * 100, 2),
+                "message": "ANOMALÍA DETECTADA" if is_risk else " Signos Normales"
+            }
+
+    return jsonify({
+        "status": "success",
+        "model_version": risk_engine.version,
+        "scored": len(rows),
+        "rejected": len(samples) - len(rows),
+        "results": results
+    }), 200
+
+
+# --- Registro de modelos (ver services/model_registry.py) ---
+
+def _registry_or_404():
+    registry = get_registry()
+    if registry is None:
+        return None, (jsonify({"error": "No hay registro de modelos; se usa MODEL_PATH. Registra uno con 'python manage.py models register'."}), 404)
+    return registry, None
+
+
+def _reload_in_background():
+    # La carga puede tardar; la petición responde de inmediato y el cambio de modelo
+    # ocurre al terminar. Los demás procesos lo detectan con su vigilante del manifiesto.
+    threading.Thread(target=reload_models, name="model-reload", daemon=True).start()
+
+
+@analysis_bp.route('/models', methods=['GET'])
+# @jwt_required()
+def list_models():
+    """
+    Versiones registradas, manifiesto y modelo cargado en este proceso
+    ---
+    tags:
+      - Modelo entrenado
+    responses:
+      200:
+        description: "Manifiesto (activo, candidato, historial), versiones con sus metadatos y estado de la carga, incluida la comparación en sombra."
+    """
+    registry = get_registry()
+    return jsonify({
+        "manifest": registry.read_manifest() if registry else None,
+        "versions": registry.versions() if registry else [],
+        "loaded": risk_engine_status()
+    }), 200
+
+
+@analysis_bp.route('/models/<version>/promote', methods=['POST'])
+# @jwt_required()
+def promote_model(version):
+    """
+    Activa una versión registrada sin reiniciar
+    ---
+    tags:
+      - Modelo entrenado
+    parameters:
+      - name: version
+        in: path
+        type: string
+        required: true
+    responses:
+      202:
+        description: "Manifiesto actualizado; el modelo se carga en segundo plano y reemplaza al anterior al terminar."
+      404:
+        description: "Versión no registrada o no hay registro de modelos."
+    """
+    registry, error = _registry_or_404()
+    if error:
+        return error
+    try:
+        manifest = registry.promote(version)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    _reload_in_background()
+    return jsonify({"message": f"Versión {version} promovida", "manifest": manifest}), 202
+
+
+@analysis_bp.route('/models/shadow', methods=['PUT'])
+# @jwt_required()
+def set_shadow_model():
+    """
+    Define el candidato que se evalúa en sombra con el tráfico real
+    ---
+    tags:
+      - Modelo entrenado
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          properties:
+            version:
+              type: string
+              description: "Versión registrada, o null para dejar de evaluar en sombra."
+    responses:
+      202:
+        description: "Manifiesto actualizado; las respuestas siguen saliendo del modelo activo."
+      404:
+        description: "Versión no registrada o no hay registro de modelos."
+    """
+    registry, error = _registry_or_404()
+    if error:
+        return error
+    data = request.get_json(silent=True) or {}
+    try:
+        manifest = registry.set_candidate(data.get('version'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    _reload_in_background()
+    return jsonify({"message": "Candidato actualizado", "manifest": manifest}), 202
+
+
+@analysis_bp.route('/models/reload', methods=['POST'])
+# @jwt_required()
+def reload_model():
+    """
+    Vuelve a leer el manifiesto y carga lo que haya cambiado
+    ---
+    tags:
+      - Modelo entrenado
+    responses:
+      202:
+        description: "Recarga iniciada en segundo plano."
+    """
+    _reload_in_background()
+    return jsonify({"message": "Recarga iniciada", "loaded": risk_engine_status()}), 202
@@ -1,10 +1,15 @@
-from flask import Blueprint, request, jsonify
-from models.child_model import ChildModel
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from models.child_model import CHILDREN_LIST, ChildModel
+from models.dashboard_model import DashboardModel
+from models.reading_model import ReadingModel, EXPORT_COLUMNS, EXPORT_TYPES, HISTORY_SENSORS, parse_timestamp
+from services.columnar import FORMATS, MIMETYPES, ChunkBuffer, ColumnarWriter, pyarrow_available
+from services.http_cache import conditional_get
 from models.smartwatches_models import SmartwatchModel
 from flask_jwt_extended import jwt_required
 import datetime
 
 children_bp = Blueprint('children', __name__, url_prefix='/api')
+conditional_get(children_bp)
 
 @children_bp.route('/children', methods=['GET'])
 def get_all_children():
@@ -15,6 +20,49 @@ def get_all_children():
       - Children
     summary: "Obtiene todos los niños con información de guardería, tutor, cuidador y smartwatch."
     description: "Retorna un arreglo de niños con datos enriquecidos provenientes de las tablas relacionadas (daycares, users y smartwatches)."
+    parameters:
+      - name: limit
+        in: query
+        required: false
+        description: "Filas por página (por defecto 500, máximo 1000)."
+        schema:
+          type: integer
+      - name: after
+        in: query
+        required: false
+        description: "Cursor de la página siguiente (encabezado X-Next-Cursor de la respuesta anterior)."
+        schema:
+          type: string
+      - name: fields
+        in: query
+        required: false
+        description: "Columnas separadas por coma (p. ej. id_child,child_first_name,daycare_name); las del orden siempre se incluyen."
+        schema:
+          type: string
+      - name: id_daycare
+        in: query
+        required: false
+        description: "Solo los niños de esta guardería."
+        schema:
+          type: integer
+      - name: id_tutor
+        in: query
+        required: false
+        description: "Solo los niños de este tutor."
+        schema:
+          type: integer
+      - name: id_caregiver
+        in: query
+        required: false
+        description: "Solo los niños de este cuidador."
+        schema:
+          type: integer
+      - name: id_smartwatch
+        in: query
+        required: false
+        description: "Niño con este smartwatch."
+        schema:
+          type: integer
     responses:
       '200':
         description: "Lista de niños con relaciones."
@@ -77,8 +125,12 @@ def get_all_children():
                     description: "Modelo del smartwatch"
                     example: "KidsSafe v2"
     """
-    data = ChildModel.get_all_with_relations()
-    return jsonify(data)
+    try:
+        query = CHILDREN_LIST.parse(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    data = ChildModel.get_all_with_relations(query)
+    return jsonify(data), 200, CHILDREN_LIST.page_headers(data, query)
 
 @children_bp.route('/children/with-tutor-caregiver', methods=['GET'])
 def get_children_with_tutor_caregiver_daycare():
@@ -227,6 +279,148 @@ def get_child_full_details(child_id):
     return jsonify(child_info)
 
 
+@children_bp.route('/children/<int:child_id>/dashboard', methods=['GET'])
+# @jwt_required()
+def get_child_dashboard(child_id):
+    """
+    Perfil completo de un niño en una sola petición
+    ---
+    tags:
+      - Children
+    summary: "Datos del niño, tutor, cuidadores, notas, horario y últimas lecturas de su smartwatch."
+    description: >
+      Reemplaza las llamadas a /children/{id}, /tutor, /caregiver, /notes, /schedule y
+      /readings/smartwatch/{id}/latest. La respuesta trae un ETag: si el cliente lo envía en
+      If-None-Match y el perfil no cambió, la respuesta es 304 sin cuerpo.
+    parameters:
+      - name: child_id
+        in: path
+        required: true
+        description: "ID del niño."
+        schema:
+          type: integer
+      - name: If-None-Match
+        in: header
+        required: false
+        description: "ETag de una respuesta anterior."
+        schema:
+          type: string
+    responses:
+      '200':
+        description: "Perfil del niño."
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                child: {type: object}
+                tutor: {type: object, nullable: true}
+                caregivers: {type: array, items: {type: object}}
+                notes: {type: array, items: {type: object}}
+                schedule: {type: array, items: {type: object}}
+                latest_readings:
+                  type: object
+                  nullable: true
+                  description: "Igual que /readings/smartwatch/{id}/latest; null si el niño no tiene smartwatch."
+      '304':
+        description: "El perfil no cambió desde el ETag enviado."
+      '404':
+        description: "Niño no encontrado."
+    """
+    dashboard = DashboardModel.get_child_dashboard(child_id)
+    if dashboard is None:
+        return jsonify({"error": "Niño no encontrado"}), 404
+    # ETag y 304: ver conditional_get (services/http_cache.py)
+    return jsonify(dashboard)
+
+
+@children_bp.route('/children/<int:child_id>/export', methods=['GET'])
+# @jwt_required()
+def export_child_readings(child_id):
+    """
+    Exportar el historial de lecturas de un niño
+    ---
+    tags:
+      - Children
+    summary: "Descarga las lecturas crudas del smartwatch del niño en parquet, arrow (Feather) o csv."
+    description: "La respuesta se envía por partes mientras se lee la BD con un cursor sin buffer, así que el tamaño del rango no afecta la memoria del servidor. Todas las tablas comparten columnas: id_smartwatch, sensor, timestamp, value, axis_x, axis_y, axis_z, is_fall. parquet y arrow requieren pyarrow en el servidor."
+    parameters:
+      - name: child_id
+        in: path
+        required: true
+        schema:
+          type: integer
+      - name: from
+        in: query
+        required: true
+        description: "Inicio del rango (ISO 8601, incluido)."
+        type: string
+      - name: to
+        in: query
+        required: false
+        description: "Fin del rango (ISO 8601, excluido). Por defecto ahora."
+        type: string
+      - name: format
+        in: query
+        required: false
+        type: string
+        enum: [parquet, csv, arrow]
+        description: "Por defecto csv."
+      - name: sensors
+        in: query
+        required: false
+        type: string
+        description: "Lista separada por comas (temperature, heart_rate, oxygen, accelerometer). Por defecto todos."
+    responses:
+      '200':
+        description: "Archivo con las lecturas."
+      '400':
+        description: "Parámetros inválidos o formato no disponible."
+      '404':
+        description: "Niño no encontrado o sin smartwatch asignado."
+    """
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in FORMATS:
+        return jsonify({"error": f"'format' debe ser uno de: {', '.join(FORMATS)}"}), 400
+    if fmt != 'csv' and not pyarrow_available():
+        return jsonify({"error": f"El formato '{fmt}' no está disponible en este servidor (falta pyarrow). Use csv."}), 400
+
+    sensors = [s.strip() for s in request.args.get('sensors', ','.join(HISTORY_SENSORS)).split(',') if s.strip()]
+    unknown = [s for s in sensors if s not in HISTORY_SENSORS]
+    if unknown or not sensors:
+        return jsonify({"error": f"Sensores válidos: {', '.join(HISTORY_SENSORS)}"}), 400
+
+    try:
+        date_from = parse_timestamp(request.args.get('from'))
+        date_to = parse_timestamp(request.args.get('to')) or datetime.datetime.now().replace(microsecond=0)
+    except (ValueError, TypeError, OverflowError, OSError):
+        return jsonify({"error": "Formato de 'from'/'to' inválido. Use ISO 8601."}), 400
+    if date_from is None or date_from >= date_to:
+        return jsonify({"error": "'from' es requerido y debe ser anterior a 'to'"}), 400
+
+    child = ChildModel.get_details_by_id(child_id)
+    if not child:
+        return jsonify({"error": "Niño no encontrado"}), 404
+    if not child.get('id_smartwatch'):
+        return jsonify({"error": "El niño no tiene smartwatch asignado"}), 404
+
+    def generate():
+        buffer = ChunkBuffer()
+        writer = ColumnarWriter(buffer, fmt, EXPORT_COLUMNS, types=EXPORT_TYPES)
+        for rows in ReadingModel.iter_export(child['id_smartwatch'], sensors, date_from, date_to):
+            writer.write_rows(rows)
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+        writer.close()
+        yield buffer.drain()
+
+    filename = f"child_{child_id}_{date_from:%Y%m%d}_{date_to:%Y%m%d}{FORMATS[fmt]}"
+    response = Response(stream_with_context(generate()), mimetype=MIMETYPES[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
 @children_bp.route('/smartwatches/<int:smartwatch_id>/details', methods=['GET'])
 # @jwt_required()
 def get_smartwatch_child_details(smartwatch_id):
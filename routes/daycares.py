@@ -1,9 +1,13 @@
 from flask import Blueprint, request, jsonify
-from models.daycare_model import DaycareModel
+from models.daycare_model import DAYCARES_LIST, DaycareModel
+from models.child_model import ChildModel
+from models.reading_model import ReadingModel
 from flask_jwt_extended import jwt_required
+from services.http_cache import conditional_get
 
 
 daycares_bp = Blueprint('daycares', __name__, url_prefix='/api/daycares')
+conditional_get(daycares_bp)
 
 
 @daycares_bp.route('/', methods=['GET'])
@@ -14,6 +18,31 @@ def get_daycares():
     tags:
       - Daycares
     summary: "Obtiene una lista de todas las guarderías."
+    parameters:
+      - name: limit
+        in: query
+        required: false
+        description: "Filas por página (por defecto 500, máximo 1000)."
+        schema:
+          type: integer
+      - name: after
+        in: query
+        required: false
+        description: "Cursor de la página siguiente (encabezado X-Next-Cursor de la respuesta anterior)."
+        schema:
+          type: string
+      - name: fields
+        in: query
+        required: false
+        description: "Columnas separadas por coma (p. ej. id_daycare,name); las del orden siempre se incluyen."
+        schema:
+          type: string
+      - name: name
+        in: query
+        required: false
+        description: "Guardería con este nombre exacto."
+        schema:
+          type: string
     responses:
       '200':
         description: "Lista de guarderías obtenida exitosamente."
@@ -29,8 +58,12 @@ def get_daycares():
                   address: {type: string}
                   phone: {type: string}
     """
-    daycares = DaycareModel.get_all()
-    return jsonify(daycares)
+    try:
+        query = DAYCARES_LIST.parse(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    daycares = DaycareModel.get_all(query)
+    return jsonify(daycares), 200, DAYCARES_LIST.page_headers(daycares, query)
 
 
 @daycares_bp.route('/<int:id_daycare>', methods=['GET'])
@@ -59,6 +92,44 @@ def get_daycare(id_daycare):
         return jsonify(daycare)
     return jsonify({"error": "Guardería no encontrada"}), 404
 
+@daycares_bp.route('/<int:id_daycare>/vitals/latest', methods=['GET'])
+def get_daycare_latest_vitals(id_daycare):
+    """
+    Últimos signos vitales de todos los niños de una guardería
+    ---
+    tags:
+      - Daycares
+    summary: "Cada niño de la guardería con su última temperatura, ritmo cardíaco, SpO2 y estado de caída."
+    description: "Reemplaza una llamada a /api/readings/smartwatch/<id>/latest por niño: se resuelve con un número fijo de consultas (una por tabla de sensores para todo el grupo), usando la caché de últimas lecturas cuando está disponible."
+    parameters:
+      - name: id_daycare
+        in: path
+        required: true
+        description: "ID de la guardería."
+        schema:
+          type: integer
+    responses:
+      '200':
+        description: "Lista de niños con sus últimas lecturas (null si el niño no tiene smartwatch o lecturas)."
+      '404':
+        description: "Guardería no encontrada."
+      '500':
+        description: "Error al consultar las lecturas."
+    """
+    if not DaycareModel.get_by_id(id_daycare):
+        return jsonify({"error": "Guardería no encontrada"}), 404
+
+    children = ChildModel.get_by_daycare_id(id_daycare)
+    if children is None:
+        return jsonify({"error": "No se pudieron consultar los niños de la guardería"}), 500
+
+    latest = ReadingModel.get_latest_for_smartwatches(
+        [child['id_smartwatch'] for child in children if child['id_smartwatch']])
+    empty = {"temperature": None, "heart_rate": None, "oxygenation": None, "fall": None}
+    for child in children:
+        child.update(latest.get(child['id_smartwatch'], empty))
+    return jsonify({"id_daycare": id_daycare, "children": children})
+
 # --- Rutas Protegidas (requieren token) ---
 
 @daycares_bp.route('/', methods=['POST'])
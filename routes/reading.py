@@ -1,10 +1,18 @@
-from flask import Blueprint, request, jsonify
-from models.reading_model import ReadingModel
+import base64
+import json
+from datetime import datetime, timedelta
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from models.reading_model import (
+    ReadingModel, MAX_BATCH_SIZE, BATCH_DB_ERROR, ASYNC_INGEST, HISTORY_SENSORS, BUCKET_SECONDS,
+    anomaly_detector, ingestion_queue, latest_store, parse_timestamp
+)
 from models.smartwatches_models import SmartwatchModel
 from flask_jwt_extended import jwt_required
+from services.http_cache import conditional_get
 
 # Creamos un nuevo Blueprint para estas rutas
 readings_bp = Blueprint('api', __name__, url_prefix='/api')
+conditional_get(readings_bp)
 
 # --- Rutas para Lecturas de Sensores ---
 
@@ -16,7 +24,17 @@ def save_readings():
     ---
     tags:
       - Readings
-    summary: "Recibe y guarda un lote de lecturas de sensores de un smartwatch."
+    summary: "Recibe y guarda una muestra o un lote de muestras de sensores."
+    description: >
+      Acepta una sola muestra (objeto con 'id_smartwatch'), un arreglo de muestras, o un objeto
+      {"id_smartwatch": 1, "readings": [...]} donde cada muestra hereda el 'id_smartwatch'.
+      En modo lote todas las muestras aceptadas se guardan en una sola transacción y la
+      respuesta indica por índice si cada muestra fue aceptada o rechazada.
+      Con la ingesta asíncrona activa (READINGS_ASYNC_INGEST) las muestras válidas se
+      encolan, la respuesta es 202 y un hilo de fondo las escribe agrupadas.
+      Las muestras que traen heart_rate, temperature y spo2 se evalúan con el modelo de
+      riesgo al guardarse (ver /readings/smartwatch/{id}/risk); en modo síncrono el
+      resultado de cada muestra incluye 'risk'.
     requestBody:
       required: true
       content:
@@ -27,6 +45,10 @@ def save_readings():
               id_smartwatch:
                 type: integer
                 description: "ID del smartwatch que envía los datos (requerido)."
+              timestamp:
+                type: string
+                format: date-time
+                description: "Momento de la muestra (opcional, ISO 8601 o segundos epoch)."
               temperature:
                 type: number
                 format: float
@@ -45,23 +67,128 @@ def save_readings():
                   y: {type: number, format: float}
                   z: {type: number, format: float}
                   is_fall: {type: boolean}
-            required:
-              - id_smartwatch
+              readings:
+                type: array
+                description: "Lote de muestras con el mismo formato (opcional)."
+                items:
+                  type: object
     responses:
       '201':
         description: "Lecturas guardadas exitosamente."
+      '202':
+        description: "Lecturas aceptadas y encoladas para escritura."
+      '207':
+        description: "Lote guardado parcialmente; revisar 'results' por muestra."
       '400':
-        description: "Datos incompletos, falta 'id_smartwatch'."
+        description: "Datos incompletos o inválidos."
+      '413':
+        description: "El lote excede el máximo de muestras permitido."
+      '429':
+        description: "La cola de ingesta está llena; reintentar más tarde."
       '500':
         description: "Error interno al guardar las lecturas."
     """
-    data = request.get_json()
-    if not data or not data.get('id_smartwatch'):
-        return jsonify({"error": "El campo 'id_smartwatch' es requerido"}), 400
+    data = request.get_json(silent=True)
+
+    # Modo de una sola muestra (compatibilidad con los relojes actuales)
+    if isinstance(data, dict) and 'readings' not in data:
+        if not data.get('id_smartwatch'):
+            return jsonify({"error": "El campo 'id_smartwatch' es requerido"}), 400
+        if ASYNC_INGEST:
+            results, queued = ReadingModel.enqueue_readings([data])
+            if queued is None:
+                return _queue_full_response()
+            if not queued:
+                return jsonify({"error": results[0]['error']}), 400
+            return jsonify({"message": "Lecturas recibidas"}), 202
+        if ReadingModel.save_readings(data):
+            return jsonify({"message": "Lecturas guardadas exitosamente"}), 201
+        return jsonify({"error": "No se pudieron guardar las lecturas"}), 500
+
+    # Modo lote
+    default_smartwatch_id = None
+    if isinstance(data, dict):
+        default_smartwatch_id = data.get('id_smartwatch')
+        data = data.get('readings')
+    if not isinstance(data, list) or not data:
+        return jsonify({"error": "Se esperaba una muestra o un arreglo de muestras no vacío"}), 400
+    if len(data) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"El lote excede el máximo de {MAX_BATCH_SIZE} muestras"}), 413
+
+    if ASYNC_INGEST:
+        results, queued = ReadingModel.enqueue_readings(data, default_smartwatch_id)
+        if queued is None:
+            return _queue_full_response()
+        body = {"queued": queued, "rejected": len(results) - queued, "results": results}
+        if not queued:
+            return jsonify({"error": "Ninguna muestra del lote es válida", **body}), 400
+        return jsonify({"message": "Lecturas recibidas", **body}), 202
+
+    results, saved = ReadingModel.save_readings_batch(data, default_smartwatch_id)
+    rejected = len(results) - saved
+    body = {"saved": saved, "rejected": rejected, "results": results}
 
-    if ReadingModel.save_readings(data):
-        return jsonify({"message": "Lecturas guardadas exitosamente"}), 201
-    return jsonify({"error": "No se pudieron guardar las lecturas"}), 500
+    if saved == len(results):
+        return jsonify({"message": "Lecturas guardadas exitosamente", **body}), 201
+    if saved:
+        return jsonify({"message": "Lote guardado parcialmente", **body}), 207
+    if any(r.get('error') == BATCH_DB_ERROR for r in results):
+        return jsonify({"error": "No se pudieron guardar las lecturas", **body}), 500
+    return jsonify({"error": "Ninguna muestra del lote es válida", **body}), 400
+
+
+def _queue_full_response():
+    response = jsonify({"error": "La cola de ingesta está llena, intente de nuevo en unos segundos"})
+    response.headers['Retry-After'] = '1'
+    return response, 429
+
+
+@readings_bp.route('/readings/ingestion/stats', methods=['GET'])
+#@jwt_required()
+def get_ingestion_stats():
+    """
+    Estado de la cola de ingesta
+    ---
+    tags:
+      - Readings
+    summary: "Devuelve los contadores de la cola de escritura diferida de lecturas."
+    responses:
+      '200':
+        description: "Contadores de la cola (pendientes, escritas, descartadas, rechazadas por cola llena)."
+    """
+    return jsonify({"async_ingest": ASYNC_INGEST, **ingestion_queue.stats()})
+
+
+@readings_bp.route('/readings/latest-cache/stats', methods=['GET'])
+#@jwt_required()
+def get_latest_cache_stats():
+    """
+    Estado de la caché de últimas lecturas
+    ---
+    tags:
+      - Readings
+    summary: "Devuelve aciertos, fallos y tamaño de la caché de últimas lecturas."
+    responses:
+      '200':
+        description: "Contadores de la caché."
+    """
+    return jsonify(latest_store.stats())
+
+
+@readings_bp.route('/readings/anomaly/stats', methods=['GET'])
+#@jwt_required()
+def get_anomaly_stats():
+    """
+    Estado del detector de tendencias
+    ---
+    tags:
+      - Readings
+    summary: "Smartwatches seguidos, reciclajes de slots y memoria reservada por el detector."
+    responses:
+      '200':
+        description: "Contadores del detector."
+    """
+    return jsonify(anomaly_detector.stats())
 
 
 @readings_bp.route('/readings/smartwatch/<int:smartwatch_id>/latest', methods=['GET'])
@@ -73,6 +200,7 @@ def get_latest_readings(smartwatch_id):
     tags:
       - Readings
     summary: "Obtiene la lectura más reciente de cada sensor para un smartwatch específico."
+    description: "Se sirve desde la caché de últimas lecturas que mantiene la ingesta; si el smartwatch no está en caché se consulta la BD. 'trend' trae el estado del detector de tendencias (media/desviación móvil, EWMA, z-score y CUSUM) de ritmo cardíaco y SpO2, o null si el proceso aún no recibió lecturas del smartwatch."
     parameters:
       - name: smartwatch_id
         in: path
@@ -88,7 +216,12 @@ def get_latest_readings(smartwatch_id):
     """
     readings = ReadingModel.get_all_last_readings(smartwatch_id)
     if readings:
-        return jsonify(readings)
+        response = jsonify(dict(readings, trend=anomaly_detector.trend(smartwatch_id)))
+        # Para clientes que revalidan con If-Modified-Since en lugar del ETag
+        timestamps = [r['timestamp'] for r in readings.values() if r and isinstance(r.get('timestamp'), datetime)]
+        if timestamps:
+            response.last_modified = max(timestamps)
+        return response
     return jsonify({"error": "No se encontraron lecturas"}), 404
 
 
@@ -112,6 +245,8 @@ def get_heart_rate_history(smartwatch_id):
       '200':
         description: "Lista de las últimas 10 lecturas de ritmo cardíaco."
     """
+    if _wants_history():
+        return get_sensor_history(smartwatch_id, 'heart_rate')
     history = ReadingModel.get_last_10_heart_rate(smartwatch_id)
     return jsonify(history)
 
@@ -136,10 +271,224 @@ def get_oxygen_history(smartwatch_id):
       '200':
         description: "Lista de las últimas 10 lecturas de oxigenación."
     """
+    if _wants_history():
+        return get_sensor_history(smartwatch_id, 'oxygen')
     history = ReadingModel.get_last_10_oxygenation(smartwatch_id)
     return jsonify(history)
 
 
+HISTORY_DEFAULT_LIMIT = 500
+HISTORY_MAX_LIMIT = 5000
+# Parámetros del historial paginado; otros (p. ej. '?_=123' contra cachés) no cambian
+# la respuesta de /heart_rate y /oxygen
+HISTORY_PARAMS = ('from', 'to', 'limit', 'cursor', 'bucket', 'stream')
+
+
+def _wants_history():
+    return any(name in request.args for name in HISTORY_PARAMS)
+
+
+def _encode_cursor(payload):
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_cursor(token):
+    padded = token + '=' * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+@readings_bp.route('/readings/smartwatch/<int:smartwatch_id>/<sensor>', methods=['GET'])
+#@jwt_required()
+def get_sensor_history(smartwatch_id, sensor):
+    """
+    Historial de un sensor por rango de tiempo
+    ---
+    tags:
+      - Readings
+    summary: "Obtiene lecturas de un sensor entre 'from' y 'to', crudas o agregadas por bucket."
+    description: >
+      Sensores: temperature, heart_rate, oxygen, accelerometer. La paginación usa un cursor
+      keyset sobre (timestamp, id): pase 'next_cursor' de la respuesta en 'cursor' para la
+      siguiente página. Con 'bucket' el servidor agrega avg/min/max/count por minuto, hora,
+      día (desde los resúmenes) o N segundos. Con 'stream=true' devuelve todo el rango como
+      NDJSON (una lectura por línea) sin paginar. Las rutas /heart_rate y /oxygen sin
+      parámetros conservan su respuesta anterior (últimas 10 lecturas).
+    parameters:
+      - name: smartwatch_id
+        in: path
+        required: true
+        schema:
+          type: integer
+      - name: sensor
+        in: path
+        required: true
+        schema:
+          type: string
+          enum: [temperature, heart_rate, oxygen, accelerometer]
+      - name: from
+        in: query
+        description: "Inicio del rango (ISO 8601, incluido). Por defecto 24 h antes de 'to'."
+        schema:
+          type: string
+          format: date-time
+      - name: to
+        in: query
+        description: "Fin del rango (ISO 8601, excluido). Por defecto ahora."
+        schema:
+          type: string
+          format: date-time
+      - name: bucket
+        in: query
+        description: "minute, hour, day o número de segundos para agregar en el servidor."
+        schema:
+          type: string
+      - name: limit
+        in: query
+        description: "Filas o buckets por página (máximo 5000)."
+        schema:
+          type: integer
+          default: 500
+      - name: cursor
+        in: query
+        description: "Valor 'next_cursor' de la página anterior."
+        schema:
+          type: string
+      - name: stream
+        in: query
+        description: "true para recibir todo el rango como NDJSON."
+        schema:
+          type: boolean
+    responses:
+      '200':
+        description: "Página de lecturas ({sensor, items, next_cursor}) o stream NDJSON."
+      '400':
+        description: "Parámetros inválidos."
+      '404':
+        description: "Sensor desconocido."
+      '500':
+        description: "Error al consultar el historial."
+    """
+    if sensor not in HISTORY_SENSORS:
+        return jsonify({"error": f"Sensor desconocido. Use: {', '.join(HISTORY_SENSORS)}"}), 404
+
+    try:
+        date_to = parse_timestamp(request.args.get('to')) or datetime.now().replace(microsecond=0)
+        date_from = parse_timestamp(request.args.get('from')) or date_to - timedelta(days=1)
+    except (ValueError, TypeError, OverflowError, OSError):
+        return jsonify({"error": "Formato de 'from'/'to' inválido. Use ISO 8601."}), 400
+    if date_from >= date_to:
+        return jsonify({"error": "'from' debe ser anterior a 'to'"}), 400
+
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        rows = ReadingModel.iter_history(smartwatch_id, sensor, date_from, date_to)
+        encode = current_app.json.dumps
+        lines = (encode(row) + '\n' for row in rows)
+        return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+
+    try:
+        limit = min(int(request.args.get('limit', HISTORY_DEFAULT_LIMIT)), HISTORY_MAX_LIMIT)
+        if limit <= 0:
+            raise ValueError
+    except ValueError:
+        return jsonify({"error": "'limit' debe ser un entero positivo"}), 400
+
+    cursor = None
+    if request.args.get('cursor'):
+        try:
+            cursor = _decode_cursor(request.args['cursor'])
+            cursor_ts = parse_timestamp(cursor['ts'])
+            cursor_id = int(cursor.get('id', 0))
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return jsonify({"error": "Cursor inválido"}), 400
+
+    bucket = request.args.get('bucket')
+    if bucket:
+        if bucket not in BUCKET_SECONDS:
+            if not bucket.isdigit() or int(bucket) <= 0:
+                return jsonify({"error": "'bucket' debe ser minute, hour, day o un número de segundos"}), 400
+            bucket = int(bucket)
+        # En modo agregado el cursor es el inicio del siguiente bucket
+        page_from = cursor_ts if cursor else date_from
+        items = ReadingModel.get_history_buckets(smartwatch_id, sensor, page_from, date_to, bucket, limit)
+        if items is None:
+            return jsonify({"error": "No se pudo obtener el historial"}), 500
+        next_cursor = None
+        if len(items) == limit:
+            step = timedelta(seconds=BUCKET_SECONDS.get(bucket, bucket))
+            next_cursor = _encode_cursor({"ts": (items[-1]['bucket_start'] + step).isoformat()})
+        return jsonify({"sensor": sensor, "bucket": bucket, "items": items, "next_cursor": next_cursor})
+
+    after_ts, after_id = (cursor_ts, cursor_id) if cursor else (None, 0)
+    items = ReadingModel.get_history(smartwatch_id, sensor, date_from, date_to, limit, after_ts, after_id)
+    if items is None:
+        return jsonify({"error": "No se pudo obtener el historial"}), 500
+    next_cursor = None
+    if len(items) == limit:
+        last = items[-1]
+        next_cursor = _encode_cursor({"ts": last['timestamp'].isoformat(), "id": last['id']})
+    return jsonify({"sensor": sensor, "items": items, "next_cursor": next_cursor})
+
+
+@readings_bp.route('/readings/smartwatch/<int:smartwatch_id>/risk', methods=['GET'])
+#@jwt_required()
+def get_risk_history(smartwatch_id):
+    """
+    Riesgos calculados en la ingesta
+    ---
+    tags:
+      - Readings
+    summary: "Obtiene el riesgo que el modelo asignó a cada muestra completa (HR, temperatura y SpO2) al guardarla."
+    parameters:
+      - name: smartwatch_id
+        in: path
+        required: true
+        schema:
+          type: integer
+      - name: critical
+        in: query
+        description: "true para devolver solo las muestras críticas."
+        schema:
+          type: boolean
+      - name: from
+        in: query
+        description: "Inicio del rango (ISO 8601). Por defecto 24 h antes de 'to'."
+        schema:
+          type: string
+          format: date-time
+      - name: to
+        in: query
+        description: "Fin del rango (ISO 8601). Por defecto ahora."
+        schema:
+          type: string
+          format: date-time
+      - name: limit
+        in: query
+        schema:
+          type: integer
+          default: 100
+    responses:
+      '200':
+        description: "Lista de riesgos, del más reciente al más antiguo ('risk_probability' en porcentaje)."
+      '400':
+        description: "Parámetros inválidos."
+    """
+    try:
+        date_to = parse_timestamp(request.args.get('to')) or datetime.now().replace(microsecond=0)
+        date_from = parse_timestamp(request.args.get('from')) or date_to - timedelta(days=1)
+        limit = min(int(request.args.get('limit', 100)), HISTORY_MAX_LIMIT)
+        if limit <= 0:
+            raise ValueError
+    except (ValueError, TypeError, OverflowError, OSError):
+        return jsonify({"error": "Parámetros 'from', 'to' o 'limit' inválidos"}), 400
+    critical_only = request.args.get('critical', '').lower() in ('1', 'true', 'yes')
+
+    scores = ReadingModel.get_risk_scores(smartwatch_id, date_from, date_to, critical_only, limit)
+    if scores is None:
+        return jsonify({"error": "No se pudieron obtener los riesgos"}), 500
+    return jsonify(scores)
+
+
 # --- Rutas para Acciones de Smartwatches ---
 
 @readings_bp.route('/smartwatches/activate', methods=['POST'])
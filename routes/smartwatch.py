@@ -1,8 +1,10 @@
 from flask import Blueprint, request, jsonify
-from models.smartwatches_models import SmartwatchModel
+from models.smartwatches_models import SMARTWATCHES_LIST, SmartwatchModel
 from flask_jwt_extended import jwt_required
+from services.http_cache import conditional_get
 
 smartwatches_bp = Blueprint('smartwatches', __name__, url_prefix='/api/smartwatches')
+conditional_get(smartwatches_bp)
 
 
 @smartwatches_bp.route('/', methods=['GET'])
@@ -13,12 +15,47 @@ def get_smartwatches():
     tags:
       - Smartwatches
     summary: "Obtiene una lista de todos los smartwatches registrados."
+    parameters:
+      - name: limit
+        in: query
+        required: false
+        description: "Filas por página (por defecto 500, máximo 1000)."
+        schema:
+          type: integer
+      - name: after
+        in: query
+        required: false
+        description: "Cursor de la página siguiente (encabezado X-Next-Cursor de la respuesta anterior)."
+        schema:
+          type: string
+      - name: fields
+        in: query
+        required: false
+        description: "Columnas separadas por coma (p. ej. id_smartwatch,device_id,status); las del orden siempre se incluyen."
+        schema:
+          type: string
+      - name: status
+        in: query
+        required: false
+        description: "Solo los smartwatches con este estado (active, inactive)."
+        schema:
+          type: string
+      - name: model
+        in: query
+        required: false
+        description: "Solo este modelo de smartwatch."
+        schema:
+          type: string
     responses:
       '200':
         description: "Lista de smartwatches obtenida exitosamente."
     """
-    smartwatches = SmartwatchModel.get_all()
-    return jsonify(smartwatches)
+    try:
+        query = SMARTWATCHES_LIST.parse(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    smartwatches = SmartwatchModel.get_all(query)
+    return jsonify(smartwatches), 200, SMARTWATCHES_LIST.page_headers(smartwatches, query)
 
 
 @smartwatches_bp.route('/<int:smartwatch_id>', methods=['GET'])
@@ -0,0 +1,128 @@
+import os
+from flask import Blueprint, Response, current_app, jsonify, stream_with_context
+from models.child_model import ChildModel
+from models.daycare_model import DaycareModel
+from models.reading_model import ReadingModel, live_hub
+from services.http_cache import NO_STORE, conditional_get
+
+stream_bp = Blueprint('stream', __name__, url_prefix='/api')
+conditional_get(stream_bp, cache_control=NO_STORE, etag=False)
+
+# Segundos sin eventos tras los que se envía un comentario para mantener viva la conexión
+STREAM_KEEPALIVE = float(os.getenv('STREAM_KEEPALIVE', '15'))
+
+
+def _sse_response(topic, snapshot=None):
+    """
+    Abre una suscripción al tema y la sirve como text/event-stream.
+    Eventos: 'snapshot' (estado inicial, opcional), 'reading' (cada muestra guardada),
+    'alert' (alertas nuevas) y 'dropped' (cuántos eventos se perdieron porque el cliente
+    iba atrasado).
+    """
+    subscription = live_hub.subscribe([topic])
+    if subscription is None:
+        response = jsonify({"error": "Demasiadas conexiones en vivo, intente más tarde."})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+
+    def events():
+        encode = current_app.json.dumps
+        try:
+            if snapshot is not None:
+                yield f"event: snapshot\ndata: {encode(snapshot)}\n\n"
+            while True:
+                batch, dropped = subscription.get(STREAM_KEEPALIVE)
+                if dropped:
+                    yield f"event: dropped\ndata: {encode({'dropped': dropped})}\n\n"
+                if batch:
+                    yield "".join(f"event: {name}\ndata: {encode(payload)}\n\n" for name, payload in batch)
+                elif not dropped:
+                    yield ": keepalive\n\n"
+        finally:
+            # El cliente cerró la conexión
+            subscription.close()
+
+    response = Response(stream_with_context(events()), mimetype='text/event-stream')
+    # Si el generador nunca arranca (HEAD, cliente que corta antes del primer byte) su
+    # 'finally' no se ejecuta: el servidor cierra la respuesta igual y libera la suscripción
+    response.call_on_close(subscription.close)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@stream_bp.route('/stream/child/<int:id_child>', methods=['GET'])
+def stream_child(id_child):
+    """
+    Lecturas en vivo de un niño (Server-Sent Events)
+    ---
+    tags:
+      - Stream
+    summary: "Envía cada lectura guardada del smartwatch del niño en cuanto se confirma en la BD."
+    description: "El primer evento ('snapshot') trae las últimas lecturas conocidas; después llegan eventos 'reading' y 'alert'. Reemplaza el sondeo de /api/readings/smartwatch/<id>/latest."
+    produces:
+      - text/event-stream
+    parameters:
+      - name: id_child
+        in: path
+        type: integer
+        required: true
+    responses:
+      '200':
+        description: "Stream text/event-stream."
+      '404':
+        description: "Niño no encontrado."
+      '503':
+        description: "Se alcanzó el máximo de conexiones en vivo."
+    """
+    child = ChildModel.get_details_by_id(id_child)
+    if not child:
+        return jsonify({"error": "Niño no encontrado"}), 404
+
+    snapshot = {"id_child": id_child, "id_smartwatch": child.get('id_smartwatch'), "readings": None}
+    if child.get('id_smartwatch'):
+        snapshot["readings"] = ReadingModel.get_all_last_readings(child['id_smartwatch'])
+    return _sse_response(('child', id_child), snapshot)
+
+
+@stream_bp.route('/stream/daycare/<int:id_daycare>', methods=['GET'])
+def stream_daycare(id_daycare):
+    """
+    Lecturas en vivo de todos los niños de una guardería (Server-Sent Events)
+    ---
+    tags:
+      - Stream
+    summary: "Un solo stream por pantalla con las lecturas de todos los niños de la guardería."
+    description: "Cada evento 'reading' incluye id_child e id_smartwatch para ubicarlo en el tablero."
+    produces:
+      - text/event-stream
+    parameters:
+      - name: id_daycare
+        in: path
+        type: integer
+        required: true
+    responses:
+      '200':
+        description: "Stream text/event-stream."
+      '404':
+        description: "Guardería no encontrada."
+      '503':
+        description: "Se alcanzó el máximo de conexiones en vivo."
+    """
+    if not DaycareModel.get_by_id(id_daycare):
+        return jsonify({"error": "Guardería no encontrada"}), 404
+    return _sse_response(('daycare', id_daycare))
+
+
+@stream_bp.route('/stream/stats', methods=['GET'])
+def stream_stats():
+    """
+    Estado del hub de lecturas en vivo
+    ---
+    tags:
+      - Stream
+    responses:
+      '200':
+        description: "Suscriptores activos, eventos publicados y entregados."
+    """
+    return jsonify(live_hub.stats())
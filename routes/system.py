@@ -0,0 +1,72 @@
+from flask import Blueprint, request, jsonify
+from db import get_db_connection, get_pool_stats
+from services.entity_cache import cache_stats
+from services.risk_engine import is_warmup_done, risk_engine_status
+from services.http_cache import NO_STORE, conditional_get
+
+system_bp = Blueprint('system', __name__, url_prefix='/api')
+conditional_get(system_bp, cache_control=NO_STORE, etag=False)
+
+
+@system_bp.route('/ready', methods=['GET'])
+def readiness():
+    """
+    Readiness del proceso
+    ---
+    tags:
+      - Sistema
+    summary: "Indica si terminó el calentamiento (carga del modelo de IA en segundo plano)."
+    description: "Devuelve 503 mientras el modelo se está cargando en segundo plano (con MODEL_WARMUP=lazy no espera al modelo). Con '?db=true' también verifica que MySQL responda."
+    parameters:
+      - name: db
+        in: query
+        required: false
+        description: "true para comprobar además la conexión a la base de datos."
+        schema:
+          type: boolean
+    responses:
+      '200':
+        description: "El proceso está listo para recibir tráfico."
+      '503':
+        description: "El calentamiento sigue en curso o la base de datos no responde."
+    """
+    body = {"ready": is_warmup_done(), "model": risk_engine_status()}
+
+    if request.args.get('db', '').lower() in ('1', 'true', 'yes'):
+        try:
+            with get_db_connection() as conn:
+                conn.ping()
+            body["db"] = "ok"
+        except Exception as e:
+            body["db"] = f"error: {e}"
+            body["ready"] = False
+
+    return jsonify(body), 200 if body["ready"] else 503
+
+
+@system_bp.route('/db/pool', methods=['GET'])
+def pool_stats():
+    """
+    Estadísticas del pool de conexiones a MySQL
+    ---
+    tags:
+      - Sistema
+    responses:
+      '200':
+        description: "Conexiones en uso, libres, tiempos de espera agotados y reconexiones."
+    """
+    return jsonify(get_pool_stats())
+
+
+@system_bp.route('/cache/stats', methods=['GET'])
+def entity_cache_stats():
+    """
+    Estadísticas de la caché de niños, smartwatches y guarderías
+    ---
+    tags:
+      - Sistema
+    responses:
+      '200':
+        description: "Por caché: entradas, aciertos, fallos, tasa de aciertos e invalidaciones de este proceso."
+    """
+    return jsonify(cache_stats())
@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
-from models.user_model import UserModel
+from models.user_model import USERS_LIST, UserModel
+from services.http_cache import conditional_get
 
 users_bp = Blueprint('users', __name__, url_prefix='/api/users')
+conditional_get(users_bp)
 
 
 @users_bp.route('/', methods=['GET'])
@@ -13,6 +15,37 @@ def get_users():
       - Users
     summary: "Obtiene una lista de todos los usuarios."
     description: "Devuelve una lista de objetos de usuario, sin incluir la contraseña."
+    parameters:
+      - name: limit
+        in: query
+        required: false
+        description: "Filas por página (por defecto 500, máximo 1000)."
+        schema:
+          type: integer
+      - name: after
+        in: query
+        required: false
+        description: "Cursor de la página siguiente (encabezado X-Next-Cursor de la respuesta anterior)."
+        schema:
+          type: string
+      - name: fields
+        in: query
+        required: false
+        description: "Columnas separadas por coma (p. ej. id_user,first_name,last_name,role); las del orden siempre se incluyen."
+        schema:
+          type: string
+      - name: id_daycare
+        in: query
+        required: false
+        description: "Solo los usuarios de esta guardería."
+        schema:
+          type: integer
+      - name: role
+        in: query
+        required: false
+        description: "admin, caregiver o tutor."
+        schema:
+          type: string
     responses:
       '200':
         description: "Lista de usuarios obtenida exitosamente."
@@ -46,8 +79,12 @@ def get_users():
                     type: string
                     format: date-time
     """
-    users = UserModel.get_all()
-    return jsonify(users)
+    try:
+        query = USERS_LIST.parse(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    users = UserModel.get_all(query)
+    return jsonify(users), 200, USERS_LIST.page_headers(users, query)
 
 
 @users_bp.route('/<int:id_user>', methods=['GET'])
@@ -0,0 +1,167 @@
+import os
+import threading
+import time
+
+RULE_FIELDS = ('risk_threshold', 'heart_rate_min', 'heart_rate_max', 'temperature_min',
+               'temperature_max', 'spo2_min', 'sustain_seconds', 'cooldown_seconds')
+
+# Signos vitales que se vigilan con ventana sostenida: campo de la muestra -> (mínimo, máximo)
+RANGE_RULES = {
+    'heart_rate': ('heart_rate_min', 'heart_rate_max'),
+    'temperature': ('temperature_min', 'temperature_max'),
+    'spo2': ('spo2_min', None),
+}
+
+VITAL_LABELS = {'heart_rate': 'Ritmo cardíaco', 'temperature': 'Temperatura', 'spo2': 'SpO2'}
+
+# Cada cuántos segundos se limpian ventanas, deduplicaciones y reglas vencidas
+PRUNE_INTERVAL = 60
+
+
+def default_rules():
+    """Umbrales por defecto, ajustables con variables ALERT_* del .env."""
+    return {
+        'risk_threshold': float(os.getenv('ALERT_RISK_THRESHOLD', '80')),
+        'heart_rate_min': float(os.getenv('ALERT_HEART_RATE_MIN', '60')),
+        'heart_rate_max': float(os.getenv('ALERT_HEART_RATE_MAX', '180')),
+        'temperature_min': float(os.getenv('ALERT_TEMPERATURE_MIN', '35.5')),
+        'temperature_max': float(os.getenv('ALERT_TEMPERATURE_MAX', '38.0')),
+        'spo2_min': float(os.getenv('ALERT_SPO2_MIN', '92')),
+        'sustain_seconds': int(os.getenv('ALERT_SUSTAIN_SECONDS', '60')),
+        'cooldown_seconds': int(os.getenv('ALERT_COOLDOWN_SECONDS', '300')),
+    }
+
+
+class AlertEngine:
+    """
+    Evalúa cada muestra contra las reglas de su niño: bandera de caída, probabilidad
+    del modelo de riesgo y rangos de signos vitales sostenidos durante 'sustain_seconds'.
+
+    El costo por muestra es O(1): por cada (smartwatch, signo) solo se recuerda desde
+    cuándo está fuera de rango, y por cada (niño, tipo) cuándo se emitió la última
+    alerta (para deduplicar durante 'cooldown_seconds'). No se consulta el historial.
+    Las reglas de cada niño se leen de la BD en lote y se guardan 'rules_ttl' segundos.
+    Una ventana fuera de rango sin muestras en 'window_idle' segundos se olvida, y una
+    deduplicación se olvida al pasar su 'cooldown_seconds'.
+    """
+
+    def __init__(self, rules_loader, defaults=None, rules_ttl=60, window_idle=600):
+        self._rules_loader = rules_loader
+        self.defaults = defaults or default_rules()
+        self.rules_ttl = rules_ttl
+        self.window_idle = window_idle
+        self._rules = {}          # id_child -> (expira, reglas)
+        self._out_of_range = {}   # (id_smartwatch, campo) -> [timestamp de inicio, última muestra (monotónico)]
+        self._last_fired = {}     # (id_child, tipo) -> (timestamp de la última alerta, expira)
+        self._next_prune = time.monotonic() + PRUNE_INTERVAL
+        self._lock = threading.Lock()
+        self._stats = {"evaluated": 0, "fired": 0, "suppressed": 0}
+
+    def rules_for(self, child_ids):
+        """Reglas efectivas {id_child: reglas}, cargando solo las que faltan o expiraron."""
+        now = time.monotonic()
+        with self._lock:
+            cached = {child_id: self._rules[child_id][1] for child_id in child_ids
+                      if child_id in self._rules and self._rules[child_id][0] >= now}
+        missing = [child_id for child_id in child_ids if child_id not in cached]
+        if missing:
+            # La consulta va fuera del lock: el hilo escritor no espera a otras peticiones
+            stored = self._rules_loader(missing)
+            with self._lock:
+                for child_id in missing:
+                    row = stored.get(child_id) or {}
+                    rules = dict(self.defaults)
+                    rules.update({field: row[field] for field in RULE_FIELDS if row.get(field) is not None})
+                    self._rules[child_id] = (now + self.rules_ttl, rules)
+                    cached[child_id] = rules
+        return cached
+
+    def invalidate_rules(self, child_id):
+        with self._lock:
+            self._rules.pop(child_id, None)
+
+    def evaluate(self, samples, targets):
+        """
+        Evalúa las muestras ya guardadas. 'targets' es {id_smartwatch: [(id_child, id_daycare)]}.
+        Retorna la lista de alertas nuevas (diccionarios listos para AlertModel.create_many).
+        Las muestras se recorren en orden de 'timestamp': un lote o la cola pueden
+        entregarlas desordenadas y las ventanas sostenidas dependen del orden.
+        """
+        child_ids = {child_id for pairs in targets.values() for child_id, _ in pairs}
+        if not child_ids:
+            return []
+        rules_by_child = self.rules_for(child_ids)
+
+        alerts = []
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_prune:
+                self._prune(now)
+            for sample in sorted(samples, key=lambda sample: sample['timestamp']):
+                for child_id, daycare_id in targets.get(sample['id_smartwatch'], ()):
+                    self._stats["evaluated"] += 1
+                    for alert in self._check(sample, rules_by_child[child_id], now):
+                        if self._allow(child_id, alert['alert_type'], sample['timestamp'],
+                                       rules_by_child[child_id]['cooldown_seconds'], now):
+                            alert.update(id_child=child_id, id_daycare=daycare_id,
+                                         id_smartwatch=sample['id_smartwatch'],
+                                         triggered_at=sample['timestamp'])
+                            alerts.append(alert)
+            self._stats["fired"] += len(alerts)
+        return alerts
+
+    def _check(self, sample, rules, now):
+        ts = sample['timestamp']
+        accel = sample.get('accelerometer')
+        if accel and accel['is_fall']:
+            yield {'alert_type': 'fall', 'severity': 'critical', 'value': None,
+                   'message': 'Posible caída detectada por el acelerómetro'}
+
+        risk = sample.get('risk')
+        if risk and risk['risk_probability'] >= rules['risk_threshold']:
+            yield {'alert_type': 'risk', 'severity': 'critical', 'value': risk['risk_probability'],
+                   'message': f"Riesgo de salud {risk['risk_probability']}% según el modelo"}
+
+        for field, (min_key, max_key) in RANGE_RULES.items():
+            if field not in sample:
+                continue
+            value = sample[field]
+            low = rules[min_key]
+            high = rules[max_key] if max_key else None
+            key = (sample['id_smartwatch'], field)
+            window = self._out_of_range.get(key)
+            if (low is not None and value < low) or (high is not None and value > high):
+                if window is None:
+                    window = self._out_of_range[key] = [ts, now]
+                window[1] = now
+                # Una muestra atrasada (de un lote anterior a la ventana) da un lapso negativo
+                if (ts - window[0]).total_seconds() >= rules['sustain_seconds']:
+                    yield {'alert_type': field, 'severity': 'warning', 'value': value,
+                           'message': f"{VITAL_LABELS[field]} fuera de rango ({value}) "
+                                      f"por al menos {rules['sustain_seconds']} s"}
+            elif window is not None and ts > window[0]:
+                # Solo una muestra posterior al inicio cierra la ventana
+                del self._out_of_range[key]
+
+    def _allow(self, child_id, alert_type, ts, cooldown, now):
+        """Deduplica: una alerta por (niño, tipo) cada 'cooldown' segundos."""
+        key = (child_id, alert_type)
+        last = self._last_fired.get(key)
+        if last is not None and abs((ts - last[0]).total_seconds()) < cooldown:
+            self._stats["suppressed"] += 1
+            return False
+        self._last_fired[key] = (ts, now + cooldown)
+        return True
+
+    def _prune(self, now):
+        # Se llama con el lock tomado
+        self._out_of_range = {key: window for key, window in self._out_of_range.items()
+                              if now - window[1] < self.window_idle}
+        self._last_fired = {key: fired for key, fired in self._last_fired.items() if fired[1] > now}
+        self._rules = {child_id: entry for child_id, entry in self._rules.items() if entry[0] >= now}
+        self._next_prune = now + PRUNE_INTERVAL
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "tracked_windows": len(self._out_of_range),
+                    "tracked_cooldowns": len(self._last_fired), "cached_rules": len(self._rules)}
@@ -0,0 +1,159 @@
+import math
+import threading
+from collections import OrderedDict
+
+# Signos que se vigilan, en el orden de la segunda dimensión de los arreglos
+TRACKED_FIELDS = ('heart_rate', 'spo2')
+
+
+class AnomalyDetector:
+    """
+    Detector de tendencias en streaming por smartwatch para ritmo cardíaco y SpO2.
+
+    Cada smartwatch activo ocupa un 'slot' de arreglos NumPy preasignados:
+    un búfer circular con las últimas 'window' lecturas de cada signo, sumas móviles
+    (media y desviación en O(1)), EWMA y CUSUM de dos lados sobre el z-score de cada
+    lectura respecto a la ventana previa. La memoria es fija: con 'max_devices' slots
+    ocupados se recicla el del smartwatch menos reciente (LRU).
+
+    El estado vive en el proceso; con varios workers cada uno ve las lecturas que escribe.
+    """
+
+    def __init__(self, max_devices=5000, window=60, ewma_alpha=0.1, min_samples=10,
+                 z_threshold=3.0, cusum_k=0.5, cusum_h=5.0):
+        self.max_devices = max_devices
+        self.window = window
+        self.ewma_alpha = ewma_alpha
+        self.min_samples = min_samples
+        self.z_threshold = z_threshold
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+        self._slots = OrderedDict()   # id_smartwatch -> slot
+        self._free = list(range(max_devices - 1, -1, -1))
+        self._arrays = None
+        self._lock = threading.Lock()
+        self._stats = {"updates": 0, "evictions": 0}
+
+    def _allocate(self):
+        # NumPy se importa con la primera lectura, no al arrancar la aplicación
+        import numpy as np
+        shape = (self.max_devices, len(TRACKED_FIELDS))
+        self._arrays = {
+            'buffer': np.zeros(shape + (self.window,), dtype=np.float32),
+            'pos': np.zeros(shape, dtype=np.int32),
+            'count': np.zeros(shape, dtype=np.int32),
+            'sum': np.zeros(shape, dtype=np.float64),
+            'sumsq': np.zeros(shape, dtype=np.float64),
+            'ewma': np.zeros(shape, dtype=np.float64),
+            'zscore': np.zeros(shape, dtype=np.float64),
+            'cusum_pos': np.zeros(shape, dtype=np.float64),
+            'cusum_neg': np.zeros(shape, dtype=np.float64),
+        }
+
+    def _slot_for(self, smartwatch_id):
+        """Slot del smartwatch; si es nuevo toma uno libre o recicla el menos reciente."""
+        slot = self._slots.get(smartwatch_id)
+        if slot is not None:
+            self._slots.move_to_end(smartwatch_id)
+            return slot
+        if self._free:
+            slot = self._free.pop()
+        else:
+            _, slot = self._slots.popitem(last=False)
+            self._stats["evictions"] += 1
+        for array in self._arrays.values():
+            array[slot] = 0
+        self._slots[smartwatch_id] = slot
+        return slot
+
+    def update(self, samples):
+        """Incorpora muestras normalizadas (en orden de 'timestamp' dentro de cada smartwatch)."""
+        with self._lock:
+            if self._arrays is None:
+                self._allocate()
+            for sample in samples:
+                if not any(field in sample for field in TRACKED_FIELDS):
+                    continue
+                slot = self._slot_for(sample['id_smartwatch'])
+                for index, field in enumerate(TRACKED_FIELDS):
+                    if field in sample:
+                        self._push(slot, index, float(sample[field]))
+                self._stats["updates"] += 1
+
+    def _push(self, slot, index, value):
+        a = self._arrays
+        count = int(a['count'][slot, index])
+        n = min(count, self.window)
+
+        # z-score contra la ventana anterior, para que la lectura nueva no diluya su propio desvío
+        if n >= self.min_samples:
+            mean = a['sum'][slot, index] / n
+            variance = max(a['sumsq'][slot, index] / n - mean * mean, 0.0)
+            z = (value - mean) / math.sqrt(variance) if variance > 1e-12 else 0.0
+            a['zscore'][slot, index] = z
+            a['cusum_pos'][slot, index] = max(0.0, a['cusum_pos'][slot, index] + z - self.cusum_k)
+            a['cusum_neg'][slot, index] = max(0.0, a['cusum_neg'][slot, index] - z - self.cusum_k)
+
+        pos = int(a['pos'][slot, index])
+        if count >= self.window:
+            old = float(a['buffer'][slot, index, pos])
+            a['sum'][slot, index] -= old
+            a['sumsq'][slot, index] -= old * old
+        a['buffer'][slot, index, pos] = value
+        a['sum'][slot, index] += value
+        a['sumsq'][slot, index] += value * value
+        a['pos'][slot, index] = (pos + 1) % self.window
+        a['count'][slot, index] = count + 1
+        a['ewma'][slot, index] = value if count == 0 else (
+            self.ewma_alpha * value + (1 - self.ewma_alpha) * a['ewma'][slot, index])
+
+    def trend(self, smartwatch_id):
+        """
+        Estado actual por signo: media, desviación, EWMA, z-score, CUSUM y 'state'
+        (stable | rising | falling | spike | insufficient_data). None si no hay datos.
+        """
+        with self._lock:
+            slot = self._slots.get(smartwatch_id)
+            if slot is None:
+                return None
+            a = self._arrays
+            result = {}
+            for index, field in enumerate(TRACKED_FIELDS):
+                count = int(a['count'][slot, index])
+                if count == 0:
+                    result[field] = None
+                    continue
+                n = min(count, self.window)
+                mean = a['sum'][slot, index] / n
+                std = math.sqrt(max(a['sumsq'][slot, index] / n - mean * mean, 0.0))
+                z = float(a['zscore'][slot, index])
+                cusum_pos = float(a['cusum_pos'][slot, index])
+                cusum_neg = float(a['cusum_neg'][slot, index])
+                if count <= self.min_samples:
+                    state = 'insufficient_data'
+                elif cusum_pos > self.cusum_h:
+                    state = 'rising'
+                elif cusum_neg > self.cusum_h:
+                    state = 'falling'
+                elif abs(z) > self.z_threshold:
+                    state = 'spike'
+                else:
+                    state = 'stable'
+                result[field] = {
+                    'state': state,
+                    'anomaly': state in ('rising', 'falling', 'spike'),
+                    'samples': n,
+                    'mean': round(float(mean), 2),
+                    'std': round(std, 3),
+                    'ewma': round(float(a['ewma'][slot, index]), 2),
+                    'zscore': round(z, 2),
+                    'cusum_pos': round(cusum_pos, 2),
+                    'cusum_neg': round(cusum_neg, 2),
+                }
+            return result
+
+    def stats(self):
+        with self._lock:
+            memory = sum(array.nbytes for array in self._arrays.values()) if self._arrays else 0
+            return {**self._stats, "devices": len(self._slots), "max_devices": self.max_devices,
+                    "window": self.window, "memory_bytes": memory}
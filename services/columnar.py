@@ -0,0 +1,126 @@
+import csv
+import importlib.util
+import io
+
+# Formato -> extensión del archivo. 'arrow' es el formato de archivo Arrow IPC (Feather v2).
+FORMATS = {'parquet': '.parquet', 'arrow': '.arrow', 'csv': '.csv'}
+MIMETYPES = {'parquet': 'application/vnd.apache.parquet', 'arrow': 'application/vnd.apache.arrow.file',
+             'csv': 'text/csv'}
+
+
+def pyarrow_available():
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def _arrow_type(pa, name):
+    return {'int8': pa.int8(), 'int64': pa.int64(), 'float64': pa.float64(), 'string': pa.string(),
+            'timestamp': pa.timestamp('us')}[name]
+
+
+class ChunkBuffer(io.RawIOBase):
+    """
+    Destino en memoria para respuestas HTTP por partes: el escritor agrega bytes y la
+    ruta los entrega con drain() después de cada bloque, así nunca se acumula el archivo.
+    """
+
+    mode = 'wb'
+
+    def __init__(self):
+        super().__init__()
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+class ColumnarWriter:
+    """
+    Escribe filas por bloques en un archivo binario ('sink') sin juntar todo en memoria.
+
+    parquet y arrow usan pyarrow (en requirements.txt; se importa aquí y no al arrancar)
+    con compresión zstd; el esquema sale de 'types' ({columna: 'int8' | 'int64' | 'float64' |
+    'string' | 'timestamp'}) o, si no se indica, del primer bloque. csv no necesita
+    dependencias extra y se puede comprimir abriendo el 'sink' con gzip.
+    """
+
+    def __init__(self, sink, fmt, columns, compression='zstd', types=None):
+        if fmt not in FORMATS:
+            raise ValueError(f"Formato no soportado: {fmt}")
+        if fmt != 'csv' and not pyarrow_available():
+            raise RuntimeError(f"El formato '{fmt}' requiere pyarrow (pip install pyarrow)")
+        self.fmt = fmt
+        self.columns = list(columns)
+        self.compression = compression
+        self.types = types
+        self.rows_written = 0
+        self._sink = sink
+        self._writer = None
+        self._schema = None
+        self._text = None
+
+    def write_rows(self, rows):
+        """Agrega un bloque de filas (tuplas en el orden de 'columns')."""
+        if not rows:
+            return
+        if self.fmt == 'csv':
+            self._write_csv(rows)
+        else:
+            self._write_arrow(rows)
+        self.rows_written += len(rows)
+
+    def _write_csv(self, rows):
+        if self._text is None:
+            self._text = io.TextIOWrapper(self._sink, encoding='utf-8', newline='', write_through=True)
+            self._writer = csv.writer(self._text)
+            self._writer.writerow(self.columns)
+        self._writer.writerows(rows)
+
+    def _write_arrow(self, rows):
+        import pyarrow as pa
+        values_by_column = list(zip(*rows)) or [()] * len(self.columns)
+        if self.types:
+            arrays = [pa.array(values, type=_arrow_type(pa, self.types[name]))
+                      for name, values in zip(self.columns, values_by_column)]
+        else:
+            arrays = [pa.array(values) for values in values_by_column]
+        table = pa.Table.from_arrays(arrays, names=self.columns)
+        if self._writer is None:
+            self._schema = table.schema
+            if self.fmt == 'parquet':
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self._sink, self._schema, compression=self.compression)
+            else:
+                options = pa.ipc.IpcWriteOptions(compression=self.compression)
+                self._writer = pa.ipc.new_file(self._sink, self._schema, options=options)
+        else:
+            table = table.cast(self._schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        """Termina el archivo (pie de parquet/arrow). No cierra el 'sink'."""
+        if self.fmt == 'csv':
+            if self._text is None:
+                self._write_csv([])
+            self._text.flush()
+            self._text.detach()
+        else:
+            if self._writer is None and self.types:
+                # Sin filas: igual se escribe un archivo válido con el esquema
+                self._write_arrow([])
+            if self._writer is not None:
+                self._writer.close()
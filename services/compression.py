@@ -0,0 +1,79 @@
+import functools
+import gzip
+import importlib.util
+import os
+
+from flask import request
+
+# Cuerpos más chicos que esto (bytes) se envían sin comprimir: no compensa el CPU
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', '6'))
+COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', '4'))
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/html', 'text/plain', 'text/csv')
+
+
+def brotli_available():
+    return importlib.util.find_spec('brotli') is not None
+
+
+@functools.cache
+def available_encodings():
+    """Codificaciones que puede usar este servidor, en orden de preferencia."""
+    return ('br', 'gzip') if brotli_available() else ('gzip',)
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        import brotli
+        return brotli.compress(data, quality=COMPRESS_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=COMPRESS_GZIP_LEVEL)
+
+
+def negotiate(response):
+    """
+    Codificación con la que se enviará 'response' (br o gzip), o None si va sin
+    comprimir: streaming, ya codificada, tipo no comprimible, cuerpo más chico que
+    COMPRESS_MIN_SIZE o cliente que no la acepta.
+    """
+    if response.is_streamed or response.direct_passthrough or 'Content-Encoding' in response.headers \
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return None
+    if len(response.get_data()) < COMPRESS_MIN_SIZE:
+        return None
+    return next((e for e in available_encodings() if request.accept_encodings[e]), None)
+
+
+def weaken_etag(response):
+    # El cuerpo comprimido no es idéntico byte a byte: el ETag pasa a ser débil,
+    # y If-None-Match lo sigue reconociendo (comparación débil)
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def init_compression(app):
+    """
+    Comprime las respuestas con br (si está instalado el paquete brotli) o gzip según el
+    Accept-Encoding del cliente. Solo cuerpos completos (no streaming: SSE y exportaciones
+    ya se envían por partes) de más de COMPRESS_MIN_SIZE bytes. Se ejecuta después de los
+    hooks de los blueprints, así el ETag y el 304 (services/http_cache.py) se calculan
+    sobre el cuerpo sin comprimir; ese hook ya debilita el ETag cuando la respuesta se va
+    a comprimir, para que el 200 y el 304 lleven el mismo validador.
+    """
+    @app.after_request
+    def compress_response(response):
+        if response.status_code == 304:
+            response.vary.add('Accept-Encoding')
+            return response
+        if response.status_code < 200 or response.status_code == 204 or response.is_streamed \
+                or response.direct_passthrough or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate(response)
+        if encoding is None:
+            return response
+
+        response.set_data(compress(response.get_data(), encoding))
+        response.headers['Content-Encoding'] = encoding
+        weaken_etag(response)
+        return response
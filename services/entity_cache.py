@@ -0,0 +1,117 @@
+import copy
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Segundos que vive una entrada (0 desactiva la caché) y máximo de entradas por caché
+ENTITY_CACHE_TTL = float(os.getenv('ENTITY_CACHE_TTL', '300'))
+ENTITY_CACHE_MAX_ENTRIES = int(os.getenv('ENTITY_CACHE_MAX_ENTRIES', '5000'))
+
+_caches = {}
+
+
+def _key(entity_id):
+    # Las rutas pasan ids como int o como texto; ambos deben caer en la misma entrada
+    try:
+        return int(entity_id)
+    except (TypeError, ValueError):
+        return entity_id
+
+
+class EntityCache:
+    """
+    Caché de lectura en memoria para consultas por id que casi no cambian (niños,
+    smartwatches, guarderías): LRU con expiración por TTL.
+
+    Los métodos de escritura de los modelos llaman a invalidate()/clear() después de
+    hacer commit. La invalidación es por proceso: con varios workers, los demás ven el
+    cambio cuando expira el TTL.
+    """
+
+    def __init__(self, name, max_entries=ENTITY_CACHE_MAX_ENTRIES, ttl=ENTITY_CACHE_TTL):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()     # llave -> (expira, valor)
+        self._lock = threading.Lock()
+        # Cambia con cada invalidación: una carga que empezó antes no guarda su resultado
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get_or_load(self, key, loader):
+        """
+        Valor cacheado de 'key' o el resultado de loader(). Solo se guardan resultados
+        no vacíos: None y [] también son lo que retornan los modelos cuando la consulta
+        falla, y no deben quedarse en caché.
+        """
+        if self.ttl <= 0:
+            return loader()
+        key = _key(key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return copy.deepcopy(entry[1])
+            self._misses += 1
+            generation = self._generation
+
+        value = loader()
+        if value:
+            with self._lock:
+                if generation == self._generation:
+                    self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(_key(key), None)
+            self._generation += 1
+            self._invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {"entries": len(self._entries), "max_entries": self.max_entries, "ttl": self.ttl,
+                    "hits": self._hits, "misses": self._misses,
+                    "hit_rate": round(self._hits / lookups, 4) if lookups else None,
+                    "invalidations": self._invalidations}
+
+
+def entity_cache(name):
+    """Caché con ese nombre (se crea la primera vez)."""
+    cache = _caches.get(name)
+    if cache is None:
+        cache = _caches.setdefault(name, EntityCache(name))
+    return cache
+
+
+def cached(name):
+    """Decorador para getters de un solo id: lectura a través de entity_cache(name)."""
+    cache = entity_cache(name)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(entity_id):
+            return cache.get_or_load(entity_id, lambda: func(entity_id))
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+def cache_stats():
+    return {name: cache.stats() for name, cache in sorted(_caches.items())}
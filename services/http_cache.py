@@ -0,0 +1,38 @@
+from flask import request
+
+from services.compression import negotiate, weaken_etag
+
+# Respuestas que se pueden revalidar: el cliente guarda la copia y pregunta cada vez
+REVALIDATE = 'private, no-cache'
+# Estado en vivo (salud, estadísticas, modelos): no se guarda ni se revalida
+NO_STORE = 'no-store'
+
+
+def conditional_get(blueprint, cache_control=REVALIDATE, etag=True):
+    """
+    Agrega validadores a las respuestas GET/HEAD del blueprint:
+
+      * Cache-Control con 'cache_control', salvo que la ruta ya haya puesto uno.
+      * ETag fuerte con el hash del cuerpo serializado (si la ruta no puso uno) en las
+        respuestas 200 que no son streaming; débil si la respuesta se enviará comprimida
+        (services/compression.py).
+      * 304 sin cuerpo cuando coincide If-None-Match, o If-Modified-Since si la ruta
+        puso Last-Modified (response.last_modified).
+
+    Se llama una vez al crear el blueprint, antes de registrarlo en la app.
+    """
+    @blueprint.after_request
+    def add_validators(response):
+        if request.method not in ('GET', 'HEAD'):
+            return response
+        if cache_control and 'Cache-Control' not in response.headers:
+            response.headers['Cache-Control'] = cache_control
+        if not etag or response.status_code != 200 or response.is_streamed or response.direct_passthrough:
+            return response
+        response.add_etag()
+        if negotiate(response):
+            # Se enviará comprimida: el 304 debe llevar el mismo ETag débil que ese 200
+            weaken_etag(response)
+        return response.make_conditional(request)
+
+    return blueprint
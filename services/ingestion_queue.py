@@ -0,0 +1,120 @@
+import atexit
+import threading
+import time
+from collections import deque
+
+
+class IngestionQueue:
+    """
+    Cola acotada de escritura diferida (write-behind) para lecturas de sensores.
+
+    Las peticiones encolan muestras ya validadas y responden de inmediato; un hilo
+    escritor vacía la cola en lotes (group commit) cuando se junta 'batch_size'
+    muestras o pasa 'flush_interval' segundos, lo que ocurra primero. Si la cola
+    está llena, 'submit' devuelve False para que la ruta responda 429.
+    """
+
+    def __init__(self, writer, max_pending=20000, batch_size=500, flush_interval=0.2,
+                 max_retries=3, retry_backoff=0.5):
+        self._writer = writer
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread = None
+        self._stats = {"enqueued": 0, "written": 0, "rejected_full": 0, "dropped": 0, "flushes": 0}
+
+    def submit(self, samples):
+        """Encola todas las muestras o ninguna. Retorna False si no hay espacio."""
+        with self._cond:
+            if self._stopping or len(self._pending) + len(samples) > self.max_pending:
+                self._stats["rejected_full"] += len(samples)
+                return False
+            self._pending.extend(samples)
+            self._stats["enqueued"] += len(samples)
+            self._ensure_started()
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+        return True
+
+    def stats(self):
+        with self._cond:
+            return {**self._stats, "pending": len(self._pending), "max_pending": self.max_pending}
+
+    def stop(self, timeout=10.0):
+        """Detiene el hilo escritor después de vaciar lo pendiente."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+            thread = self._thread
+        if thread:
+            thread.join(timeout)
+
+    def _ensure_started(self):
+        # Se llama con el lock tomado
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="readings-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def _take_batch(self):
+        with self._cond:
+            deadline = time.monotonic() + self.flush_interval
+            while not self._stopping and len(self._pending) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            count = min(len(self._pending), self.batch_size)
+            return [self._pending.popleft() for _ in range(count)], self._stopping
+
+    def _run(self):
+        while True:
+            batch, stopping = self._take_batch()
+            if batch:
+                self._flush(batch)
+            elif stopping:
+                return
+
+    def _flush(self, batch):
+        # Reintentos con espera para errores pasajeros (conexión, bloqueo) del lote completo
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._write(batch)
+                return
+            except Exception as e:
+                print(f"Error en escritura diferida (intento {attempt + 1}): {e}")
+                if attempt < self.max_retries:
+                    time.sleep(self.retry_backoff * (2 ** attempt))
+        self._bisect(batch)
+
+    def _bisect(self, batch):
+        """
+        El lote sigue fallando: probablemente una muestra mala (p. ej. una llave foránea)
+        hace que se rechace todo. El escritor hace rollback completo, así que se escribe
+        cada mitad por separado y se sigue dividiendo la que falle; solo se descartan las
+        muestras que fallan solas.
+        """
+        if len(batch) == 1:
+            with self._cond:
+                self._stats["dropped"] += 1
+            print(f"Se descartó una lectura del smartwatch {batch[0].get('id_smartwatch')} "
+                  f"({batch[0].get('timestamp')}) tras {self.max_retries + 1} intentos del lote.")
+            return
+        middle = len(batch) // 2
+        for half in (batch[:middle], batch[middle:]):
+            try:
+                self._write(half)
+            except Exception:
+                self._bisect(half)
+
+    def _write(self, batch):
+        self._writer(batch)
+        with self._cond:
+            self._stats["written"] += len(batch)
+            self._stats["flushes"] += 1
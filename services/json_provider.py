@@ -0,0 +1,93 @@
+import importlib.util
+import json
+import os
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+# Formato de fechas en las respuestas: 'http' (el de Flask: 'Thu, 01 Jan 2026 10:00:00 GMT')
+# o 'iso' ('2026-01-01T10:00:00'). 'http' mantiene lo que ya reciben los clientes.
+JSON_DATETIME_FORMAT = os.getenv('JSON_DATETIME_FORMAT', 'http').lower()
+# 'orjson' si está instalado (pip install orjson) o 'stdlib' para forzar el módulo json
+JSON_ENCODER = os.getenv('JSON_ENCODER', 'orjson').lower()
+
+
+def orjson_available():
+    return importlib.util.find_spec('orjson') is not None
+
+
+def _time_of_day(value):
+    # Columnas TIME de MySQL llegan como timedelta: se envían como 'HH:MM:SS'
+    seconds = int(value.total_seconds())
+    sign = '-' if seconds < 0 else ''
+    hours, rest = divmod(abs(seconds), 3600)
+    return f"{sign}{hours:02d}:{rest // 60:02d}:{rest % 60:02d}"
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Proveedor JSON de la app (app.json): usa orjson cuando está disponible y el módulo
+    json de la biblioteca estándar si no. Los dos codifican los mismos valores y ordenan
+    las llaves igual, así el cuerpo (y su ETag) es el mismo con cualquiera de los dos,
+    salvo floats en notación exponencial ('1e+16' / '1e16') y NaN/Infinity (orjson
+    escribe null). Con varios workers conviene el mismo JSON_ENCODER en todos.
+
+      * datetime/date según JSON_DATETIME_FORMAT
+      * Decimal (AVG(), SUM() de MySQL) como número
+      * timedelta (columnas TIME) como 'HH:MM:SS'
+      * escalares de NumPy como números de Python
+      * texto en UTF-8 sin escapes \\uXXXX (orjson no escapa; ensure_ascii=False en json)
+    """
+
+    ensure_ascii = False
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.iso_dates = JSON_DATETIME_FORMAT == 'iso'
+        self._orjson = None
+        if JSON_ENCODER == 'orjson' and orjson_available():
+            import orjson
+            self._orjson = orjson
+            self._options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            if not self.iso_dates:
+                # orjson escribe ISO por su cuenta; con 'http' las fechas pasan por _default
+                self._options |= orjson.OPT_PASSTHROUGH_DATETIME
+
+    @property
+    def backend(self):
+        return 'orjson' if self._orjson else 'stdlib'
+
+    def _default(self, o):
+        if isinstance(o, date):
+            if self.iso_dates:
+                return o.isoformat()
+            return http_date(o)
+        if isinstance(o, time):
+            return o.isoformat()
+        if isinstance(o, Decimal):
+            return float(o)
+        if isinstance(o, timedelta):
+            return _time_of_day(o)
+        if hasattr(o, 'item') and hasattr(o, 'dtype'):
+            return o.item()
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        # orjson solo escribe JSON compacto; con indent (modo debug) se usa la biblioteca estándar
+        if self._orjson is not None and set(kwargs) <= {'separators'} and \
+                kwargs.get('separators', (',', ':')) == (',', ':'):
+            options = self._options
+            if self.sort_keys:
+                options |= self._orjson.OPT_SORT_KEYS
+            return self._orjson.dumps(obj, default=self._default, option=options).decode()
+        kwargs.setdefault('default', self._default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if self._orjson is not None and not kwargs:
+            return self._orjson.loads(s)
+        return json.loads(s, **kwargs)
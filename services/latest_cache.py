@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class LatestReadingStore(ABC):
+    """
+    Interfaz del almacén de últimas lecturas por smartwatch.
+
+    Cada entrada tiene la misma forma que devuelve ReadingModel.get_all_last_readings:
+    {"temperature": {...} | None, "heart_rate": {...} | None, "oxygenation": {...} | None}
+    Un backend externo (p. ej. Redis con un hash por smartwatch) solo necesita
+    implementar estos métodos.
+    """
+
+    @abstractmethod
+    def get(self, smartwatch_id):
+        """Entrada completa o None si no está en caché."""
+
+    @abstractmethod
+    def set(self, smartwatch_id, readings):
+        """Guarda una entrada completa (normalmente leída de la BD)."""
+
+    @abstractmethod
+    def merge(self, smartwatch_id, sensor_updates):
+        """
+        Aplica lecturas nuevas {sensor: {...}} a una entrada ya cacheada, conservando
+        la más reciente por 'timestamp'. Si el smartwatch no está en caché no hace nada:
+        la entrada se completa desde la BD en la siguiente consulta.
+        """
+
+    @abstractmethod
+    def delete(self, smartwatch_id):
+        """Quita la entrada del smartwatch."""
+
+    def stats(self):
+        return {}
+
+
+class InMemoryLatestStore(LatestReadingStore):
+    """
+    Backend por defecto: LRU en memoria del proceso con expiración por TTL.
+
+    merge() solo ve las escrituras que atiende este proceso; con varios workers las de
+    los demás llegan cuando la entrada expira y se vuelve a leer de la BD. merge() no
+    renueva la expiración. ttl=0 la desactiva (solo con un único worker).
+    """
+
+    def __init__(self, max_entries=10000, ttl=5):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()     # smartwatch -> (expira, lecturas)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, smartwatch_id):
+        with self._lock:
+            entry = self._entries.get(smartwatch_id)
+            if entry is not None and self._expired(entry):
+                del self._entries[smartwatch_id]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(smartwatch_id)
+            self._hits += 1
+            return dict(entry[1])
+
+    def set(self, smartwatch_id, readings):
+        expires = time.monotonic() + self.ttl if self.ttl > 0 else None
+        with self._lock:
+            self._entries[smartwatch_id] = (expires, dict(readings))
+            self._entries.move_to_end(smartwatch_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def merge(self, smartwatch_id, sensor_updates):
+        with self._lock:
+            entry = self._entries.get(smartwatch_id)
+            if entry is None or self._expired(entry):
+                return
+            readings = entry[1]
+            for sensor, reading in sensor_updates.items():
+                current = readings.get(sensor)
+                if current is None or current['timestamp'] <= reading['timestamp']:
+                    readings[sensor] = reading
+
+    @staticmethod
+    def _expired(entry):
+        return entry[0] is not None and entry[0] <= time.monotonic()
+
+    def delete(self, smartwatch_id):
+        with self._lock:
+            self._entries.pop(smartwatch_id, None)
+
+    def stats(self):
+        with self._lock:
+            return {"backend": "memory", "entries": len(self._entries), "max_entries": self.max_entries,
+                    "ttl": self.ttl, "hits": self._hits, "misses": self._misses}
+
+
+class NullLatestStore(LatestReadingStore):
+    """Desactiva la caché (LATEST_CACHE_BACKEND=none)."""
+
+    def get(self, smartwatch_id):
+        return None
+
+    def set(self, smartwatch_id, readings):
+        pass
+
+    def merge(self, smartwatch_id, sensor_updates):
+        pass
+
+    def delete(self, smartwatch_id):
+        pass
+
+    def stats(self):
+        return {"backend": "none"}
+
+
+def create_latest_store():
+    """Crea el backend configurado en LATEST_CACHE_BACKEND ('memory' por defecto)."""
+    backend = os.getenv('LATEST_CACHE_BACKEND', 'memory').lower()
+    if backend == 'none':
+        return NullLatestStore()
+    if backend != 'memory':
+        print(f"⚠️ LATEST_CACHE_BACKEND '{backend}' no soportado, se usa 'memory'.")
+    return InMemoryLatestStore(max_entries=int(os.getenv('LATEST_CACHE_MAX_ENTRIES', '10000')),
+                               ttl=float(os.getenv('LATEST_CACHE_TTL', '5')))
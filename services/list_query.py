@@ -0,0 +1,136 @@
+import base64
+import json
+import os
+
+# Tamaño de página por defecto y máximo de los listados (GET /api/children, /api/users/, ...)
+LIST_DEFAULT_LIMIT = int(os.getenv('LIST_DEFAULT_LIMIT', '500'))
+LIST_MAX_LIMIT = int(os.getenv('LIST_MAX_LIMIT', '1000'))
+
+
+class ListQuery:
+    """Página pedida por el cliente: tamaño, cursor, filtros y columnas."""
+
+    def __init__(self, limit=LIST_DEFAULT_LIMIT, after=None, filters=None, fields=None):
+        self.limit = limit
+        self.after = after            # valores de las columnas de orden de la última fila vista
+        self.filters = filters or {}
+        self.fields = fields          # None = todas las columnas
+
+
+class ListSpec:
+    """
+    Describe un listado para paginarlo por keyset:
+
+        columns  {nombre en la respuesta: expresión SQL}, en orden
+        source   FROM ... con sus JOIN
+        order    columnas (de 'columns') que ordenan el listado; la última debe ser única
+                 y las anteriores NOT NULL (con NULL, '=' y '>' nunca se cumplen y esas
+                 filas desaparecen de las páginas siguientes)
+        filters  {parámetro: (expresión SQL, tipo)} permitidos en la query string
+        select_all  lista SELECT cuando no se pide 'fields' (p. ej. '*' para conservar
+                    todas las columnas de la tabla); por defecto, todas las de 'columns'
+
+    La página siguiente empieza después de la última fila vista, así que pedir la
+    página 200 cuesta lo mismo que la primera (no hay OFFSET).
+    """
+
+    def __init__(self, columns, source, order, filters=None, select_all=None):
+        self.columns = dict(columns)
+        self.source = source
+        self.order = list(order)
+        self.filters = dict(filters or {})
+        self.select_all = select_all
+
+    def parse(self, args):
+        """ListQuery a partir de request.args. Lanza ValueError con un mensaje para el cliente."""
+        try:
+            limit = int(args.get('limit', LIST_DEFAULT_LIMIT))
+        except ValueError:
+            raise ValueError("'limit' debe ser un entero")
+        if not 1 <= limit <= LIST_MAX_LIMIT:
+            raise ValueError(f"'limit' debe estar entre 1 y {LIST_MAX_LIMIT}")
+
+        after = None
+        if args.get('after'):
+            after = decode_cursor(args['after'])
+            if len(after) != len(self.order):
+                raise ValueError("'after' no corresponde a este listado")
+
+        filters = {}
+        for name, (_, cast) in self.filters.items():
+            if args.get(name) is not None:
+                try:
+                    filters[name] = cast(args[name])
+                except ValueError:
+                    raise ValueError(f"Valor inválido para '{name}'")
+
+        fields = None
+        if args.get('fields'):
+            fields = [f.strip() for f in args['fields'].split(',') if f.strip()]
+            unknown = [f for f in fields if f not in self.columns]
+            if unknown:
+                raise ValueError(f"Campos desconocidos: {', '.join(unknown)}. Disponibles: {', '.join(self.columns)}")
+        return ListQuery(limit, after, filters, fields)
+
+    def select(self, query=None):
+        """(sql, params). Sin 'query' retorna el listado completo, como antes de paginar."""
+        query = query or ListQuery(limit=None)
+        if query.fields:
+            # Las columnas de orden siempre van: de ellas sale el cursor de la página siguiente
+            names = [n for n in self.columns if n in query.fields or n in self.order]
+            select_list = ", ".join(f"{self.columns[n]} AS {n}" for n in names)
+        else:
+            select_list = self.select_all or ", ".join(f"{e} AS {n}" for n, e in self.columns.items())
+
+        conditions, params = [], []
+        for name, value in query.filters.items():
+            conditions.append(f"{self.filters[name][0]} = %s")
+            params.append(value)
+        if query.after is not None:
+            condition, values = self._after(query.after)
+            conditions.append(condition)
+            params.extend(values)
+
+        sql = f"SELECT {select_list} FROM {self.source}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY " + ", ".join(self.columns[n] for n in self.order)
+        if query.limit is not None:
+            sql += " LIMIT %s"
+            params.append(query.limit)
+        return sql, tuple(params)
+
+    def _after(self, values):
+        # (a, b) > (x, y) expandido a a > x OR (a = x AND b > y), que MySQL resuelve con el índice
+        expressions = [self.columns[n] for n in self.order]
+        alternatives, params = [], []
+        for i, expression in enumerate(expressions):
+            parts = [f"{e} = %s" for e in expressions[:i]] + [f"{expression} > %s"]
+            alternatives.append("(" + " AND ".join(parts) + ")")
+            params.extend(values[:i + 1])
+        return "(" + " OR ".join(alternatives) + ")", params
+
+    def next_cursor(self, rows, query):
+        """Cursor de la página siguiente, o None si esta fue la última."""
+        if query is None or query.limit is None or len(rows) < query.limit:
+            return None
+        return encode_cursor([rows[-1][n] for n in self.order])
+
+    def page_headers(self, rows, query):
+        cursor = self.next_cursor(rows, query)
+        return {'X-Next-Cursor': cursor} if cursor else {}
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, default=str, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except ValueError:
+        raise ValueError("'after' no es un cursor válido")
+    if not isinstance(values, list):
+        raise ValueError("'after' no es un cursor válido")
+    return values
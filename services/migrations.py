@@ -0,0 +1,195 @@
+import hashlib
+import importlib.util
+import os
+import re
+
+from db import get_db_connection
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+MIGRATION_FILE = re.compile(r'^(\d{3})_(\w+)\.(sql|py)$')
+
+CREATE_SCHEMA_MIGRATIONS = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+      version INT NOT NULL,
+      name VARCHAR(255) NOT NULL,
+      checksum CHAR(64) NOT NULL,
+      applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+      PRIMARY KEY (version)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+"""
+GET_APPLIED_MIGRATIONS = "SELECT version, name, checksum, applied_at FROM schema_migrations ORDER BY version;"
+INSERT_MIGRATION = "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s);"
+
+GET_TABLE_INDEXES = """
+    SELECT index_name, GROUP_CONCAT(column_name ORDER BY seq_in_index) AS columns
+    FROM information_schema.statistics
+    WHERE table_schema = DATABASE() AND table_name = %s
+    GROUP BY index_name;
+"""
+
+
+def discover_migrations():
+    """Migraciones de la carpeta migrations/ ordenadas por versión: [(versión, nombre, ruta, tipo)]."""
+    found = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = MIGRATION_FILE.match(filename)
+        if match:
+            found.append((int(match.group(1)), filename, os.path.join(MIGRATIONS_DIR, filename), match.group(3)))
+    versions = [version for version, _, _, _ in found]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError("Hay dos migraciones con el mismo número de versión")
+    return found
+
+
+def file_checksum(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def split_sql(script):
+    """Separa un script .sql en sentencias; omite los fragmentos que solo tienen comentarios."""
+    statements = []
+    for chunk in script.split(';'):
+        code = "\n".join(line for line in chunk.splitlines() if not line.strip().startswith('--'))
+        if code.strip():
+            statements.append(chunk.strip())
+    return statements
+
+
+def ensure_index(cursor, table, name, columns):
+    """
+    Crea el índice si la tabla no tiene ya uno que empiece por las mismas columnas
+    (por ejemplo el que MySQL crea para una llave foránea). Para migraciones .py.
+    """
+    cursor.execute(GET_TABLE_INDEXES, (table,))
+    wanted = ",".join(columns).lower()
+    for row in cursor.fetchall():
+        existing = (row[1] or '').lower()
+        if row[0] == name or existing == wanted or existing.startswith(wanted + ","):
+            print(f"   · {table}: ya existe un índice equivalente ({row[0]}), se omite {name}")
+            return False
+    cursor.execute(f"CREATE INDEX {name} ON {table} ({', '.join(columns)});")
+    print(f"   · {table}: índice {name} ({', '.join(columns)}) creado")
+    return True
+
+
+class MigrationRunner:
+    """
+    Aplica en orden las migraciones de migrations/ que no estén registradas en
+    schema_migrations. Los .sql se ejecutan sentencia por sentencia; los .py deben
+    definir upgrade(cursor). MySQL confirma el DDL de inmediato, por eso cada
+    migración se registra en cuanto termina: si una falla, las anteriores quedan aplicadas.
+    """
+
+    def applied(self):
+        with get_db_connection() as conn:
+            with conn.cursor(dictionary=True) as cursor:
+                cursor.execute(CREATE_SCHEMA_MIGRATIONS)
+                cursor.execute(GET_APPLIED_MIGRATIONS)
+                return {row['version']: row for row in cursor.fetchall()}
+
+    def status(self):
+        """[(versión, archivo, aplicada_en | None, checksum_cambió)] de todas las migraciones."""
+        applied = self.applied()
+        rows = []
+        for version, filename, path, _ in discover_migrations():
+            record = applied.get(version)
+            changed = bool(record) and record['checksum'] != file_checksum(path)
+            rows.append((version, filename, record['applied_at'] if record else None, changed))
+        return rows
+
+    def pending(self):
+        applied = self.applied()
+        return [migration for migration in discover_migrations() if migration[0] not in applied]
+
+    def migrate(self, target=None):
+        """Aplica las pendientes hasta 'target' (incluida). Retorna la lista de archivos aplicados."""
+        done = []
+        for version, filename, path, kind in self.pending():
+            if target is not None and version > target:
+                break
+            print(f"🔄 Aplicando {filename}...")
+            with get_db_connection() as conn:
+                try:
+                    with conn.cursor() as cursor:
+                        if kind == 'sql':
+                            with open(path, encoding='utf-8') as f:
+                                for statement in split_sql(f.read()):
+                                    cursor.execute(statement)
+                        else:
+                            self._load_module(path).upgrade(cursor)
+                        cursor.execute(INSERT_MIGRATION, (version, filename, file_checksum(path)))
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+            done.append(filename)
+        return done
+
+    @staticmethod
+    def _load_module(path):
+        spec = importlib.util.spec_from_file_location(f"migration_{os.path.basename(path)[:-3]}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        if not hasattr(module, 'upgrade'):
+            raise RuntimeError(f"{path} no define upgrade(cursor)")
+        return module
+
+
+def hot_queries(cursor):
+    """
+    Consultas frecuentes a revisar con EXPLAIN: [(nombre, sql, parámetros, tabla, índices_esperados)].
+    Los parámetros son valores de ejemplo; solo importa el plan. 'cursor' se usa para
+    leer la llave primaria de las tablas de lecturas.
+    """
+    from datetime import datetime, timedelta
+    from models import alert_model, child_model, reading_model as rm
+
+    date_to = datetime.now().replace(microsecond=0)
+    date_from = date_to - timedelta(days=1)
+    heart = rm.HISTORY_SENSORS['heart_rate']
+    queries = []
+    for name, query, table, prefix in (('última temperatura', rm.GET_LAST_TEMPERATURE, 'temperature_readings', 'temperature'),
+                                       ('último ritmo cardíaco', rm.GET_LAST_HEART_RATE, 'heart_rate_readings', 'heart_rate'),
+                                       ('última oxigenación', rm.GET_LAST_OXYGENATION, 'oxygenation_readings', 'oxygenation')):
+        queries.append((name, query, (1,), table, (f"idx_{prefix}_sw_time_value", f"idx_{prefix}_sw_time")))
+    queries += [
+        ('historial keyset (ritmo cardíaco)',
+         rm.GET_HISTORY_PAGE.format(id_column=rm.reading_id_column(cursor, heart['table']), columns=heart['columns'],
+                                   table=heart['table']),
+         (1, date_from, date_to, date_from, date_from, 0, 500), 'heart_rate_readings', ('idx_heart_rate_sw_time',)),
+        ('historial por buckets (ritmo cardíaco)',
+         rm.GET_HISTORY_BUCKETS.format(aggregates=heart['aggregates'], table=heart['table']),
+         (60, 60, 1, date_from, date_to, 500), 'heart_rate_readings', ('idx_heart_rate_sw_time_value',)),
+        ('últimas lecturas de una guardería (ritmo cardíaco)',
+         rm.GET_LATEST_MANY.format(table='heart_rate_readings', columns='r.beats_per_minute', placeholders='%s, %s, %s'),
+         (1, 2, 3), 'heart_rate_readings', ('idx_heart_rate_sw_time_value', 'idx_heart_rate_sw_time')),
+        ('niños por guardería', child_model.GET_CHILDREN_BY_DAYCARE, (1,), 'children', ('idx_children_daycare',)),
+        ('niños por tutor', child_model.GET_CHILDREN_BY_TUTOR, (1,), 'children', ('idx_children_tutor',)),
+        ('cuidadores del niño', child_model.GET_CAREGIVERS_BY_CHILD, (1,), 'users', ('idx_users_daycare_role',)),
+        ('notas del niño', child_model.GET_NOTES_BY_CHILD, (1,), 'child_notes', ('idx_notes_child_created',)),
+        ('riesgo por rango', rm.GET_RISK_SCORES, (1, date_from, date_to, 100), 'reading_risk_scores',
+         ('idx_risk_smartwatch_time',)),
+        ('alertas pendientes por guardería', alert_model.GET_ALERTS_BASE.format(where="id_daycare = %s AND "),
+         (1, 0, 100), 'alerts', ('idx_alerts_daycare_ack',)),
+    ]
+    return queries
+
+
+def verify_indexes():
+    """
+    Ejecuta EXPLAIN sobre las consultas calientes. Retorna [(nombre, tabla, tipo de acceso,
+    índice usado, índices esperados, ok)]. 'ok' es False si la tabla se recorre completa
+    (type=ALL) o no se usa ningún índice. En tablas casi vacías el optimizador puede
+    preferir un recorrido completo aunque el índice exista.
+    """
+    results = []
+    with get_db_connection() as conn:
+        with conn.cursor(dictionary=True) as cursor:
+            for name, query, params, table, expected in hot_queries(cursor):
+                cursor.execute("EXPLAIN " + query, params)
+                plan = cursor.fetchall()
+                row = next((r for r in plan if r.get('table') in (table, 'r')), plan[0])
+                ok = row.get('type') != 'ALL' and row.get('key') is not None
+                results.append((name, table, row.get('type'), row.get('key'), expected, ok))
+    return results
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+
+MODEL_REGISTRY_DIR = os.getenv('MODEL_REGISTRY_DIR', 'model_registry')
+MODEL_FILE = 'model.pkl'
+METADATA_FILE = 'metadata.json'
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def sidecar_metadata(model_path):
+    """Metadatos del .json junto al .pkl (los que escribe IA_Training/train_streaming.py), o {}."""
+    path = os.path.splitext(model_path)[0] + '.json'
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def model_version(model_path):
+    """Versión de un .pkl suelto: la de sus metadatos o los primeros 12 caracteres de su sha256."""
+    return sidecar_metadata(model_path).get('version') or file_sha256(model_path)[:12]
+
+
+def _write_json_atomic(path, data):
+    # Se escribe a un temporal y se renombra: quien lea el archivo ve el anterior o el nuevo, nunca uno a medias
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, default=str)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class ModelRegistry:
+    """
+    Directorio versionado de modelos:
+
+        <root>/manifest.json               {"active", "candidate", "previous", "history"}
+        <root>/versions/<versión>/model.pkl
+        <root>/versions/<versión>/metadata.json
+
+    Las versiones registradas no se modifican. Promover un modelo solo reescribe el
+    manifiesto (con os.replace, atómico); cada proceso de la API lo vigila y cambia de
+    modelo sin reiniciar (ver services/risk_engine.py).
+    """
+
+    def __init__(self, root=MODEL_REGISTRY_DIR):
+        self.root = root
+        self.manifest_path = os.path.join(root, 'manifest.json')
+
+    def read_manifest(self):
+        """Manifiesto actual o None si el registro no existe."""
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def signature(self):
+        """Cambia cada vez que se reescribe el manifiesto; lo usa el vigilante."""
+        try:
+            return os.stat(self.manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def model_path(self, version):
+        return os.path.join(self.root, 'versions', version, MODEL_FILE)
+
+    def metadata(self, version):
+        with open(os.path.join(self.root, 'versions', version, METADATA_FILE), encoding='utf-8') as f:
+            return json.load(f)
+
+    def versions(self):
+        base = os.path.join(self.root, 'versions')
+        if not os.path.isdir(base):
+            return []
+        return [{"version": version, **self.metadata(version)} for version in sorted(os.listdir(base))
+                if os.path.exists(self.model_path(version))]
+
+    def register(self, model_path, metadata=None):
+        """
+        Copia un .pkl al registro como una versión nueva (sin activarla) y retorna la
+        versión. Si el registro no tenía modelo activo, esta versión queda activa.
+        """
+        metadata = dict(metadata if metadata is not None else sidecar_metadata(model_path))
+        digest = file_sha256(model_path)
+        version = metadata.get('version') or digest[:12]
+        metadata.update(version=version, sha256=digest, registered_at=datetime.now().isoformat(timespec='seconds'))
+
+        directory = os.path.join(self.root, 'versions', version)
+        if os.path.exists(os.path.join(directory, MODEL_FILE)):
+            raise ValueError(f"La versión {version} ya está registrada")
+        os.makedirs(directory, exist_ok=True)
+        tmp = os.path.join(directory, MODEL_FILE + '.tmp')
+        shutil.copyfile(model_path, tmp)
+        _write_json_atomic(os.path.join(directory, METADATA_FILE), metadata)
+        os.replace(tmp, os.path.join(directory, MODEL_FILE))
+
+        manifest = self.read_manifest() or {"active": None, "candidate": None, "previous": None, "history": []}
+        if manifest.get('active') is None:
+            manifest['active'] = version
+            manifest['history'].append({"version": version, "promoted_at": metadata['registered_at']})
+        _write_json_atomic(self.manifest_path, manifest)
+        return version
+
+    def _require(self, version):
+        if not os.path.exists(self.model_path(version)):
+            raise ValueError(f"La versión {version} no está registrada")
+
+    def promote(self, version):
+        """Activa una versión registrada; la anterior queda en 'previous' para revertir."""
+        self._require(version)
+        manifest = self.read_manifest()
+        if manifest.get('active') != version:
+            manifest['previous'] = manifest.get('active')
+            manifest['active'] = version
+            manifest['history'].append({"version": version, "promoted_at": datetime.now().isoformat(timespec='seconds')})
+        if manifest.get('candidate') == version:
+            manifest['candidate'] = None
+        _write_json_atomic(self.manifest_path, manifest)
+        return manifest
+
+    def set_candidate(self, version):
+        """Versión que se evalúa en sombra junto al modelo activo (None para quitarla)."""
+        if version is not None:
+            self._require(version)
+        manifest = self.read_manifest()
+        manifest['candidate'] = version
+        _write_json_atomic(self.manifest_path, manifest)
+        return manifest
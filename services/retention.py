@@ -0,0 +1,241 @@
+import gzip
+import os
+from datetime import date
+
+from db import get_db_connection
+from services.columnar import FORMATS, ColumnarWriter, pyarrow_available
+
+# Tablas crudas particionadas por mes. vitals_rollups no se particiona ni se borra:
+# los promedios históricos siguen disponibles después de archivar las lecturas.
+READING_TABLES = ('temperature_readings', 'heart_rate_readings', 'oxygenation_readings', 'accelerometer_readings')
+
+RETENTION_MONTHS = int(os.getenv('RETENTION_MONTHS', '6'))          # Meses de lecturas crudas en la BD
+PARTITIONS_AHEAD = int(os.getenv('PARTITIONS_AHEAD', '3'))          # Meses futuros con partición creada
+ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', 'archive')
+ARCHIVE_FORMAT = os.getenv('ARCHIVE_FORMAT', 'parquet').lower()     # parquet | arrow | csv
+EXPORT_CHUNK_SIZE = 10000
+
+GET_PARTITIONS = """
+    SELECT partition_name
+    FROM information_schema.partitions
+    WHERE table_schema = DATABASE() AND table_name = %s AND partition_name IS NOT NULL
+    ORDER BY partition_ordinal_position;
+"""
+GET_TIMESTAMP_TYPE = """
+    SELECT data_type FROM information_schema.columns
+    WHERE table_schema = DATABASE() AND table_name = %s AND column_name = 'timestamp';
+"""
+GET_FOREIGN_KEYS = """
+    SELECT constraint_name FROM information_schema.table_constraints
+    WHERE table_schema = DATABASE() AND table_name = %s AND constraint_type = 'FOREIGN KEY';
+"""
+GET_PRIMARY_KEY = """
+    SELECT column_name FROM information_schema.key_column_usage
+    WHERE table_schema = DATABASE() AND table_name = %s AND constraint_name = 'PRIMARY'
+    ORDER BY ordinal_position;
+"""
+GET_MIN_TIMESTAMP = "SELECT MIN(timestamp) FROM {table};"
+SELECT_PARTITION = "SELECT * FROM {table} PARTITION ({partition});"
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def current_month():
+    return date.today().replace(day=1)
+
+
+def partition_name(month):
+    return f"p{month:%Y%m}"
+
+
+def partition_month(name):
+    """Mes que guarda una partición 'pYYYYMM'; None para 'pmax'."""
+    if name == 'pmax':
+        return None
+    return date(int(name[1:5]), int(name[5:7]), 1)
+
+
+def _partition_clause(month, timestamp_type):
+    # Cada partición guarda el mes completo: su límite es el primer día del mes siguiente
+    upper = add_months(month, 1)
+    if timestamp_type == 'timestamp':
+        bound = f"UNIX_TIMESTAMP('{upper:%Y-%m-%d} 00:00:00')"
+    else:
+        bound = f"TO_DAYS('{upper:%Y-%m-%d}')"
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN ({bound})"
+
+
+def _scalar(cursor):
+    rows = cursor.fetchall()
+    return rows[0][0] if rows else None
+
+
+def get_partitions(cursor, table):
+    cursor.execute(GET_PARTITIONS, (table,))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def partition_table(cursor, table, months_ahead=PARTITIONS_AHEAD):
+    """
+    Convierte la tabla a particiones RANGE mensuales sobre 'timestamp'. MySQL exige que
+    la llave primaria incluya la columna de partición y no admite llaves foráneas en
+    tablas particionadas, así que se quitan las FK y la llave primaria pasa a ser
+    (id, timestamp). Reescribe la tabla completa: en tablas grandes conviene hacerlo
+    en una ventana de mantenimiento. Retorna False si ya estaba particionada.
+    """
+    if get_partitions(cursor, table):
+        print(f"   · {table}: ya está particionada")
+        return False
+
+    cursor.execute(GET_TIMESTAMP_TYPE, (table,))
+    timestamp_type = (_scalar(cursor) or 'datetime').lower()
+
+    cursor.execute(GET_FOREIGN_KEYS, (table,))
+    for (constraint,) in cursor.fetchall():
+        cursor.execute(f"ALTER TABLE {table} DROP FOREIGN KEY {constraint};")
+        print(f"   · {table}: se quitó la llave foránea {constraint}")
+
+    cursor.execute(GET_PRIMARY_KEY, (table,))
+    primary_key = [row[0] for row in cursor.fetchall()]
+    if 'timestamp' not in primary_key:
+        columns = ", ".join(primary_key + ['timestamp'])
+        cursor.execute(f"ALTER TABLE {table} DROP PRIMARY KEY, ADD PRIMARY KEY ({columns});")
+
+    cursor.execute(GET_MIN_TIMESTAMP.format(table=table))
+    oldest = _scalar(cursor)
+    first = oldest.date().replace(day=1) if oldest else current_month()
+    last = add_months(current_month(), months_ahead)
+
+    clauses = []
+    month = first
+    while month <= last:
+        clauses.append(_partition_clause(month, timestamp_type))
+        month = add_months(month, 1)
+    clauses.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+
+    expression = "UNIX_TIMESTAMP(timestamp)" if timestamp_type == 'timestamp' else "TO_DAYS(timestamp)"
+    cursor.execute(f"ALTER TABLE {table} PARTITION BY RANGE ({expression}) ({', '.join(clauses)});")
+    print(f"   · {table}: {len(clauses)} particiones ({partition_name(first)} a {partition_name(last)} + pmax)")
+    return True
+
+
+def ensure_future_partitions(cursor, table, months_ahead=PARTITIONS_AHEAD):
+    """Separa de 'pmax' los meses que faltan hasta 'months_ahead' meses en el futuro."""
+    months = [partition_month(name) for name in get_partitions(cursor, table) if name != 'pmax']
+    if not months:
+        return []
+    target = add_months(current_month(), months_ahead)
+    month = add_months(max(months), 1)
+    if month > target:
+        return []
+
+    cursor.execute(GET_TIMESTAMP_TYPE, (table,))
+    timestamp_type = (_scalar(cursor) or 'datetime').lower()
+    created = []
+    while month <= target:
+        created.append(month)
+        month = add_months(month, 1)
+    clauses = [_partition_clause(m, timestamp_type) for m in created]
+    clauses.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+    cursor.execute(f"ALTER TABLE {table} REORGANIZE PARTITION pmax INTO ({', '.join(clauses)});")
+    return [partition_name(m) for m in created]
+
+
+def retained_since():
+    """
+    Primer mes que conservan las tablas crudas (la partición más antigua), o None si
+    no están particionadas. Las lecturas anteriores ya se archivaron.
+    """
+    oldest = None
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            for table in READING_TABLES:
+                months = [partition_month(name) for name in get_partitions(cursor, table) if name != 'pmax']
+                if months and (oldest is None or min(months) > oldest):
+                    oldest = min(months)
+    return oldest
+
+
+def archive_format():
+    """
+    Formato de archivo configurado. Sin pyarrow, parquet/arrow fallan antes de tocar
+    cualquier partición: no se archiva en un formato que el operador no pidió.
+    """
+    fmt = ARCHIVE_FORMAT if ARCHIVE_FORMAT in FORMATS else 'parquet'
+    if fmt != 'csv' and not pyarrow_available():
+        raise RuntimeError(f"ARCHIVE_FORMAT={fmt} requiere pyarrow (pip install -r requirements.txt) "
+                           "o usa ARCHIVE_FORMAT=csv.")
+    return fmt
+
+
+def export_partition(conn, table, partition, archive_dir, fmt):
+    """
+    Exporta una partición por bloques con un cursor sin búfer. El archivo se escribe con
+    otro nombre y se renombra al terminar, así un archivo final nunca queda a medias.
+    Retorna (ruta, filas); ruta es None si la partición estaba vacía.
+    """
+    directory = os.path.join(archive_dir, table)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, partition + FORMATS[fmt] + ('.gz' if fmt == 'csv' else ''))
+    partial = path + '.partial'
+
+    cursor = conn.cursor(buffered=False)
+    try:
+        cursor.execute(SELECT_PARTITION.format(table=table, partition=partition))
+        with open(partial, 'wb') as raw:
+            sink = gzip.GzipFile(fileobj=raw, mode='wb') if fmt == 'csv' else raw
+            writer = ColumnarWriter(sink, fmt, cursor.column_names)
+            while True:
+                rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+                if not rows:
+                    break
+                writer.write_rows(rows)
+            writer.close()
+            if sink is not raw:
+                sink.close()
+            # La partición se borra después: el archivo debe estar en disco
+            raw.flush()
+            os.fsync(raw.fileno())
+    finally:
+        cursor.close()
+
+    if writer.rows_written == 0:
+        os.remove(partial)
+        return None, 0
+    os.replace(partial, path)
+    return path, writer.rows_written
+
+
+def run_retention(months=RETENTION_MONTHS, archive_dir=ARCHIVE_DIR, export=True, dry_run=False):
+    """
+    Archiva y elimina las particiones con lecturas de hace más de 'months' meses y crea
+    las particiones futuras que falten. Cada partición se borra solo después de que su
+    archivo quedó escrito. Retorna [(tabla, partición, ruta, filas)].
+    """
+    cutoff = add_months(current_month(), -months)
+    fmt = archive_format() if export else None
+    archived = []
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            for table in READING_TABLES:
+                partitions = get_partitions(cursor, table)
+                if not partitions:
+                    print(f"⚠️ {table} no está particionada; aplica las migraciones (python manage.py migrate).")
+                    continue
+                expired = [name for name in partitions if name != 'pmax' and partition_month(name) < cutoff]
+                if dry_run:
+                    archived.extend((table, name, None, None) for name in expired)
+                    continue
+
+                created = ensure_future_partitions(cursor, table)
+                if created:
+                    print(f"   · {table}: particiones nuevas {', '.join(created)}")
+                for name in expired:
+                    path, rows = export_partition(conn, table, name, archive_dir, fmt) if export else (None, None)
+                    cursor.execute(f"ALTER TABLE {table} DROP PARTITION {name};")
+                    archived.append((table, name, path, rows))
+                    print(f"   · {table}: {name} eliminada" + (f" ({rows} filas en {path})" if path else ""))
+    return archived
@@ -0,0 +1,238 @@
+import os
+import threading
+import time
+
+from services.model_registry import MODEL_REGISTRY_DIR, ModelRegistry, model_version
+
+FEATURE_COLUMNS = ['bpm', 'temperature', 'oxygen_level']
+
+# Segundos que una petición espera a que termine la carga del modelo
+ENGINE_WAIT_TIMEOUT = float(os.getenv('MODEL_WAIT_TIMEOUT', '30'))
+# Cada cuántos segundos se revisa el manifiesto del registro (0 desactiva el vigilante)
+MODEL_REGISTRY_POLL = float(os.getenv('MODEL_REGISTRY_POLL', '10'))
+
+# Motor activo del proceso; lo usan las rutas de análisis y la ingesta de lecturas.
+# NumPy, joblib y sklearn (al deserializar) solo se importan al cargar el modelo,
+# así que importar este módulo es barato.
+# Cambiar de modelo es reasignar la referencia: las peticiones en curso ya tomaron
+# el motor anterior y terminan con él.
+_current_engine = None
+_shadow_engine = None
+_model_path = None
+_registry = None
+_status = "pending"    # pending | loading | ready | missing | failed
+_warmup = True         # False con MODEL_WARMUP=lazy
+# Hilos de fondo ya iniciados: create_app() puede llamarse varias veces en un proceso
+_warmup_started = False
+_watch_started = False
+_loaded = threading.Event()
+_lock = threading.Lock()
+_reload_lock = threading.Lock()
+
+
+class ShadowStats:
+    """Comparación acumulada entre el modelo activo y el candidato en sombra."""
+
+    def __init__(self, version=None):
+        self.version = version
+        self._lock = threading.Lock()
+        self.samples = 0
+        self.disagreements = 0
+        self.abs_diff_total = 0.0
+        self.abs_diff_max = 0.0
+        self.errors = 0
+
+    def record(self, primary, shadow):
+        with self._lock:
+            for p, s in zip(primary, shadow):
+                diff = abs(float(p) - float(s))
+                self.samples += 1
+                self.disagreements += int((p > 0.5) != (s > 0.5))
+                self.abs_diff_total += diff
+                self.abs_diff_max = max(self.abs_diff_max, diff)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "version": self.version,
+                "samples": self.samples,
+                "disagreements": self.disagreements,
+                "disagreement_rate": round(self.disagreements / self.samples, 4) if self.samples else None,
+                "mean_abs_diff": round(self.abs_diff_total / self.samples, 6) if self.samples else None,
+                "max_abs_diff": round(self.abs_diff_max, 6),
+                "errors": self.errors,
+            }
+
+
+_shadow_stats = ShadowStats()
+
+
+def load_risk_engine(model_path, version=None):
+    """Carga el modelo serializado y construye su motor. Retorna None si no se pudo."""
+    if not os.path.exists(model_path):
+        print(f"⚠️ IA WARNING: No se encontró el archivo {model_path}. La predicción no funcionará.")
+        return None
+    try:
+        import joblib
+        from services.risk_inference import RiskEngine
+        engine = RiskEngine(joblib.load(model_path), FEATURE_COLUMNS)
+        engine.version = version or model_version(model_path)
+        print(f"✅ IA SYSTEM: Modelo {engine.version} cargado desde {model_path} (motor: {engine.kind})")
+        return engine
+    except Exception as e:
+        print(f"❌ IA ERROR: No se pudo cargar el modelo: {e}")
+        return None
+
+
+def configure_risk_engine(model_path, warmup=True):
+    """
+    Registra de dónde sale el modelo: el registro versionado (MODEL_REGISTRY_DIR) si
+    tiene manifiesto, o si no el .pkl de 'model_path'. Con 'warmup' la carga empieza en
+    un hilo de fondo; si no, se carga en la primera petición que lo necesite.
+    """
+    global _model_path, _registry, _warmup, _warmup_started, _watch_started
+    _model_path = model_path
+    _warmup = warmup
+    registry = ModelRegistry(MODEL_REGISTRY_DIR)
+    if registry.read_manifest() is not None:
+        _registry = registry
+        print(f"IA SYSTEM: usando el registro de modelos en {MODEL_REGISTRY_DIR}")
+    with _lock:
+        start_warmup = warmup and not _warmup_started
+        start_watch = _registry is not None and MODEL_REGISTRY_POLL > 0 and not _watch_started
+        _warmup_started = _warmup_started or start_warmup
+        _watch_started = _watch_started or start_watch
+    if start_warmup:
+        threading.Thread(target=_load, name="model-warmup", daemon=True).start()
+    if start_watch:
+        threading.Thread(target=_watch_registry, name="model-registry-watch", daemon=True).start()
+
+
+def _sources():
+    """(ruta, versión) del modelo activo y del candidato (o None)."""
+    if _registry is None:
+        return (_model_path, None), None
+    manifest = _registry.read_manifest()
+    active = manifest.get('active')
+    candidate = manifest.get('candidate')
+    active_source = (_registry.model_path(active), active) if active else (_model_path, None)
+    candidate_source = (_registry.model_path(candidate), candidate) if candidate else None
+    return active_source, candidate_source
+
+
+def _load():
+    global _current_engine, _status
+    with _lock:
+        if _status != "pending":
+            return
+        _status = "loading"
+    (path, version), _ = _sources()
+    engine = load_risk_engine(path, version)
+    if engine is not None:
+        _status = "ready"
+    else:
+        _status = "missing" if not os.path.exists(path) else "failed"
+    _current_engine = engine
+    _loaded.set()
+    reload_models()
+
+
+def reload_models():
+    """
+    Relee el manifiesto y carga lo que cambió (modelo activo y candidato en sombra).
+    La carga ocurre en el hilo que llama; las referencias se cambian al final.
+    Retorna el estado resultante.
+    """
+    global _current_engine, _shadow_engine, _shadow_stats, _status
+    with _reload_lock:
+        (path, version), candidate = _sources()
+        current = _current_engine
+        if version is not None and (current is None or current.version != version):
+            engine = load_risk_engine(path, version)
+            if engine is not None:
+                _current_engine = engine
+                _status = "ready"
+                _loaded.set()
+            else:
+                print(f"⚠️ IA WARNING: Se mantiene el modelo {current.version if current else None}.")
+
+        shadow_version = candidate[1] if candidate else None
+        shadow = _shadow_engine
+        if shadow_version is None:
+            _shadow_engine = None
+        elif shadow is None or shadow.version != shadow_version:
+            shadow = load_risk_engine(*candidate)
+            _shadow_engine = shadow
+        if _shadow_stats.version != shadow_version:
+            _shadow_stats = ShadowStats(shadow_version)
+    return risk_engine_status()
+
+
+def _watch_registry():
+    signature = _registry.signature()
+    while True:
+        time.sleep(MODEL_REGISTRY_POLL)
+        current = _registry.signature()
+        if current != signature:
+            signature = current
+            try:
+                reload_models()
+            except Exception as e:
+                print(f"❌ IA ERROR: No se pudo recargar el registro de modelos: {e}")
+
+
+def get_risk_engine(timeout=ENGINE_WAIT_TIMEOUT):
+    """
+    Motor cargado o None si no hay modelo. Si la carga no ha empezado la inicia en este
+    hilo; si está en curso espera hasta 'timeout' segundos.
+    """
+    if _loaded.is_set():
+        return _current_engine
+    if _model_path is None:
+        return None
+    if _status == "pending":
+        _load()
+    _loaded.wait(timeout)
+    return _current_engine
+
+
+def shadow_compare(rows, probabilities):
+    """
+    Evalúa las mismas filas con el candidato en sombra (si hay uno) y acumula cuánto
+    difiere del modelo activo. Nunca afecta la respuesta: los errores solo se cuentan.
+    """
+    engine, stats = _shadow_engine, _shadow_stats
+    if engine is None:
+        return
+    try:
+        _, shadow_probabilities = engine.score(rows)
+        stats.record(probabilities, shadow_probabilities)
+    except Exception as e:
+        stats.errors += 1
+        print(f"Error en evaluación en sombra: {e}")
+
+
+def risk_engine_status():
+    """Estado de la carga del modelo para el endpoint de readiness."""
+    engine, shadow = _current_engine, _shadow_engine
+    return {
+        "status": _status,
+        "model_path": _model_path,
+        "registry": _registry.root if _registry else None,
+        "engine": engine.kind if engine else None,
+        "version": engine.version if engine else None,
+        "shadow": dict(_shadow_stats.as_dict(), loaded=shadow is not None) if (shadow or _shadow_stats.version) else None,
+    }
+
+
+def get_registry():
+    return _registry
+
+
+def is_warmup_done():
+    """
+    True cuando el proceso puede recibir tráfico. Con MODEL_WARMUP=lazy no hay
+    calentamiento que esperar: el modelo se carga con la primera petición que lo use
+    (y nadie la enviaría si el balanceador espera a que /api/ready dé 200).
+    """
+    return _loaded.is_set() or not _warmup
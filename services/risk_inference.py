@@ -0,0 +1,99 @@
+import math
+
+import numpy as np
+
+from services.risk_engine import FEATURE_COLUMNS
+
+class RiskEngine:
+    """
+    Motor de inferencia del clasificador de riesgo.
+
+    Para un clasificador lineal binario (LogisticRegression o SGDClassifier con
+    loss='log_loss'), solo o detrás de un StandardScaler en un Pipeline, extrae coef_,
+    intercept_ y classes_ una sola vez (con el escalado incorporado a los coeficientes)
+    y calcula la probabilidad con un producto punto más sigmoide, sin DataFrame ni la
+    validación de entrada de sklearn. Para cualquier otro estimador usa predict_proba.
+    tests/test_risk_inference.py comprueba que ambos caminos coinciden.
+    """
+
+    def __init__(self, estimator, feature_columns=FEATURE_COLUMNS):
+        self.estimator = estimator
+        self.feature_columns = list(feature_columns)
+        self.classes = np.asarray(estimator.classes_)
+        self.positive_index = int(np.flatnonzero(self.classes == 1)[0]) if 1 in self.classes else len(self.classes) - 1
+        self._coef, self._intercept = self._extract_linear(estimator, len(self.feature_columns))
+        self.fast_path = self._coef is not None
+        if self._coef is not None:
+            self._coef_list = [float(c) for c in self._coef]
+
+    @property
+    def kind(self):
+        return "numpy-logistic" if self.fast_path else "sklearn"
+
+    @staticmethod
+    def _extract_linear(estimator, n_features):
+        scaler = None
+        if type(estimator).__name__ == 'Pipeline':
+            steps = [step for _, step in estimator.steps if step not in (None, 'passthrough')]
+            if len(steps) != 2 or type(steps[0]).__name__ != 'StandardScaler':
+                return None, None
+            scaler, estimator = steps
+        name = type(estimator).__name__
+        if name == 'SGDClassifier' and getattr(estimator, 'loss', None) != 'log_loss':
+            return None, None
+        if name not in ('LogisticRegression', 'SGDClassifier'):
+            return None, None
+        coef = np.asarray(getattr(estimator, 'coef_', None), dtype=np.float64)
+        intercept = np.asarray(getattr(estimator, 'intercept_', None), dtype=np.float64)
+        if coef.shape != (1, n_features) or intercept.shape != (1,) or len(estimator.classes_) != 2:
+            return None, None
+        coef, intercept = coef[0], float(intercept[0])
+        if scaler is not None:
+            # ((x - mean) / scale) @ w + b  ==  x @ (w / scale) + (b - mean @ (w / scale))
+            scale = getattr(scaler, 'scale_', None)
+            mean = getattr(scaler, 'mean_', None)
+            if scale is not None:
+                coef = coef / np.asarray(scale, dtype=np.float64)
+            if mean is not None:
+                intercept -= float(np.asarray(mean, dtype=np.float64) @ coef)
+        return coef, intercept
+
+    def _as_estimator_input(self, matrix):
+        if hasattr(self.estimator, 'feature_names_in_'):
+            import pandas as pd
+            return pd.DataFrame(matrix, columns=self.feature_columns)
+        return matrix
+
+    def _sklearn_proba(self, matrix):
+        return self.estimator.predict_proba(self._as_estimator_input(matrix))[:, self.positive_index]
+
+    def _linear_proba(self, matrix):
+        z = matrix @ self._coef + self._intercept
+        # Sigmoide estable: 1 / (1 + e^-z) sin desbordes para |z| grande
+        proba = np.exp(-np.logaddexp(0.0, -z))
+        return proba if self.positive_index == 1 else 1.0 - proba
+
+    def score(self, matrix):
+        """
+        Evalúa una matriz (n, 3) de [bpm, temperature, oxygen_level].
+        Retorna (es_critico, probabilidad_de_riesgo) como arreglos de tamaño n.
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if self.fast_path:
+            proba = self._linear_proba(matrix)
+        else:
+            proba = self._sklearn_proba(matrix)
+        # Con dos clases la etiqueta de predict() equivale a probabilidad > 0.5
+        return proba > 0.5, proba
+
+    def score_one(self, bpm, temperature, oxygen_level):
+        """Evalúa una sola muestra; en el camino rápido usa aritmética de Python sin NumPy."""
+        if not self.fast_path:
+            is_critical, proba = self.score([[bpm, temperature, oxygen_level]])
+            return bool(is_critical[0]), float(proba[0])
+        c0, c1, c2 = self._coef_list
+        z = c0 * bpm + c1 * temperature + c2 * oxygen_level + self._intercept
+        proba = 1.0 / (1.0 + math.exp(-z)) if z >= 0 else math.exp(z) / (1.0 + math.exp(z))
+        if self.positive_index != 1:
+            proba = 1.0 - proba
+        return proba > 0.5, proba
@@ -0,0 +1,102 @@
+import threading
+from collections import deque
+
+
+class Subscription:
+    """
+    Suscripción de un cliente a uno o varios temas del hub.
+
+    Los eventos se guardan en un búfer acotado: si el cliente no los consume a tiempo
+    se descartan los más viejos (y se cuentan en 'dropped'), así un cliente lento
+    nunca frena la ingesta ni hace crecer la memoria.
+    """
+
+    def __init__(self, hub, topics, max_buffer):
+        self._hub = hub
+        self.topics = tuple(topics)
+        self._events = deque(maxlen=max_buffer)
+        self._cond = threading.Condition()
+        self._dropped = 0
+        self.closed = False
+
+    def push(self, event):
+        with self._cond:
+            if len(self._events) == self._events.maxlen:
+                self._dropped += 1
+            self._events.append(event)
+            self._cond.notify()
+
+    def get(self, timeout):
+        """
+        Espera hasta 'timeout' segundos y devuelve (eventos, descartados) acumulados
+        desde la última llamada. Ambos vacíos/cero si no llegó nada.
+        """
+        with self._cond:
+            if not self._events:
+                self._cond.wait(timeout)
+            events = list(self._events)
+            self._events.clear()
+            dropped, self._dropped = self._dropped, 0
+            return events, dropped
+
+    def close(self):
+        # Idempotente: la llaman tanto el generador del stream como el cierre de la respuesta
+        with self._cond:
+            if self.closed:
+                return
+            self.closed = True
+        self._hub.unsubscribe(self)
+
+
+class StreamHub:
+    """
+    Fan-out en proceso de eventos en vivo. 'publish' entrega el evento a cada
+    suscripción del tema sin bloquear; el envío al cliente lo hace su propia petición.
+    Los temas son tuplas como ('child', 7) o ('daycare', 2).
+    """
+
+    def __init__(self, max_buffer=100, max_subscribers=500):
+        self.max_buffer = max_buffer
+        self.max_subscribers = max_subscribers
+        self._topics = {}
+        self._count = 0
+        self._lock = threading.Lock()
+        self._stats = {"published": 0, "delivered": 0, "rejected_full": 0}
+
+    def subscribe(self, topics):
+        """Crea una suscripción. Retorna None si ya se alcanzó 'max_subscribers'."""
+        with self._lock:
+            if self._count >= self.max_subscribers:
+                self._stats["rejected_full"] += 1
+                return None
+            subscription = Subscription(self, topics, self.max_buffer)
+            for topic in subscription.topics:
+                self._topics.setdefault(topic, set()).add(subscription)
+            self._count += 1
+            return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for topic in subscription.topics:
+                subscribers = self._topics.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._topics[topic]
+            self._count -= 1
+
+    def has_subscribers(self):
+        return self._count > 0
+
+    def publish(self, topic, event):
+        with self._lock:
+            subscribers = list(self._topics.get(topic, ()))
+            self._stats["published"] += 1
+            self._stats["delivered"] += len(subscribers)
+        for subscription in subscribers:
+            subscription.push(event)
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "subscribers": self._count, "topics": len(self._topics),
+                    "max_buffer": self.max_buffer, "max_subscribers": self.max_subscribers}
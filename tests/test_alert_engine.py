@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+from services.alert_engine import AlertEngine, default_rules
+
+START = datetime(2026, 1, 1, 10, 0, 0)
+TARGETS = {1: [(7, 2)]}
+
+
+def _engine(**kwargs):
+    return AlertEngine(lambda child_ids: {}, defaults=dict(default_rules(), sustain_seconds=60), **kwargs)
+
+
+def _sample(seconds, heart_rate):
+    return {"id_smartwatch": 1, "timestamp": START + timedelta(seconds=seconds), "heart_rate": heart_rate}
+
+
+def test_ventana_sostenida_con_lote_desordenado():
+    # Fuera de rango de 0 a 90 s, en desorden: debe alertar una vez al cumplir 60 s
+    samples = [_sample(s, 200) for s in (90, 0, 60, 30)]
+    alerts = _engine().evaluate(samples, TARGETS)
+    assert [alert["alert_type"] for alert in alerts] == ["heart_rate"]
+    assert alerts[0]["triggered_at"] == START + timedelta(seconds=60)
+
+
+def test_muestra_normal_atrasada_no_cierra_la_ventana():
+    engine = _engine()
+    assert engine.evaluate([_sample(30, 200), _sample(60, 200)], TARGETS) == []
+    # Llega tarde una muestra normal anterior al inicio de la ventana
+    assert engine.evaluate([_sample(10, 100)], TARGETS) == []
+    alerts = engine.evaluate([_sample(95, 200)], TARGETS)
+    assert [alert["alert_type"] for alert in alerts] == ["heart_rate"]
+
+
+def test_limpieza_de_ventanas_y_deduplicaciones():
+    engine = _engine(window_idle=0)
+    engine.evaluate([_sample(0, 200), _sample(60, 200)], TARGETS)
+    assert engine.stats()["tracked_windows"] == 1 and engine.stats()["tracked_cooldowns"] == 1
+    engine._next_prune = 0
+    engine._last_fired = {key: (ts, 0) for key, (ts, _) in engine._last_fired.items()}
+    engine.evaluate([], TARGETS)
+    assert engine.stats()["tracked_windows"] == 0 and engine.stats()["tracked_cooldowns"] == 0
@@ -0,0 +1,19 @@
+from services.ingestion_queue import IngestionQueue
+
+
+def test_lote_con_muestra_mala_solo_descarta_esa_muestra():
+    written = []
+
+    def writer(batch):
+        if any(sample['bad'] for sample in batch):
+            raise ValueError("llave foránea")
+        written.extend(batch)
+
+    queue = IngestionQueue(writer, max_retries=1, retry_backoff=0)
+    batch = [{"id_smartwatch": i, "timestamp": i, "bad": i in (3, 77)} for i in range(100)]
+    queue._flush(batch)
+
+    stats = queue.stats()
+    assert stats["dropped"] == 2
+    assert stats["written"] == 98
+    assert sorted(sample["id_smartwatch"] for sample in written) == [i for i in range(100) if i not in (3, 77)]
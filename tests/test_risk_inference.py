@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from services.risk_engine import FEATURE_COLUMNS
+from services.risk_inference import RiskEngine
+
+ATOL = 1e-9
+
+
+def _vitals(n, seed):
+    rnd = np.random.default_rng(seed)
+    return np.column_stack([rnd.uniform(40, 220, n), rnd.uniform(34, 42, n), rnd.uniform(70, 100, n)])
+
+
+def _labels(matrix):
+    bpm, temp, oxy = matrix.T
+    return ((bpm > 160) | (temp > 38.5) | (oxy < 92)).astype(int)
+
+
+def _probe():
+    # Malla de signos vitales, incluidos los extremos
+    bpm, temp, oxy = np.meshgrid(np.linspace(40, 220, 10), np.linspace(34, 42, 9), np.linspace(70, 100, 7))
+    return np.vstack([np.column_stack([bpm.ravel(), temp.ravel(), oxy.ravel()]), _vitals(500, 7)])
+
+
+ESTIMATORS = {
+    "logistic": lambda: LogisticRegression(max_iter=1000),
+    "pipeline": lambda: Pipeline([("scaler", StandardScaler()), ("clf", LogisticRegression(max_iter=1000))]),
+    "sgd_log_loss": lambda: Pipeline([("scaler", StandardScaler()),
+                                      ("clf", SGDClassifier(loss="log_loss", random_state=0))]),
+}
+
+
+@pytest.mark.parametrize("name", ESTIMATORS)
+@pytest.mark.parametrize("as_dataframe", [False, True])
+def test_camino_rapido_coincide_con_sklearn(name, as_dataframe):
+    train = _vitals(400, 1)
+    features = pd.DataFrame(train, columns=FEATURE_COLUMNS) if as_dataframe else train
+    estimator = ESTIMATORS[name]().fit(features, _labels(train))
+    engine = RiskEngine(estimator, FEATURE_COLUMNS)
+    assert engine.kind == "numpy-logistic"
+
+    probe = _probe()
+    sklearn_input = pd.DataFrame(probe, columns=FEATURE_COLUMNS) if as_dataframe else probe
+    expected_proba = estimator.predict_proba(sklearn_input)[:, 1]
+    expected_label = estimator.predict(sklearn_input) == 1
+
+    labels, proba = engine.score(probe)
+    np.testing.assert_allclose(proba, expected_proba, rtol=0, atol=ATOL)
+    np.testing.assert_array_equal(labels, expected_label)
+
+    for row, p, label in zip(probe[::25], expected_proba[::25], expected_label[::25]):
+        is_critical, probability = engine.score_one(*row)
+        assert probability == pytest.approx(p, abs=ATOL)
+        assert is_critical == label
+
+
+def test_otros_estimadores_usan_sklearn():
+    train = _vitals(400, 2)
+    estimator = DecisionTreeClassifier(max_depth=3, random_state=0).fit(train, _labels(train))
+    engine = RiskEngine(estimator, FEATURE_COLUMNS)
+    assert engine.kind == "sklearn"
+
+    probe = _probe()
+    labels, proba = engine.score(probe)
+    np.testing.assert_allclose(proba, estimator.predict_proba(probe)[:, 1], rtol=0, atol=ATOL)
+    np.testing.assert_array_equal(labels, estimator.predict(probe) == 1)
@@ -0,0 +1,25 @@
+from models.daycare_model import DaycareModel
+from models.reading_model import live_hub
+from app import create_app
+
+
+def _client(monkeypatch):
+    monkeypatch.setattr(DaycareModel, 'get_by_id', staticmethod(lambda id_daycare: {"id_daycare": id_daycare}))
+    return create_app().test_client()
+
+
+def test_head_no_deja_suscripciones(monkeypatch):
+    client = _client(monkeypatch)
+    for _ in range(3):
+        response = client.head('/api/stream/daycare/1')
+        assert response.status_code == 200
+        response.close()
+    assert live_hub.stats()['subscribers'] == 0
+
+
+def test_cierre_antes_de_leer_libera_la_suscripcion(monkeypatch):
+    client = _client(monkeypatch)
+    response = client.get('/api/stream/daycare/1', buffered=False)
+    assert live_hub.stats()['subscribers'] == 1
+    response.close()
+    assert live_hub.stats()['subscribers'] == 0